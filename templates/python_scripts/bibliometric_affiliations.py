@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""
+Affiliation Parser for Python Bibliometric Analysis
+
+Author: Mahbub Hassan
+Affiliation: Chulalongkorn University
+
+Purpose: Extract countries and institutions from WoS C1 and Scopus
+affiliation strings with one compiled gazetteer pattern
+Requirements: numpy, pandas
+"""
+
+import re
+import numpy as np
+import pandas as pd
+
+# One line per country: canonical name | aliases (WoS and Scopus spellings)
+COUNTRY_GAZETTEER = """
+Afghanistan
+Albania
+Algeria
+Andorra
+Angola
+Antigua and Barbuda|Antigua & Barbu
+Argentina
+Armenia
+Australia
+Austria
+Azerbaijan
+Bahamas
+Bahrain
+Bangladesh
+Barbados
+Belarus
+Belgium
+Belize
+Benin
+Bhutan
+Bolivia
+Bosnia and Herzegovina|Bosnia & Herceg|Bosnia & Herzegovina
+Botswana
+Brazil|Brasil
+Brunei|Brunei Darussalam
+Bulgaria
+Burkina Faso
+Burundi
+Cambodia
+Cameroon
+Canada
+Cape Verde|Cabo Verde
+Central African Republic|Cent Afr Republ
+Chad
+Chile
+China|Peoples R China|People's Republic of China|PR China|P.R. China|Hong Kong|Macao|Macau
+Colombia
+Comoros
+Congo|Rep Congo|Republic of the Congo
+Democratic Republic of the Congo|Dem Rep Congo|DR Congo|Zaire
+Costa Rica
+Cote d'Ivoire|Cote Ivoire|Ivory Coast|Côte d'Ivoire
+Croatia
+Cuba
+Cyprus
+Czech Republic|Czechia
+Denmark
+Djibouti
+Dominica
+Dominican Republic|Dominican Rep
+Ecuador
+Egypt
+El Salvador
+Equatorial Guinea|Equat Guinea
+Eritrea
+Estonia
+Eswatini|Swaziland
+Ethiopia
+Fiji
+Finland
+France
+Gabon
+Gambia
+Georgia
+Germany|Fed Rep Ger
+Ghana
+Greece
+Grenada
+Guatemala
+Guinea
+Guinea-Bissau|Guinea Bissau
+Guyana
+Haiti
+Honduras
+Hungary
+Iceland
+India
+Indonesia
+Iran|Islamic Republic of Iran|Iran, Islamic Republic of
+Iraq
+Ireland|Irish Republic
+Israel
+Italy
+Jamaica
+Japan
+Jordan
+Kazakhstan
+Kenya
+Kiribati
+Kosovo
+Kuwait
+Kyrgyzstan
+Laos|Lao People's Democratic Republic|Lao PDR
+Latvia
+Lebanon
+Lesotho
+Liberia
+Libya
+Liechtenstein
+Lithuania
+Luxembourg
+Madagascar
+Malawi
+Malaysia
+Maldives
+Mali
+Malta
+Marshall Islands|Marshall Island
+Mauritania
+Mauritius
+Mexico
+Micronesia
+Moldova
+Monaco
+Mongolia
+Montenegro
+Morocco
+Mozambique
+Myanmar|Burma
+Namibia
+Nauru
+Nepal
+Netherlands|The Netherlands|Holland
+New Zealand
+Nicaragua
+Niger
+Nigeria
+North Korea|Dem People's Republic of Korea
+North Macedonia|Macedonia|Republic of North Macedonia
+Norway
+Oman
+Pakistan
+Palau
+Palestine|State of Palestine
+Panama
+Papua New Guinea|Papua N Guinea
+Paraguay
+Peru
+Philippines
+Poland
+Portugal
+Puerto Rico
+Qatar
+Romania
+Russia|Russian Federation
+Rwanda
+Saint Kitts and Nevis|St Kitts & Nevi
+Saint Lucia|St Lucia
+Saint Vincent and the Grenadines|St Vincent
+Samoa
+San Marino
+Sao Tome and Principe|Sao Tome & Prin
+Saudi Arabia
+Senegal
+Serbia
+Seychelles
+Sierra Leone
+Singapore
+Slovakia
+Slovenia
+Solomon Islands
+Somalia
+South Africa
+South Korea|Korea|Republic of Korea|Korea, Republic of
+South Sudan
+Spain
+Sri Lanka
+Sudan
+Suriname
+Sweden
+Switzerland
+Syria|Syrian Arab Republic
+Taiwan
+Tajikistan
+Tanzania
+Thailand
+Timor-Leste|East Timor
+Togo
+Tonga
+Trinidad and Tobago|Trinid & Tobago
+Tunisia
+Turkey|Turkiye|Türkiye
+Turkmenistan
+Tuvalu
+UK|United Kingdom|England|Scotland|Wales|North Ireland|Northern Ireland|Great Britain
+Uganda
+Ukraine
+United Arab Emirates|U Arab Emirates|UAE
+USA|United States|United States of America
+Uruguay
+Uzbekistan
+Vanuatu
+Vatican|Vatican City
+Venezuela
+Vietnam|Viet Nam
+Yemen
+Zambia
+Zimbabwe
+"""
+
+# Segments naming an institution rather than a department or city
+INSTITUTION_PATTERN = (r'(?:univ|inst|coll|hosp|acad|ctr|center|centre|lab|school|'
+                       r'polytech|minist|council|fdn|corp|co ltd|gmbh|inc\b|agcy)')
+
+
+def _normalize(text):
+    """Lower case with periods as spaces ("P.R. China" -> "p r  china")"""
+    return text.lower().replace('.', ' ')
+
+
+def _load_gazetteer(text):
+    """normalized alias -> canonical country name"""
+    aliases = {}
+    for line in text.strip().splitlines():
+        names = [name.strip() for name in line.split('|')]
+        for name in names:
+            aliases[_normalize(name)] = names[0]
+    return aliases
+
+
+COUNTRY_ALIASES = _load_gazetteer(COUNTRY_GAZETTEER)
+
+
+def trie_pattern(words):
+    """
+    Regex alternation of words built as a character trie
+
+    Alternatives sharing a prefix are merged ("nig(?:er(?:ia)?)"), so the
+    engine walks one branch per character instead of trying every word,
+    and longer words are preferred over their prefixes.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node):
+        end = '' in node
+        branches = [re.escape(char) + build(child)
+                    for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if end:
+            body = '(?:' + body + ')?'
+        return body
+
+    return build(trie)
+
+
+# Country names are matched on reversed strings: the first match in the
+# reversed address is the last country mentioned, and the trie prefers
+# the longest alias ending there ("papua new guinea" over "guinea")
+_REVERSED_COUNTRIES = re.compile(
+    r'(?<![a-z])(' + trie_pattern(alias[::-1] for alias in COUNTRY_ALIASES) + r')(?![a-z])')
+
+
+def strip_author_prefix(addresses):
+    """Remove the WoS "[Author; Author] " prefix from C1 addresses"""
+    return addresses.str.replace(r'^\s*\[[^\]]*\]\s*', '', regex=True)
+
+
+def address_countries(addresses):
+    """
+    Country of each address (vectorized)
+
+    Parameters:
+    -----------
+    addresses : pd.Series of str
+        One address per element, e.g. the affiliation token vocabulary
+
+    Returns:
+    --------
+    pd.Series of canonical country names (NaN when none is found)
+    """
+    text = strip_author_prefix(pd.Series(addresses, dtype=object).astype(str))
+    reversed_text = text.map(_normalize).str[::-1]
+    found = reversed_text.str.extract(_REVERSED_COUNTRIES, expand=False)
+    return found.str[::-1].map(COUNTRY_ALIASES)
+
+
+def address_institutions(addresses, aliases=None):
+    """
+    Institution of each address (vectorized)
+
+    The institution is the first comma segment that looks like one
+    (University, Institute, Hospital, ...), falling back to the first
+    segment; WoS C1 addresses put it first anyway.
+
+    Parameters:
+    -----------
+    addresses : pd.Series of str
+        One address per element
+    aliases : dict, optional
+        Institution gazetteer mapping variant spellings (e.g. "Tsinghua
+        Univ") to canonical names
+    """
+    text = strip_author_prefix(pd.Series(addresses, dtype=object).astype(str))
+    found = text.str.extract(r'(?:^|,)\s*([^,]*' + INSTITUTION_PATTERN + r'[^,]*)',
+                             flags=re.IGNORECASE, expand=False)
+    institutions = found.fillna(text.str.split(',').str[0]).str.strip().str.rstrip('.')
+    institutions = institutions.where(institutions.str.len() > 0)
+    if aliases:
+        institutions = institutions.replace(aliases)
+    return institutions
+
+
+def collaboration_table(doc, country, labels, first_country, n_docs):
+    """
+    Country production with single/multiple country publications
+
+    Parameters:
+    -----------
+    doc, country : np.ndarray
+        (document, country code) pairs, one per distinct country per
+        document
+    labels : pd.Index
+        Country names indexed by code
+    first_country : pd.Series
+        Country of the first address of every document (NaN if unknown)
+    n_docs : int
+        Number of documents
+
+    Returns:
+    --------
+    DataFrame with Documents (any address in the country), Articles
+    (first address in the country), SCP, MCP and MCP_Ratio
+    """
+    countries_per_doc = np.bincount(doc, minlength=n_docs)
+    documents = np.bincount(country, minlength=len(labels))
+
+    first = pd.Series(first_country).reset_index(drop=True)
+    known = first.notna().to_numpy()
+    first_code = pd.Index(labels).get_indexer(first[known])
+    valid = first_code >= 0
+    first_code = first_code[valid]
+    multi = countries_per_doc[np.flatnonzero(known)[valid]] > 1
+
+    articles = np.bincount(first_code, minlength=len(labels))
+    mcp = np.bincount(first_code[multi], minlength=len(labels))
+
+    table = pd.DataFrame({
+        'Country': labels,
+        'Documents': documents,
+        'Articles': articles,
+        'SCP': articles - mcp,
+        'MCP': mcp
+    })
+    table['MCP_Ratio'] = (table['MCP'] / table['Articles'].where(table['Articles'] > 0)).round(3)
+    return table.sort_values(['Documents', 'Articles'], ascending=False, ignore_index=True)
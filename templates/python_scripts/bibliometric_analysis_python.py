@@ -15,132 +15,1175 @@ Requirements: See requirements.txt
 Installation: pip install -r requirements.txt
 """
 
+import os
+import sys
+import copy
+import glob
+import argparse
+import warnings
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from collections import Counter
-import networkx as nx
-from wordcloud import WordCloud
-import warnings
-warnings.filterwarnings('ignore')
 
-# Set visualization style
-sns.set_style("whitegrid")
-plt.rcParams['figure.figsize'] = (12, 8)
-plt.rcParams['font.size'] = 11
+# Plotting, network, topic and database libraries are imported by the
+# sibling modules only when a section or figure needs them, so stats-only
+# runs start without them (figures: bibliometric_render.render_figures)
 
 # ==============================================================================
 # SECTION 1: DATA LOADING & PREPARATION
 # ==============================================================================
 
+# Bump whenever parsing or normalization changes the loaded corpus, so
+# cached corpora built by older code are rebuilt
+PARSER_VERSION = '2'
+
+# WoS field tags mapped to the column names used by every analysis
+WOS_COLUMN_MAP = {
+    'AU': 'Authors',
+    'TI': 'Title',
+    'SO': 'Source',
+    'PY': 'Year',
+    'AB': 'Abstract',
+    'DE': 'Author_Keywords',
+    'TC': 'Citations',
+    'CR': 'References',
+    'C1': 'Affiliations',
+    'ID': 'Keywords_Plus',
+    'DI': 'DOI',
+    'UT': 'UT'
+}
+
+# Scopus CSV headers mapped onto the same canonical names. The Scopus
+# 'Source' column (always "Scopus") is deliberately not mapped.
+SCOPUS_COLUMN_MAP = {
+    'Authors': 'Authors',
+    'Title': 'Title',
+    'Source title': 'Source',
+    'Year': 'Year',
+    'Abstract': 'Abstract',
+    'Author Keywords': 'Author_Keywords',
+    'Cited by': 'Citations',
+    'References': 'References',
+    'Affiliations': 'Affiliations',
+    'Index Keywords': 'Keywords_Plus',
+    'DOI': 'DOI',
+    'EID': 'EID'
+}
+
+CANONICAL_COLUMNS = [
+    'Authors', 'Title', 'Source', 'Year', 'Abstract', 'Author_Keywords',
+    'Keywords_Plus', 'Citations', 'References', 'Affiliations', 'DOI',
+    'UT', 'EID'
+]
+
+# Record identifiers, always loaded so records can be deduplicated
+ID_COLUMNS = ['UT', 'EID', 'DOI']
+
+# Columns each analysis section reads, keyed like self.results
+SECTION_COLUMNS = {
+    'statistics': ['Year', 'Authors', 'Source', 'Author_Keywords', 'Citations'],
+    'trends': ['Year'],
+    'top_cited': ['Title', 'Authors', 'Year', 'Source', 'Citations'],
+    'top_authors': ['Authors', 'Citations', 'Year'],
+    'top_sources': ['Source', 'Citations', 'Year'],
+    'top_keywords': ['Author_Keywords'],
+    'topics': ['Abstract', 'Year'],
+    'top_countries': ['Affiliations'],
+    'top_affiliations': ['Affiliations'],
+    'network_keywords': ['Author_Keywords'],
+    'network_authors': ['Authors'],
+    'network_countries': ['Affiliations'],
+    'network_cocitation': ['References'],
+    'network_coupling': ['References', 'Authors', 'Year', 'Source', 'Citations'],
+    'local_citations': ['References', 'DOI', 'Authors', 'Year', 'Source', 'Citations'],
+    'historiograph': ['References', 'DOI', 'Authors', 'Year', 'Source', 'Citations'],
+    'thematic_map': ['Author_Keywords', 'Year'],
+    'thematic_evolution': ['Author_Keywords', 'Year']
+}
+
+# Sections run by run_complete_analysis
+REPORT_SECTIONS = ['statistics', 'trends', 'top_cited', 'top_authors',
+                   'top_sources', 'top_keywords', 'top_countries']
+
+# section -> (method, keyword arguments, token tables read)
+SECTION_TASKS = {
+    'statistics': ('generate_statistics', {}, ['authors', 'keywords']),
+    'trends': ('analyze_trends', {}, []),
+    'top_cited': ('most_cited_papers', {}, []),
+    'top_authors': ('most_productive_authors', {}, ['authors']),
+    'top_sources': ('most_relevant_sources', {}, []),
+    'top_keywords': ('keyword_analysis', {}, ['keywords']),
+    'topics': ('topic_analysis', {}, []),
+    'top_countries': ('country_analysis', {}, ['affiliations']),
+    'top_affiliations': ('most_relevant_affiliations', {}, ['affiliations']),
+    'network_keywords': ('cooccurrence_network', {'field': 'keywords'}, ['keywords']),
+    'network_authors': ('cooccurrence_network', {'field': 'authors'}, ['authors']),
+    'network_countries': ('cooccurrence_network', {'field': 'countries'}, ['affiliations']),
+    'network_cocitation': ('cocitation_network', {}, ['references']),
+    'network_coupling': ('bibliographic_coupling', {}, ['references']),
+    'local_citations': ('local_citations', {}, ['references']),
+    'historiograph': ('historiograph', {}, ['references']),
+    'thematic_map': ('thematic_map', {}, ['keywords']),
+    'thematic_evolution': ('thematic_evolution', {}, ['keywords'])
+}
+
+# Tags whose continuation lines are separate items (one author, one cited
+# reference, one address per line); other tags wrap running text
+WOS_LIST_TAGS = {'AU', 'AF', 'BA', 'BF', 'BE', 'CA', 'GP', 'CR', 'C1'}
+
+# Header/footer tags that do not belong to any record
+WOS_FILE_TAGS = {'FN', 'VR', 'EF'}
+
+
+def expand_paths(data_path, pattern='*'):
+    """
+    Resolve a file, directory or glob pattern into a sorted list of files
+
+    Parameters:
+    -----------
+    data_path : str or list
+        File path, directory, glob pattern (e.g. 'exports/*.txt') or a
+        list of any of these
+    pattern : str
+        Glob used to pick files when data_path is a directory
+    """
+    if isinstance(data_path, (list, tuple)):
+        paths = []
+        for path in data_path:
+            paths.extend(expand_paths(path, pattern))
+        return paths
+
+    path = str(data_path)
+    if os.path.isdir(path):
+        paths = sorted(glob.glob(os.path.join(path, pattern)))
+    elif any(c in path for c in '*?['):
+        paths = sorted(glob.glob(path))
+    else:
+        paths = [path]
+
+    if not paths:
+        raise FileNotFoundError(f"No input files match: {path}")
+    return paths
+
+
+def iter_wos_records(paths, tags=None):
+    """
+    Stream Web of Science plain text records one at a time
+
+    Indented continuation lines are attached to the preceding tag: list
+    tags (AU, CR, C1, ...) get one '; '-separated item per line, text
+    tags (TI, AB, ...) are re-joined with spaces.
+
+    Parameters:
+    -----------
+    paths : list of str
+        WoS export files, read in order
+    tags : set of str, optional
+        Only keep these tags (all tags when None). Every record is still
+        yielded, with NaN for selected tags it does not have.
+
+    Yields:
+    -------
+    dict mapping WoS tag -> field string
+    """
+    def _emit(record):
+        fields = _join_wos_fields(record)
+        if tags is not None:
+            fields = {tag: fields.get(tag, np.nan) for tag in sorted(tags)}
+        return fields
+
+    for filepath in paths:
+        with open(filepath, 'r', encoding='utf-8-sig') as f:
+            record = {}
+            # Whether a record has started (its tags may all be filtered out)
+            started = False
+            tag = None
+
+            for line in f:
+                line = line.rstrip('\r\n')
+                if not line.strip():
+                    continue
+
+                if line.startswith('   '):
+                    # Continuation of the previous tag
+                    if tag in record:
+                        content = line.strip()
+                        if tag in WOS_LIST_TAGS:
+                            record[tag].append(content)
+                        else:
+                            record[tag][-1] += ' ' + content
+                    continue
+
+                tag = line[:2]
+                content = line[3:].strip()
+
+                if tag == 'ER':
+                    if started:
+                        yield _emit(record)
+                    record = {}
+                    started = False
+                    tag = None
+                    continue
+
+                if tag in WOS_FILE_TAGS:
+                    tag = None
+                    continue
+
+                if tag == 'PT' and started:
+                    # Export without ER lines
+                    yield _emit(record)
+                    record = {}
+
+                started = True
+                if tags is not None and tag not in tags:
+                    continue
+
+                # Repeated tags are merged like multi-line ones
+                record.setdefault(tag, []).append(content)
+
+            if started:
+                yield _emit(record)
+
+
+def columns_for_sections(sections):
+    """Canonical columns needed to run the given analysis sections"""
+    columns = list(ID_COLUMNS)
+    for section in sections:
+        if section not in SECTION_COLUMNS:
+            raise ValueError(f"Unknown section '{section}'. "
+                             f"Choose from: {', '.join(SECTION_COLUMNS)}")
+        for col in SECTION_COLUMNS[section]:
+            if col not in columns:
+                columns.append(col)
+    return columns
+
+
+def compact_dtypes(df):
+    """
+    Convert canonical columns to compact dtypes in place
+
+    Year becomes nullable Int32 (early-access records have no year),
+    Citations int32 with missing counts as 0, and Source categorical.
+    """
+    if 'Year' in df.columns:
+        df['Year'] = pd.to_numeric(df['Year'], errors='coerce').astype('Int32')
+    if 'Citations' in df.columns:
+        df['Citations'] = (pd.to_numeric(df['Citations'], errors='coerce')
+                           .fillna(0).astype('int32'))
+    if 'Source' in df.columns:
+        df['Source'] = df['Source'].astype('category')
+    return df
+
+
+def scopus_usecols(filepath, columns=None):
+    """
+    Scopus CSV headers that map onto the wanted canonical columns
+
+    Parameters:
+    -----------
+    filepath : str
+        Scopus CSV export (only the header is read)
+    columns : list of str, optional
+        Canonical columns to keep (all of CANONICAL_COLUMNS when None)
+    """
+    header = pd.read_csv(filepath, nrows=0, encoding='utf-8-sig').columns
+    wanted = set(columns) if columns is not None else set(CANONICAL_COLUMNS)
+    return [c for c in header if SCOPUS_COLUMN_MAP.get(c) in wanted]
+
+
+def _scopus_frame(df):
+    """Rename Scopus headers and normalize author separators"""
+    df.rename(columns=SCOPUS_COLUMN_MAP, inplace=True)
+
+    if 'Authors' in df.columns:
+        authors = df['Authors'].mask(
+            df['Authors'].str.startswith('[No author', na=False))
+        # Older exports separate authors with commas ("Li, X., Wang, Y.")
+        comma_sep = ~authors.str.contains(';', na=True)
+        authors[comma_sep] = authors[comma_sep].str.replace(
+            r'(?<=\.),\s*', '; ', regex=True)
+        df['Authors'] = authors
+
+    return df
+
+
+def read_scopus_csv(filepath, columns=None, engine=None):
+    """
+    Read one Scopus CSV export into the canonical schema
+
+    Parameters:
+    -----------
+    filepath : str
+        Scopus CSV export
+    columns : list of str, optional
+        Canonical columns to read; others are never parsed
+    engine : str, optional
+        pandas CSV engine ('c' or 'pyarrow')
+    """
+    usecols = scopus_usecols(filepath, columns)
+
+    read_kwargs = {'usecols': usecols, 'encoding': 'utf-8-sig'}
+    if 'Source title' in usecols:
+        read_kwargs['dtype'] = {'Source title': 'category'}
+    if engine is not None:
+        read_kwargs['engine'] = engine
+
+    return _scopus_frame(pd.read_csv(filepath, **read_kwargs))
+
+
+def iter_scopus_chunks(paths, chunk_size=5000, columns=None):
+    """
+    Stream Scopus records in fixed-size chunks
+
+    Parameters:
+    -----------
+    paths : list of str
+        Scopus CSV exports
+    chunk_size : int
+        Records per chunk
+    columns : list of str, optional
+        Canonical columns to read
+
+    Yields:
+    -------
+    pandas.DataFrame in the canonical schema
+    """
+    for path in paths:
+        reader = pd.read_csv(path, usecols=scopus_usecols(path, columns),
+                             encoding='utf-8-sig', chunksize=chunk_size)
+        for chunk in reader:
+            yield _scopus_frame(chunk)
+
+
+def _join_wos_fields(record):
+    """Collapse per-line field parts into '; '-separated strings"""
+    return {tag: '; '.join(parts) for tag, parts in record.items()}
+
+
+def _wos_frame(records):
+    """Build a DataFrame with canonical column names from WoS records"""
+    df = pd.DataFrame.from_records(records)
+
+    # Rename columns
+    df.rename(columns=WOS_COLUMN_MAP, inplace=True)
+
+    # Convert year and citations to numeric
+    df['Year'] = pd.to_numeric(df.get('Year', 0), errors='coerce')
+    df['Citations'] = pd.to_numeric(df.get('Citations', 0), errors='coerce')
+
+    return df
+
+
+def iter_wos_chunks(paths, chunk_size=5000, as_arrow=False, tags=None):
+    """
+    Stream WoS records in fixed-size chunks
+
+    At most chunk_size records are held in Python objects at a time, so
+    memory stays bounded however many export files are merged.
+
+    Parameters:
+    -----------
+    paths : list of str
+        WoS export files
+    chunk_size : int
+        Records per chunk
+    as_arrow : bool
+        Yield pyarrow.RecordBatch objects instead of DataFrames. Batches
+        are projected onto the mapped columns so every batch shares one
+        schema (e.g. for pyarrow.parquet.ParquetWriter)
+    tags : set of str, optional
+        Only parse these WoS tags
+
+    Yields:
+    -------
+    pandas.DataFrame or pyarrow.RecordBatch
+    """
+    if as_arrow:
+        import pyarrow as pa
+        schema = pa.schema([
+            (col, pa.int64() if col in ('Year', 'Citations') else pa.string())
+            for col in WOS_COLUMN_MAP.values()
+        ])
+
+    def _emit(records):
+        df = _wos_frame(records)
+        if not as_arrow:
+            return df
+        df = df.reindex(columns=schema.names)
+        for col in schema.names:
+            # Columns of tags that were not parsed are all-NaN floats
+            df[col] = df[col].astype('Int64' if col in ('Year', 'Citations') else object)
+        return pa.RecordBatch.from_pandas(df, schema=schema, preserve_index=False)
+
+    batch = []
+    for record in iter_wos_records(paths, tags):
+        batch.append(record)
+        if len(batch) >= chunk_size:
+            yield _emit(batch)
+            batch = []
+
+    if batch:
+        yield _emit(batch)
+
+
+# ------------------------------------------------------------------------------
+# Tokenized fields: multi-valued columns parsed once into integer codes
+# ------------------------------------------------------------------------------
+
+# Separator for C1 addresses: ';' outside of the "[Author; Author]" prefix
+AFFILIATION_SEP = r';(?![^\[]*\])'
+
+# name -> (column, separator, regex separator, lowercase items)
+TOKEN_FIELDS = {
+    'authors': ('Authors', ';', False, False),
+    'keywords': ('Author_Keywords', ';', False, True),
+    'references': ('References', ';', False, False),
+    'affiliations': ('Affiliations', AFFILIATION_SEP, True, False)
+}
+
+
+class TokenTable:
+    """
+    Exploded (document, item) pairs of one multi-valued field
+
+    Attributes:
+    -----------
+    doc : np.ndarray of int32
+        Row position of the document in the corpus DataFrame, sorted
+    code : np.ndarray of int32
+        Item code, an index into vocab
+    vocab : pd.Index
+        Distinct item strings in order of first appearance
+    n_docs : int
+        Number of documents in the corpus (including ones without items)
+    """
+
+    def __init__(self, doc, code, vocab, n_docs):
+        self.doc = doc
+        self.code = code
+        self.vocab = vocab
+        self.n_docs = n_docs
+
+    @classmethod
+    def from_series(cls, series, sep=';', regex=False, lower=False):
+        """
+        Split, strip and integer-code a delimited text column
+
+        Each item is counted at most once per document.
+        """
+        n_docs = len(series)
+        values = series.reset_index(drop=True).dropna().astype(str)
+
+        items = values.str.split(sep, regex=regex).explode().str.strip()
+        if lower:
+            items = items.str.lower()
+        items = items[items.str.len() > 0]
+
+        codes, vocab = pd.factorize(items)
+        if len(vocab) == 0:
+            empty = np.array([], dtype=np.int32)
+            return cls(empty, empty.copy(), pd.Index(vocab), n_docs)
+
+        # Drop repeated items within a document; keys sort by document
+        keys = np.unique(items.index.to_numpy(np.int64) * len(vocab) + codes)
+        doc = (keys // len(vocab)).astype(np.int32)
+        code = (keys % len(vocab)).astype(np.int32)
+        return cls(doc, code, pd.Index(vocab), n_docs)
+
+    def __len__(self):
+        return len(self.code)
+
+    def frame(self):
+        """Long-format DataFrame with doc, code and item columns"""
+        return pd.DataFrame({
+            'doc': self.doc,
+            'code': self.code,
+            'item': self.vocab.take(self.code)
+        })
+
+    def counts(self):
+        """Number of documents per item code"""
+        return np.bincount(self.code, minlength=len(self.vocab))
+
+    def items_per_doc(self):
+        """Number of items per document"""
+        return np.bincount(self.doc, minlength=self.n_docs)
+
+    def top(self, n=None, counts=None):
+        """
+        Items ranked by document count (ties keep first-seen order)
+
+        counts, when given, replaces self.counts() (e.g. running totals)
+        """
+        counts = self.counts() if counts is None else counts
+        order = np.argsort(-counts, kind='stable')[:n]
+        return pd.Series(counts[order], index=self.vocab.take(order))
+
+    def map_items(self, func):
+        """
+        Derive a coarser TokenTable by mapping every vocabulary item
+
+        Parameters:
+        -----------
+        func : callable
+            Takes the vocabulary as a string Series and returns a Series
+            of new labels (NaN drops the item). Runs once per distinct
+            item, not once per occurrence.
+        """
+        mapped = func(pd.Series(self.vocab, dtype=object))
+        new_codes, vocab = pd.factorize(pd.Series(mapped, dtype=object))
+        code = new_codes[self.code]
+        keep = code >= 0
+        if len(vocab) == 0 or not keep.any():
+            empty = np.array([], dtype=np.int32)
+            return TokenTable(empty, empty.copy(), pd.Index(vocab), self.n_docs)
+
+        keys = np.unique(self.doc[keep].astype(np.int64) * len(vocab) + code[keep])
+        return TokenTable((keys // len(vocab)).astype(np.int32),
+                          (keys % len(vocab)).astype(np.int32),
+                          pd.Index(vocab), self.n_docs)
+
+    def append(self, other):
+        """
+        TokenTable of this corpus followed by the documents of other
+
+        The vocabulary grows append-only: existing codes are unchanged and
+        items first seen in other get new codes at the end.
+        """
+        new_items = other.vocab.difference(self.vocab, sort=False)
+        vocab = self.vocab.append(new_items)
+        code = vocab.get_indexer(other.vocab)[other.code].astype(np.int32)
+        return TokenTable(np.concatenate([self.doc, other.doc + self.n_docs]),
+                          np.concatenate([self.code, code]),
+                          vocab, self.n_docs + other.n_docs)
+
+    def select(self, rows):
+        """
+        TokenTable of the documents at sorted positions rows, renumbered
+        0..len(rows)-1, with the vocabulary cut to the items they use
+
+        Pairs are located by binary search on the sorted doc array, so
+        the cost follows the size of the selection, not of the corpus.
+        """
+        from bibliometric_index import gather_ranges
+
+        rows = np.asarray(rows)
+        starts = np.searchsorted(self.doc, rows, 'left')
+        stops = np.searchsorted(self.doc, rows, 'right')
+        pairs = gather_ranges(starts, stops)
+        doc = np.repeat(np.arange(len(rows), dtype=np.int32), stops - starts)
+
+        # Renumber items in order of first appearance among the selected
+        # documents, as from_series would on those rows
+        used, first, inverse = np.unique(self.code[pairs], return_index=True,
+                                         return_inverse=True)
+        order = np.argsort(first, kind='stable')
+        remap = np.empty(len(used), dtype=np.int32)
+        remap[order] = np.arange(len(used), dtype=np.int32)
+        return TokenTable(doc, remap[inverse], self.vocab.take(used[order]), len(rows))
+
+    def tail(self, start):
+        """Pairs of documents from row start on, with doc relative to start"""
+        first = np.searchsorted(self.doc, start)
+        return TokenTable(self.doc[first:] - start, self.code[first:], self.vocab,
+                          self.n_docs - start)
+
+    def to_frames(self):
+        """(pairs, vocabulary) DataFrames for columnar storage"""
+        pairs = pd.DataFrame({'doc': self.doc, 'code': self.code})
+        vocab = pd.DataFrame({'item': self.vocab.astype(str)})
+        return pairs, vocab
+
+    @classmethod
+    def from_frames(cls, pairs, vocab, n_docs):
+        """Rebuild a TokenTable stored with to_frames"""
+        return cls(pairs['doc'].to_numpy(np.int32), pairs['code'].to_numpy(np.int32),
+                   pd.Index(vocab['item']), n_docs)
+
+
 class BibliometricAnalysis:
     """Main class for bibliometric analysis"""
 
-    def __init__(self, data_path, data_type='wos'):
+    def __init__(self, data_path, data_type='wos', chunk_size=5000,
+                 csv_engine=None, use_cache=True, cache_dir=None,
+                 cache_max_bytes=2 * 1024 ** 3):
         """
         Initialize analysis
 
         Parameters:
         -----------
-        data_path : str
-            Path to data file (.txt for WoS, .csv for Scopus)
+        data_path : str, list or dict
+            Path to data file (.txt for WoS, .csv for Scopus). For WoS this
+            may also be a directory, a glob pattern or a list of exports.
+            With data_type='merged', a dict {'wos': path, 'scopus': path}
         data_type : str
-            'wos' or 'scopus'
+            'wos', 'scopus' or 'merged' (both, deduplicated)
+        chunk_size : int
+            Records parsed per chunk when streaming WoS exports
+        csv_engine : str, optional
+            pandas CSV engine for Scopus exports, e.g. 'pyarrow'
+        use_cache : bool
+            Reuse parsed corpora stored as Parquet (requires pyarrow)
+        cache_dir : str, optional
+            Cache location (default: .bibliometric_cache next to the input)
+        cache_max_bytes : int
+            Size limit of the cache; least recently used entries are
+            evicted first
         """
         self.data_path = data_path
         self.data_type = data_type
+        self.chunk_size = chunk_size
+        self.csv_engine = csv_engine
+        self.use_cache = use_cache
+        self.cache_dir = cache_dir
+        self.cache_max_bytes = cache_max_bytes
         self.df = None
+        self.tokens = {}
         self.results = {}
+        self.figures = {}
+        self.aggregates = None
+        self.merge_report = None
+        self._yearly_cooccurrence = {}
+        self._local_links = None
+        self._index = None
+        self.parent = None
+        self.rows = None
+
+        from bibliometric_profiling import RunProfiler
+        self.profiler = RunProfiler()
 
         print(f"Initializing Bibliometric Analysis")
         print(f"Data type: {data_type}")
         print(f"File: {data_path}")
 
-    def load_data(self):
-        """Load bibliographic data"""
-        if self.data_type == 'scopus':
-            self.df = pd.read_csv(self.data_path)
-            print(f"✓ Loaded {len(self.df)} records from Scopus")
-        elif self.data_type == 'wos':
-            # WoS requires custom parser
-            self.df = self._parse_wos(self.data_path)
-            print(f"✓ Loaded {len(self.df)} records from Web of Science")
+    def instrument(self, profile=False, trace_memory=False, profile_dir=None):
+        """
+        Configure per-stage instrumentation (always on for time and RSS)
+
+        Parameters:
+        -----------
+        profile : bool
+            cProfile each top-level stage; dumps are written with the
+            run report
+        trace_memory : bool
+            Record peak Python/numpy allocations per stage (tracemalloc)
+        profile_dir : str, optional
+            Directory for the .prof dumps
+
+        Returns:
+        --------
+        The RunProfiler; use add_hook(hook) to be called around stages
+        """
+        self.profiler.profile = profile
+        self.profiler.trace_memory = trace_memory
+        self.profiler.profile_dir = profile_dir
+        return self.profiler
+
+    def _stage(self, name, rows=None):
+        """Context manager measuring one stage of the run"""
+        return self.profiler.stage(name, rows)
+
+    def write_run_report(self, path='outputs/run_report.json'):
+        """Write wall/CPU time, peak RSS and rows of every stage as JSON"""
+        self.profiler.write_report(path)
+        print(f"✓ Run report saved to: {path}")
+        return path
+
+    def load_data(self, sections=None, columns=None):
+        """
+        Load bibliographic data into the canonical schema
+
+        Parameters:
+        -----------
+        sections : list of str, optional
+            Only load the columns these sections need (see SECTION_COLUMNS)
+        columns : list of str, optional
+            Explicit canonical columns to load; overrides sections
+        """
+        with self._stage('load_data') as stage:
+            self._load_data(sections, columns)
+            stage['rows'] = self._n_docs()
+        return self
+
+    def _load_data(self, sections=None, columns=None):
+        if columns is None and sections is not None:
+            columns = columns_for_sections(sections)
+
+        if self.data_type not in ('wos', 'scopus', 'merged'):
+            raise ValueError("data_type must be 'wos', 'scopus' or 'merged'")
+
+        if self.data_type == 'merged':
+            if columns is not None:
+                columns = list(dict.fromkeys(columns + ['Title', 'Year']))
+            sources = {name: expand_paths(path, '*.csv' if name == 'scopus' else '*.txt')
+                       for name, path in self.data_path.items()}
+            paths = [path for name_paths in sources.values() for path in name_paths]
+        else:
+            paths = expand_paths(self.data_path,
+                                 '*.csv' if self.data_type == 'scopus' else '*.txt')
+
+        cache = self._corpus_cache(paths)
+        if cache is not None:
+            key = cache.key(paths, PARSER_VERSION, data_type=self.data_type,
+                            columns=sorted(columns) if columns is not None else None)
+            with self._stage('cache_load'):
+                frames = cache.load(key)
+            if frames is not None:
+                self._restore_frames(frames)
+                print(f"✓ Loaded {len(self.df)} records from cache ({cache.cache_dir})")
+                return self
+
+        with self._stage('parse') as stage:
+            if self.data_type == 'merged':
+                self.df = self._merge_sources(sources, columns)
+            elif self.data_type == 'scopus':
+                self.df = self._read_scopus(paths, columns)
+                print(f"✓ Loaded {len(self.df)} records from Scopus")
+            else:
+                # WoS requires custom parser
+                self.df = self._parse_wos(paths, columns)
+                print(f"✓ Loaded {len(self.df)} records from Web of Science")
+
+            compact_dtypes(self.df)
+            stage['rows'] = len(self.df)
+
+        self.tokenize()
+
+        if cache is not None:
+            with self._stage('cache_save'):
+                cache.save(key, self._cache_frames())
+        return self
+
+    def _corpus_cache(self, paths):
+        """CorpusCache for this input, or None when caching is unavailable"""
+        if not self.use_cache:
+            return None
+
+        try:
+            import pyarrow  # noqa: F401 - Parquet engine
+        except ImportError:
+            print("⚠ pyarrow not installed - corpus cache disabled")
+            return None
+
+        from bibliometric_cache import CorpusCache
+        cache_dir = self.cache_dir or os.path.join(
+            os.path.dirname(os.path.abspath(paths[0])), '.bibliometric_cache')
+        return CorpusCache(cache_dir, self.cache_max_bytes)
+
+    def _cache_frames(self):
+        """Corpus and token tables as named DataFrames for the cache"""
+        frames = {'corpus': self.df}
+        for name, table in self.tokens.items():
+            frames[f'tokens_{name}'], frames[f'vocab_{name}'] = table.to_frames()
+        if self.merge_report is not None:
+            frames['merge_report'] = self.merge_report
+        return frames
+
+    def _restore_frames(self, frames):
+        """
+        Inverse of _cache_frames
+
+        A token table whose pairs are missing or point past the corpus is
+        rebuilt from the text columns, keeping the codes of its stored
+        vocabulary.
+        """
+        self.df = frames['corpus']
+        self.merge_report = frames.get('merge_report')
+        self.tokens = {}
+        stale = []
+        for key in frames:
+            if not key.startswith('vocab_'):
+                continue
+            name = key[len('vocab_'):]
+            pairs = frames.get(f'tokens_{name}')
+            if pairs is not None and (len(pairs) == 0 or pairs['doc'].max() < len(self.df)):
+                self.tokens[name] = TokenTable.from_frames(pairs, frames[key], len(self.df))
+            else:
+                stale.append(name)
+        # After the intact tables, which countries are derived from
+        for name in stale:
+            self._rebuild_tokens(name, frames[f'vocab_{name}'])
+
+    def _rebuild_tokens(self, name, vocab):
+        """Re-tokenize a field, keeping the codes of a stored vocabulary"""
+        field = 'affiliations' if name == 'countries' else name
+        if field not in TOKEN_FIELDS or TOKEN_FIELDS[field][0] not in self.df.columns:
+            return
+        self.tokens.pop(name, None)
+        table = self._tokens(name)
+        empty = np.array([], dtype=np.int32)
+        stored = TokenTable(empty, empty.copy(), pd.Index(vocab['item']), 0)
+        self.tokens[name] = stored.append(table)
+
+    def tokenize(self):
+        """
+        Build the TokenTable of every multi-valued field present in self.df
+
+        Runs once after load_data; analyses read self.tokens instead of
+        re-splitting the raw strings.
+        """
+        with self._stage('tokenize') as stage:
+            self.tokens = {}
+            for name, (column, sep, regex, lower) in TOKEN_FIELDS.items():
+                if column in self.df.columns:
+                    self.tokens[name] = TokenTable.from_series(
+                        self.df[column], sep, regex, lower)
+            stage['rows'] = sum(len(table) for table in self.tokens.values())
+        return self.tokens
+
+    def _tokens(self, name):
+        """TokenTable for a field, built on demand if self.df was replaced"""
+        if name == 'countries':
+            return self._country_tokens()
+
+        table = self.tokens.get(name)
+        if table is None or table.n_docs != len(self.df):
+            column, sep, regex, lower = TOKEN_FIELDS[name]
+            table = TokenTable.from_series(self.df[column], sep, regex, lower)
+            self.tokens[name] = table
+        return table
+
+    def _columns(self):
+        """Columns available to the analyses"""
+        return self.df.columns
+
+    def _n_docs(self):
+        """Number of documents in the corpus"""
+        return len(self.df)
+
+    # ------------------------------------------------------------------
+    # Filtered views
+    # ------------------------------------------------------------------
+
+    def __getstate__(self):
+        # Process workers get a view's own rows, not its parent corpus
+        state = self.__dict__.copy()
+        state['parent'] = None
+        state['_index'] = None
+        return state
+
+    def index(self):
+        """
+        Inverted indexes of the corpus (bibliometric_index.CorpusIndex),
+        built once and extended field by field as filters use them
+        """
+        if self._index is None or self._index.n_docs != len(self.df):
+            from bibliometric_index import CorpusIndex
+            self._index = CorpusIndex(self)
+        return self._index
+
+    def subset(self, years=None, sources=None, keywords=None, authors=None,
+               countries=None, match='exact'):
+        """
+        A view of the documents matching every filter
+
+        The view is a BibliometricAnalysis on which every analysis runs
+        as usual. Its token tables are sliced from this corpus (nothing is
+        re-split) and its rows are copied out by position (DataFrame.take).
+        Views can be filtered further; an empty view is returned with a
+        warning when nothing matches.
+
+        Parameters:
+        -----------
+        years : int or (first, last), optional
+            Publication year or inclusive range, e.g. (2018, 2024)
+        sources, keywords, authors, countries : str or list of str, optional
+            Any of the values must match (case-insensitive)
+        match : str
+            'exact' values or 'contains' (substring of the value)
+
+        Returns:
+        --------
+        BibliometricAnalysis view with parent (this analysis) and rows
+        (positions in parent.df)
+        """
+        filters = {'sources': sources, 'keywords': keywords, 'authors': authors,
+                   'countries': countries}
+        columns = {'sources': 'Source', 'keywords': 'Author_Keywords',
+                   'authors': 'Authors', 'countries': 'Affiliations'}
+        for name, values in filters.items():
+            if values is not None and columns[name] not in self.df.columns:
+                raise ValueError(f"{columns[name]} data not loaded; cannot filter {name}")
+        if years is not None and 'Year' not in self.df.columns:
+            raise ValueError("Year data not loaded; cannot filter years")
+
+        rows = self.index().select(years, match, **filters)
+
+        view = copy.copy(self)
+        view.df = self.df.take(rows).reset_index(drop=True)
+        view.tokens = {name: table.select(rows) for name, table in self.tokens.items()
+                       if table.n_docs == len(self.df)}
+        view.results = {}
+        view.figures = {}
+        view.aggregates = None
+        view._yearly_cooccurrence = {}
+        view._local_links = None
+        view._index = None
+        view.parent = self
+        view.rows = rows
+
+        from bibliometric_profiling import RunProfiler
+        view.profiler = RunProfiler()
+
+        if len(rows):
+            print(f"✓ Subset: {len(rows)} of {len(self.df)} documents")
         else:
+            print("⚠ No documents match the filters")
+        return view
+
+    # ------------------------------------------------------------------
+    # Incremental updates
+    # ------------------------------------------------------------------
+
+    def _aggregates(self):
+        """self.aggregates when they cover the current corpus, else None"""
+        if self.aggregates is not None and self.aggregates.n_docs == len(self.df):
+            return self.aggregates
+        return None
+
+    def build_aggregates(self, cooccurrence_fields=('keywords',)):
+        """
+        Start running aggregates (counters, yearly totals, co-occurrence)
+        from the current corpus; add_records keeps them up to date
+        """
+        from bibliometric_incremental import CorpusAggregates
+
+        self.aggregates = CorpusAggregates(
+            [name for name in cooccurrence_fields if name in self.tokens])
+        self.aggregates.update(self.df, self.tokens)
+        return self.aggregates
+
+    def add_records(self, data_path, data_type=None):
+        """
+        Append a new export without recomputing the existing corpus
+
+        Records already present (same WoS UT, Scopus EID or DOI) are
+        skipped. Only the new records are parsed and tokenized; token
+        vocabularies and self.aggregates are extended from the delta.
+        On a merged corpus new records are matched by identifier only
+        (not by title) and their Database is data_type.
+
+        Parameters:
+        -----------
+        data_path : str or list
+            New export file(s), directory or glob
+        data_type : str, optional
+            'wos' or 'scopus' (defaults to the corpus type; required for
+            a merged corpus)
+
+        Returns:
+        --------
+        Number of records added
+        """
+        from bibliometric_incremental import new_record_mask
+
+        if data_type is None and self.data_type == 'merged':
+            raise ValueError("add_records() on a merged corpus needs the type of the "
+                             "new export: data_type='wos' or 'scopus'")
+        data_type = data_type or self.data_type
+        if data_type not in ('wos', 'scopus'):
             raise ValueError("data_type must be 'wos' or 'scopus'")
 
+        columns = [c for c in self.df.columns if c in CANONICAL_COLUMNS]
+        if data_type == 'scopus':
+            delta = self._read_scopus(data_path, columns)
+        else:
+            delta = self._parse_wos(data_path, columns)
+
+        delta = delta[new_record_mask(self.df, delta)].reset_index(drop=True)
+        print(f"✓ {len(delta)} new records in {data_path}")
+        if len(delta) == 0:
+            return 0
+
+        compact_dtypes(delta)
+        if 'Database' in self.df.columns:
+            delta['Database'] = data_type
+        if self.aggregates is None:
+            self.build_aggregates()
+
+        n_old = len(self.df)
+        for name, (column, sep, regex, lower) in TOKEN_FIELDS.items():
+            if name in self.tokens:
+                self.tokens[name] = self.tokens[name].append(
+                    TokenTable.from_series(delta[column], sep, regex, lower))
+        if 'countries' in self.tokens:
+            from bibliometric_affiliations import address_countries
+
+            self.tokens['countries'] = self.tokens['countries'].append(
+                self.tokens['affiliations'].tail(n_old).map_items(address_countries))
+
+        sources = None
+        if 'Source' in self.df.columns:
+            sources = pd.api.types.union_categoricals(
+                [self.df['Source'], delta['Source']], ignore_order=True)
+        self.df = pd.concat([self.df, delta], ignore_index=True)
+        if sources is not None:
+            self.df['Source'] = sources
+
+        self.aggregates.update(delta, {name: table.tail(n_old)
+                                       for name, table in self.tokens.items()},
+                               self.tokens)
+        print(f"✓ Corpus now holds {len(self.df)} records")
+        return len(delta)
+
+    def save_corpus(self, directory):
+        """
+        Persist the corpus, token tables and aggregates (requires pyarrow)
+
+        Only records added since the last save to this directory are
+        written; vocabularies and aggregates are replaced.
+        """
+        from bibliometric_incremental import CorpusStore
+
+        frames = {}
+        for name, table in self.tokens.items():
+            frames[f'vocab_{name}'] = table.to_frames()[1]
+        if self.aggregates is not None:
+            frames.update(self.aggregates.to_frames())
+
+        CorpusStore(directory).save(self.df, self.tokens, frames)
+        print(f"✓ Corpus saved to: {directory}")
+
+    def load_corpus(self, directory):
+        """Load a corpus written by save_corpus instead of raw exports"""
+        from bibliometric_incremental import CorpusStore, CorpusAggregates
+
+        corpus, pairs, frames = CorpusStore(directory).load()
+        frames['corpus'] = corpus
+        for name, pair_frame in pairs.items():
+            frames[f'tokens_{name}'] = pair_frame
+        self._restore_frames(frames)
+
+        self.aggregates = None
+        if 'agg_meta' in frames:
+            self.aggregates = CorpusAggregates.from_frames(
+                frames, {name: len(table.vocab) for name, table in self.tokens.items()})
+
+        print(f"✓ Loaded {len(self.df)} records from {directory}")
         return self
 
-    def _parse_wos(self, filepath):
-        """Parse Web of Science plain text format"""
-        print("Parsing WoS file...")
+    def _read_scopus(self, filepath, columns=None):
+        """Read one or more Scopus CSV exports (file, directory or glob)"""
+        paths = expand_paths(filepath, '*.csv')
+        frames = [read_scopus_csv(path, columns, self.csv_engine) for path in paths]
+        if len(frames) == 1:
+            return frames[0]
 
-        records = []
-        current_record = {}
+        # Categories differ between files, so unify Source after concat
+        for frame in frames:
+            if 'Source' in frame.columns:
+                frame['Source'] = frame['Source'].astype(object)
+        return pd.concat(frames, ignore_index=True)
 
-        with open(filepath, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-
-                if line.startswith('PT '):
-                    if current_record:
-                        records.append(current_record)
-                    current_record = {}
-
-                if len(line) > 3 and line[2] == ' ':
-                    tag = line[:2]
-                    content = line[3:]
-
-                    if tag in current_record:
-                        current_record[tag] += '; ' + content
-                    else:
-                        current_record[tag] = content
-
-        if current_record:
-            records.append(current_record)
-
-        df = pd.DataFrame(records)
-
-        # Rename columns
-        column_mapping = {
-            'AU': 'Authors',
-            'TI': 'Title',
-            'SO': 'Source',
-            'PY': 'Year',
-            'AB': 'Abstract',
-            'DE': 'Author_Keywords',
-            'TC': 'Citations',
-            'CR': 'References',
-            'C1': 'Affiliations'
-        }
-
-        df.rename(columns=column_mapping, inplace=True)
-
-        # Convert year and citations to numeric
-        df['Year'] = pd.to_numeric(df.get('Year', 0), errors='coerce')
-        df['Citations'] = pd.to_numeric(df.get('Citations', 0), errors='coerce')
+    def _merge_sources(self, sources, columns=None, threshold=0.8):
+        """
+        Load every database into the canonical schema and deduplicate
+
+        Exact duplicates share a DOI, UT or EID; near-duplicates have
+        titles with estimated Jaccard similarity >= threshold in the same
+        year. Each link is recorded in self.merge_report.
 
+        Parameters:
+        -----------
+        sources : dict
+            'wos'/'scopus' -> list of export paths, in priority order
+        columns : list of str, optional
+            Canonical columns to load
+        threshold : float
+            Minimum title similarity for a near-duplicate
+        """
+        from bibliometric_merge import merge_records
+
+        frames = {}
+        for name, paths in sources.items():
+            if name == 'scopus':
+                frames[name] = self._read_scopus(paths, columns)
+            elif name == 'wos':
+                frames[name] = self._parse_wos(paths, columns)
+            else:
+                raise ValueError(f"Unknown database {name!r}: use 'wos' or 'scopus'")
+            print(f"✓ Loaded {len(frames[name])} records from {name}")
+
+        df, self.merge_report = merge_records(frames, threshold)
+
+        total = sum(len(frame) for frame in frames.values())
+        print(f"✓ Merged {total} records into {len(df)} "
+              f"({total - len(df)} duplicates removed)")
+        for rule, count in self.merge_report['rule'].value_counts().items():
+            print(f"  - {count} duplicate links by {rule}")
         return df
 
+    def iter_chunks(self, chunk_size=None, as_arrow=False):
+        """
+        Stream the WoS input as DataFrame or Arrow chunks without loading
+        the whole corpus
+
+        Parameters:
+        -----------
+        chunk_size : int, optional
+            Records per chunk (defaults to self.chunk_size)
+        as_arrow : bool
+            Yield pyarrow.RecordBatch objects instead of DataFrames
+        """
+        if self.data_type != 'wos':
+            raise ValueError("Chunked streaming is only available for data_type='wos'")
+
+        paths = expand_paths(self.data_path, '*.txt')
+        return iter_wos_chunks(paths, chunk_size or self.chunk_size, as_arrow)
+
+    def _parse_wos(self, filepath, columns=None):
+        """Parse Web of Science plain text format (file, directory or glob)"""
+        paths = expand_paths(filepath, '*.txt')
+        print(f"Parsing {len(paths)} WoS file(s)...")
+
+        tags = None
+        if columns is not None:
+            tags = {tag for tag, col in WOS_COLUMN_MAP.items() if col in columns}
+
+        chunks = list(iter_wos_chunks(paths, self.chunk_size, tags=tags))
+        if not chunks:
+            return _wos_frame([])
+
+        return pd.concat(chunks, ignore_index=True)
+
     # ================================================================
     # SECTION 2: DESCRIPTIVE STATISTICS
     # ================================================================
 
     def generate_statistics(self):
         """Generate main information table"""
+        stats = self._statistics()
+        self.results['statistics'] = stats
+
+        # Print statistics
+        print("\n" + "="*60)
+        print("MAIN INFORMATION")
+        print("="*60)
+        for key, value in stats.items():
+            print(f"{key:.<40} {value}")
+        print("="*60)
+
+        return stats
+
+    def _statistics(self):
+        """Main information values, in display order"""
         stats = {}
 
+        aggregates = self._aggregates()
+
         stats['Total Documents'] = len(self.df)
-        stats['Time Span'] = f"{int(self.df['Year'].min())}-{int(self.df['Year'].max())}"
-        stats['Average Year'] = f"{self.df['Year'].mean():.1f}"
+        # Empty views and corpora without known years have no time span
+        years = self.df['Year'].dropna()
+        if len(years):
+            stats['Time Span'] = f"{int(years.min())}-{int(years.max())}"
+            stats['Average Year'] = f"{years.mean():.1f}"
+        else:
+            stats['Time Span'] = stats['Average Year'] = 'N/A'
 
         # Authors
         if 'Authors' in self.df.columns:
-            all_authors = []
-            for authors in self.df['Authors'].dropna():
-                all_authors.extend([a.strip() for a in str(authors).split(';')])
-            stats['Total Authors'] = len(set(all_authors))
-            stats['Authors per Document'] = len(all_authors) / len(self.df)
+            authors = self._tokens('authors')
+            stats['Total Authors'] = len(authors.vocab)
+            stats['Authors per Document'] = len(authors) / max(len(self.df), 1)
 
         # Sources
         if 'Source' in self.df.columns:
@@ -148,26 +1191,17 @@ class BibliometricAnalysis:
 
         # Keywords
         if 'Author_Keywords' in self.df.columns:
-            all_keywords = []
-            for kw in self.df['Author_Keywords'].dropna():
-                all_keywords.extend([k.strip() for k in str(kw).split(';')])
-            stats['Total Keywords'] = len(set(all_keywords))
+            stats['Total Keywords'] = len(self._tokens('keywords').vocab)
 
         # Citations
         if 'Citations' in self.df.columns:
-            stats['Total Citations'] = int(self.df['Citations'].sum())
-            stats['Average Citations'] = f"{self.df['Citations'].mean():.2f}"
-            stats['Median Citations'] = int(self.df['Citations'].median())
-
-        self.results['statistics'] = stats
-
-        # Print statistics
-        print("\n" + "="*60)
-        print("MAIN INFORMATION")
-        print("="*60)
-        for key, value in stats.items():
-            print(f"{key:.<40} {value}")
-        print("="*60)
+            stats['Total Citations'] = (aggregates.total_citations if aggregates is not None
+                                        else int(self.df['Citations'].sum()))
+            if len(self.df):
+                stats['Average Citations'] = f"{self.df['Citations'].mean():.2f}"
+                stats['Median Citations'] = int(self.df['Citations'].median())
+            else:
+                stats['Average Citations'] = stats['Median Citations'] = 'N/A'
 
         return stats
 
@@ -177,30 +1211,12 @@ class BibliometricAnalysis:
 
     def analyze_trends(self, save_fig=True):
         """Analyze publication trends over time"""
-        yearly_counts = self.df['Year'].value_counts().sort_index()
-
-        plt.figure(figsize=(12, 6))
-        plt.plot(yearly_counts.index, yearly_counts.values,
-                marker='o', linewidth=2, markersize=8, color='#1f77b4')
-        plt.fill_between(yearly_counts.index, yearly_counts.values, alpha=0.3)
-
-        plt.title('Annual Scientific Production', fontsize=16, fontweight='bold')
-        plt.xlabel('Year', fontsize=12)
-        plt.ylabel('Number of Publications', fontsize=12)
-        plt.grid(alpha=0.3)
-
-        # Add trend line
-        z = np.polyfit(yearly_counts.index, yearly_counts.values, 1)
-        p = np.poly1d(z)
-        plt.plot(yearly_counts.index, p(yearly_counts.index),
-                "--", color='red', alpha=0.7, label='Trend')
-        plt.legend()
+        yearly_counts = self._yearly_counts()
 
         if save_fig:
-            plt.savefig('output_annual_production.png', dpi=300, bbox_inches='tight')
-            print("✓ Saved: output_annual_production.png")
-
-        plt.show()
+            self._add_figure('annual_production', 'annual_production', (12, 6),
+                             years=yearly_counts.index.to_numpy(dtype=np.int64),
+                             counts=yearly_counts.to_numpy(dtype=np.int64))
 
         # Calculate growth rate
         if len(yearly_counts) > 1:
@@ -211,19 +1227,30 @@ class BibliometricAnalysis:
         self.results['trends'] = yearly_counts
         return yearly_counts
 
+    def _yearly_counts(self):
+        """Documents per publication year, in year order"""
+        aggregates = self._aggregates()
+        if aggregates is not None and len(aggregates.yearly):
+            year = self.df['Year'].dtype
+            yearly = aggregates.yearly['Documents']
+            yearly.index = yearly.index.astype(year)
+            # value_counts of a nullable Year column counts as Int64
+            if pd.api.types.is_extension_array_dtype(year):
+                yearly = yearly.astype('Int64')
+            return yearly[yearly > 0].rename('count').sort_index()
+        return self.df['Year'].value_counts().sort_index()
+
     # ================================================================
     # SECTION 4: MOST CITED PAPERS
     # ================================================================
 
     def most_cited_papers(self, top_n=10):
         """Identify most cited papers"""
-        if 'Citations' not in self.df.columns:
+        if 'Citations' not in self._columns():
             print("⚠ Citation data not available")
             return None
 
-        top_cited = self.df.nlargest(top_n, 'Citations')[
-            ['Title', 'Authors', 'Year', 'Source', 'Citations']
-        ].copy()
+        top_cited = self._top_cited(top_n)
 
         # Calculate citations per year
         current_year = pd.Timestamp.now().year
@@ -238,38 +1265,32 @@ class BibliometricAnalysis:
         for idx, row in top_cited.iterrows():
             print(f"\n{row.name+1}. {row['Title']}")
             print(f"   Authors: {row['Authors'][:100]}...")
-            print(f"   {row['Source']} ({int(row['Year'])})")
+            year = int(row['Year']) if pd.notna(row['Year']) else 'n.d.'
+            print(f"   {row['Source']} ({year})")
             print(f"   Citations: {int(row['Citations'])} (Avg: {row['Citations_per_Year']:.1f}/year)")
 
         self.results['top_cited'] = top_cited
         return top_cited
 
+    def _top_cited(self, top_n):
+        """The top_n most cited documents, indexed by corpus row"""
+        return self.df.nlargest(top_n, 'Citations')[
+            ['Title', 'Authors', 'Year', 'Source', 'Citations']
+        ].copy()
+
     # ================================================================
     # SECTION 5: MOST PRODUCTIVE AUTHORS
     # ================================================================
 
     def most_productive_authors(self, top_n=15):
         """Identify most productive authors"""
-        if 'Authors' not in self.df.columns:
+        if 'Authors' not in self._columns():
             print("⚠ Author data not available")
             return None
 
-        # Extract all authors
-        author_list = []
-        for authors in self.df['Authors'].dropna():
-            author_list.extend([a.strip() for a in str(authors).split(';')])
-
-        # Count occurrences
-        author_counts = Counter(author_list)
-        top_authors = pd.DataFrame(
-            author_counts.most_common(top_n),
-            columns=['Author', 'Documents']
-        )
-
-        # Calculate h-index (simplified)
-        top_authors['h-index'] = top_authors['Documents'].apply(
-            lambda x: min(x, int(np.sqrt(x)))
-        )
+        impact = self._author_impact().rename(columns={'Name': 'Author'})
+        self.results['author_impact'] = impact
+        top_authors = impact.head(top_n)
 
         print(f"\n{'='*60}")
         print(f"TOP {top_n} MOST PRODUCTIVE AUTHORS")
@@ -277,80 +1298,88 @@ class BibliometricAnalysis:
         print(top_authors.to_string(index=False))
 
         # Visualization
-        plt.figure(figsize=(10, 6))
-        plt.barh(range(top_n), top_authors['Documents'].values[::-1], color='steelblue')
-        plt.yticks(range(top_n), top_authors['Author'].values[::-1])
-        plt.xlabel('Number of Documents')
-        plt.title('Most Productive Authors', fontweight='bold')
-        plt.tight_layout()
-        plt.savefig('output_top_authors.png', dpi=300, bbox_inches='tight')
-        print("\n✓ Saved: output_top_authors.png")
-        plt.show()
+        self._add_figure('top_authors', 'barh', (10, 6),
+                         labels=top_authors['Author'].tolist(),
+                         values=top_authors['Documents'].tolist(),
+                         title='Most Productive Authors',
+                         xlabel='Number of Documents', color='steelblue')
 
         self.results['top_authors'] = top_authors
         return top_authors
 
+    def _author_impact(self):
+        """Documents, fractionalized counts and h/g/m-index of every author"""
+        authors = self._tokens('authors')
+        return self._impact_table(authors.code, authors.doc, authors.vocab,
+                                  weights=1.0 / authors.items_per_doc()[authors.doc])
+
+    def _impact_table(self, entity, doc, labels, weights=None):
+        """Impact indicators of (document, entity) pairs, see bibliometric_impact"""
+        from bibliometric_impact import impact_table
+
+        n = len(self.df)
+        citations = (self.df['Citations'].to_numpy() if 'Citations' in self.df.columns
+                     else np.zeros(n, dtype=np.int64))
+        years = (self.df['Year'].to_numpy(dtype=float, na_value=np.nan)
+                 if 'Year' in self.df.columns else np.full(n, np.nan))
+        return impact_table(entity, doc, citations, years, labels, weights)
+
     # ================================================================
     # SECTION 6: MOST RELEVANT JOURNALS
     # ================================================================
 
     def most_relevant_sources(self, top_n=15):
         """Identify most relevant journals/sources"""
-        if 'Source' not in self.df.columns:
+        if 'Source' not in self._columns():
             print("⚠ Source data not available")
             return None
 
-        source_counts = self.df['Source'].value_counts().head(top_n)
+        n_docs = self._n_docs()
+        impact = self._source_impact().rename(columns={'Name': 'Source'})
+        self.results['source_impact'] = impact
+
+        source_counts = impact.head(top_n).set_index('Source')['Documents']
 
         print(f"\n{'='*60}")
         print(f"TOP {top_n} MOST RELEVANT SOURCES")
         print(f"{'='*60}")
 
-        for rank, (source, count) in enumerate(source_counts.items(), 1):
-            pct = (count / len(self.df)) * 100
-            print(f"{rank:2d}. {source[:50]:.<50} {count:>4d} ({pct:>5.2f}%)")
+        top = impact.head(top_n)
+        for rank, (source, count, h) in enumerate(
+                zip(top['Source'], top['Documents'], top['h-index']), 1):
+            pct = (count / n_docs) * 100
+            print(f"{rank:2d}. {source[:50]:.<50} {count:>4d} ({pct:>5.2f}%)  h={h}")
 
         # Bradford's Law visualization
-        cumsum = source_counts.cumsum() / len(self.df) * 100
-
-        plt.figure(figsize=(10, 6))
-        plt.plot(range(1, len(source_counts)+1), cumsum.values,
-                marker='o', linewidth=2)
-        plt.axhline(y=33.3, color='r', linestyle='--', alpha=0.7, label='Core (33%)')
-        plt.axhline(y=66.6, color='orange', linestyle='--', alpha=0.7, label='Zone 2 (67%)')
-        plt.xlabel('Number of Sources')
-        plt.ylabel('Cumulative % of Documents')
-        plt.title("Bradford's Law - Source Distribution", fontweight='bold')
-        plt.legend()
-        plt.grid(alpha=0.3)
-        plt.tight_layout()
-        plt.savefig('output_bradfords_law.png', dpi=300, bbox_inches='tight')
-        print("\n✓ Saved: output_bradfords_law.png")
-        plt.show()
+        cumsum = source_counts.cumsum() / n_docs * 100
+        self._add_figure('bradfords_law', 'bradford', (10, 6),
+                         cumulative=cumsum.tolist())
 
         self.results['top_sources'] = source_counts
         return source_counts
 
+    def _source_impact(self):
+        """Documents and h/g/m-index of every source"""
+        sources = self.df['Source'].astype('category').cat
+        known = np.flatnonzero(sources.codes >= 0)
+        return self._impact_table(sources.codes[known], known, sources.categories)
+
     # ================================================================
     # SECTION 7: KEYWORD ANALYSIS
     # ================================================================
 
     def keyword_analysis(self, top_n=30):
         """Analyze author keywords"""
-        if 'Author_Keywords' not in self.df.columns:
+        if 'Author_Keywords' not in self._columns():
             print("⚠ Keyword data not available")
             return None
 
-        # Extract all keywords
-        keyword_list = []
-        for keywords in self.df['Author_Keywords'].dropna():
-            keyword_list.extend([k.strip().lower() for k in str(keywords).split(';')])
-
-        keyword_counts = Counter(keyword_list)
-        top_keywords = pd.DataFrame(
-            keyword_counts.most_common(top_n),
-            columns=['Keyword', 'Occurrences']
-        )
+        # Count documents per keyword
+        keyword_counts = self._keyword_counts()
+        top_keywords = pd.DataFrame({
+            'Keyword': keyword_counts.index[:top_n],
+            'Occurrences': keyword_counts.values[:top_n]
+        })
 
         print(f"\n{'='*60}")
         print(f"TOP {top_n} AUTHOR KEYWORDS")
@@ -358,70 +1387,114 @@ class BibliometricAnalysis:
         print(top_keywords.to_string(index=False))
 
         # Word cloud
-        wordcloud = WordCloud(
-            width=1200, height=600,
-            background_color='white',
-            colormap='viridis',
-            relative_scaling=0.5,
-            min_font_size=10
-        ).generate_from_frequencies(keyword_counts)
-
-        plt.figure(figsize=(15, 8))
-        plt.imshow(wordcloud, interpolation='bilinear')
-        plt.axis('off')
-        plt.title('Keyword Word Cloud', fontsize=16, fontweight='bold', pad=20)
-        plt.tight_layout()
-        plt.savefig('output_wordcloud.png', dpi=300, bbox_inches='tight')
-        print("\n✓ Saved: output_wordcloud.png")
-        plt.show()
+        if len(keyword_counts):
+            self._add_figure('wordcloud', 'wordcloud', (15, 8),
+                             frequencies=keyword_counts.to_dict())
 
         # Bar chart
-        plt.figure(figsize=(12, 8))
-        plt.barh(range(top_n), top_keywords['Occurrences'].values[::-1], color='coral')
-        plt.yticks(range(top_n), top_keywords['Keyword'].values[::-1])
-        plt.xlabel('Frequency')
-        plt.title('Most Frequent Author Keywords', fontweight='bold')
-        plt.tight_layout()
-        plt.savefig('output_keywords_bar.png', dpi=300, bbox_inches='tight')
-        print("✓ Saved: output_keywords_bar.png")
-        plt.show()
+        self._add_figure('keywords_bar', 'barh', (12, 8),
+                         labels=top_keywords['Keyword'].tolist(),
+                         values=top_keywords['Occurrences'].tolist(),
+                         title='Most Frequent Author Keywords',
+                         xlabel='Frequency', color='coral')
 
         self.results['top_keywords'] = top_keywords
         return top_keywords
 
+    def _keyword_counts(self):
+        """Documents per author keyword, most frequent first"""
+        table = self._tokens('keywords')
+        aggregates = self._aggregates()
+        counts = aggregates.item_counts.get('keywords') if aggregates is not None else None
+        if counts is not None and len(counts) != len(table.vocab):
+            counts = None
+        return table.top(counts=counts)
+
+    def topic_analysis(self, n_topics=10, method='lda', n_top_words=10, chunk_size=10000,
+                       passes=1, workers=None):
+        """
+        Topics of the abstracts and their prevalence per year
+
+        Abstracts are hashed and fitted in chunks (see
+        bibliometric_topics.TopicModel), so no vocabulary or dense matrix
+        is built.
+
+        Parameters:
+        -----------
+        n_topics : int
+            Number of topics
+        method : str
+            'lda' (online LDA) or 'nmf' (mini-batch NMF)
+        n_top_words : int
+            Terms listed per topic
+        chunk_size : int
+            Abstracts per mini-batch
+        passes : int
+            Passes over the abstracts while fitting
+        workers : int, optional
+            Processes for hashing and LDA (None uses all CPUs)
+        """
+        if 'Abstract' not in self.df.columns:
+            print("⚠ Abstract data not available")
+            return None
+
+        from bibliometric_topics import TopicModel, topic_prevalence, usable_abstracts
+
+        abstracts = usable_abstracts(self.df['Abstract'])
+        if abstracts.notna().sum() == 0:
+            print("⚠ No abstracts to model topics from")
+            return None
+        model = TopicModel(n_topics, method, chunk_size=chunk_size, passes=passes,
+                           workers=workers, n_top_words=n_top_words).fit(abstracts)
+        doc_topics = model.transform(abstracts)
+        topics = model.topics()
+
+        print(f"\n{'='*60}")
+        print(f"{n_topics} ABSTRACT TOPICS ({method.upper()})")
+        print(f"{'='*60}")
+        print(topics[['Topic', 'Weight', 'Top_Words']].to_string(index=False))
+
+        # Dominant topic of every document (0 without an abstract)
+        known = ~np.isnan(doc_topics).any(axis=1)
+        dominant = np.where(known, np.nanargmax(np.nan_to_num(doc_topics), axis=1) + 1, 0)
+        self.results['document_topics'] = pd.DataFrame({
+            'Topic': dominant.astype(np.int16),
+            'Weight': np.nanmax(np.nan_to_num(doc_topics), axis=1).round(4)
+        })
+
+        if 'Year' in self.df.columns:
+            labels = [f'Topic {t}: {label}' for t, label in zip(topics['Topic'], topics['Label'])]
+            prevalence = topic_prevalence(
+                doc_topics, self.df['Year'].to_numpy(dtype=float, na_value=np.nan), labels)
+            self.results['topic_prevalence'] = prevalence
+            if len(prevalence):
+                self._add_figure('topic_prevalence', 'topic_prevalence', (14, 7),
+                                 years=prevalence['Year'].tolist(),
+                                 shares={label: prevalence[label].tolist()
+                                         for label in labels})
+
+        self.results['topics'] = topics
+        return topics
+
     # ================================================================
     # SECTION 8: COUNTRY ANALYSIS
     # ================================================================
 
     def country_analysis(self, top_n=15):
-        """Analyze country contributions"""
-        if 'Affiliations' not in self.df.columns:
+        """
+        Analyze country contributions and collaboration
+
+        Every address is matched against the country gazetteer in
+        bibliometric_affiliations, so a document counts once for each
+        country among its addresses. Articles, SCP (single country) and
+        MCP (multiple country publications) refer to the country of the
+        first address.
+        """
+        if 'Affiliations' not in self._columns():
             print("⚠ Affiliation data not available")
             return None
 
-        # Simple country extraction (first author country)
-        # Note: This is simplified - production code needs better parsing
-        country_list = []
-
-        for affil in self.df['Affiliations'].dropna():
-            # Very basic extraction - you'd want better logic here
-            if 'USA' in str(affil) or 'United States' in str(affil):
-                country_list.append('USA')
-            elif 'China' in str(affil) or 'Peoples R China' in str(affil):
-                country_list.append('China')
-            elif 'UK' in str(affil) or 'England' in str(affil):
-                country_list.append('UK')
-            elif 'Germany' in str(affil):
-                country_list.append('Germany')
-            elif 'Thailand' in str(affil):
-                country_list.append('Thailand')
-            # Add more countries as needed
-
-        country_counts = Counter(country_list)
-        top_countries = pd.DataFrame(
-            country_counts.most_common(top_n),
-            columns=['Country', 'Documents']
-        )
+        top_countries = self._country_table().head(top_n)
 
         print(f"\n{'='*60}")
         print(f"TOP {top_n} COUNTRIES BY PRODUCTION")
@@ -429,102 +1502,720 @@ class BibliometricAnalysis:
         print(top_countries.to_string(index=False))
 
         # Visualization
-        plt.figure(figsize=(10, 6))
-        plt.barh(range(len(top_countries)), top_countries['Documents'].values[::-1],
-                color='green', alpha=0.7)
-        plt.yticks(range(len(top_countries)), top_countries['Country'].values[::-1])
-        plt.xlabel('Number of Documents')
-        plt.title('Country Scientific Production', fontweight='bold')
-        plt.tight_layout()
-        plt.savefig('output_countries.png', dpi=300, bbox_inches='tight')
-        print("\n✓ Saved: output_countries.png")
-        plt.show()
+        self._add_figure('countries', 'barh', (10, 6),
+                         labels=top_countries['Country'].tolist(),
+                         values=top_countries['Documents'].tolist(),
+                         title='Country Scientific Production',
+                         xlabel='Number of Documents', color='green', alpha=0.7)
 
         self.results['top_countries'] = top_countries
         return top_countries
 
+    def _country_table(self):
+        """Production and SCP/MCP collaboration of every country"""
+        from bibliometric_affiliations import address_countries, collaboration_table
+
+        countries = self._tokens('countries')
+        first_address = (self.df['Affiliations'].astype(object)
+                         .str.split(AFFILIATION_SEP, n=1, regex=True).str[0])
+        codes, unique_addresses = pd.factorize(first_address)
+        first_country = pd.Series(
+            address_countries(pd.Series(unique_addresses)).to_numpy(dtype=object)[codes],
+            dtype=object).where(codes >= 0)
+
+        return collaboration_table(countries.doc, countries.code, countries.vocab,
+                                   first_country, len(self.df))
+
+    def most_relevant_affiliations(self, top_n=15, aliases=None):
+        """
+        Identify the institutions with most documents
+
+        Parameters:
+        -----------
+        top_n : int
+            Number of institutions to report
+        aliases : dict, optional
+            Variant spelling -> canonical institution name
+        """
+        if 'Affiliations' not in self.df.columns:
+            print("⚠ Affiliation data not available")
+            return None
+
+        from bibliometric_affiliations import address_institutions
+
+        institutions = self._tokens('affiliations').map_items(
+            lambda addresses: address_institutions(addresses, aliases))
+        counts = institutions.top(top_n)
+        top_affiliations = pd.DataFrame({
+            'Affiliation': counts.index,
+            'Documents': counts.values
+        })
+
+        print(f"\n{'='*60}")
+        print(f"TOP {top_n} MOST RELEVANT AFFILIATIONS")
+        print(f"{'='*60}")
+        print(top_affiliations.to_string(index=False))
+
+        self.results['top_affiliations'] = top_affiliations
+        return top_affiliations
+
+    def _country_tokens(self):
+        """Distinct countries per document, matched on each address"""
+        table = self.tokens.get('countries')
+        if table is None or table.n_docs != len(self.df):
+            from bibliometric_affiliations import address_countries
+
+            table = self._tokens('affiliations').map_items(address_countries)
+            self.tokens['countries'] = table
+        return table
+
     # ================================================================
-    # SECTION 9: EXPORT RESULTS
+    # SECTION 9: CO-OCCURRENCE NETWORKS
     # ================================================================
 
-    def export_results(self, output_dir='outputs'):
-        """Export all results to Excel"""
-        import os
-        os.makedirs(output_dir, exist_ok=True)
-
-        with pd.ExcelWriter(f'{output_dir}/bibliometric_results.xlsx') as writer:
-            # Statistics
-            if 'statistics' in self.results:
-                pd.DataFrame(list(self.results['statistics'].items()),
-                           columns=['Metric', 'Value']).to_excel(
-                    writer, sheet_name='Statistics', index=False)
-
-            # Top cited
-            if 'top_cited' in self.results:
-                self.results['top_cited'].to_excel(
-                    writer, sheet_name='Top_Cited', index=False)
-
-            # Top authors
-            if 'top_authors' in self.results:
-                self.results['top_authors'].to_excel(
-                    writer, sheet_name='Top_Authors', index=False)
-
-            # Top sources
-            if 'top_sources' in self.results:
-                self.results['top_sources'].to_frame('Documents').to_excel(
-                    writer, sheet_name='Top_Sources')
-
-            # Top keywords
-            if 'top_keywords' in self.results:
-                self.results['top_keywords'].to_excel(
-                    writer, sheet_name='Top_Keywords', index=False)
-
-            # Top countries
-            if 'top_countries' in self.results:
-                self.results['top_countries'].to_excel(
-                    writer, sheet_name='Top_Countries', index=False)
-
-        print(f"\n✓ Results exported to: {output_dir}/bibliometric_results.xlsx")
+    def cooccurrence_network(self, field='keywords', top_n=50, min_weight=1,
+                             normalize='association'):
+        """
+        Build a sparse co-occurrence network
+
+        Parameters:
+        -----------
+        field : str
+            'keywords' (keyword co-occurrence), 'authors' (co-authorship)
+            or 'countries' (country collaboration)
+        top_n : int, optional
+            Keep the most frequent items only (None keeps all)
+        min_weight : int
+            Minimum number of shared documents for an edge
+        normalize : str, optional
+            'association', 'inclusion', 'jaccard', 'salton',
+            'equivalence' or None for raw counts
+
+        Returns:
+        --------
+        bibliometric_networks.Network
+        """
+        from bibliometric_networks import cooccurrence_network
+
+        columns = {'keywords': 'Author_Keywords', 'authors': 'Authors',
+                   'countries': 'Affiliations'}
+        if field not in columns:
+            raise ValueError(f"field must be one of: {', '.join(columns)}")
+        if columns[field] not in self.df.columns:
+            print(f"⚠ {columns[field]} data not available")
+            return None
+
+        table = self._tokens(field)
+        network = cooccurrence_network(table.doc, table.code, table.vocab,
+                                       table.n_docs, top_n, min_weight, normalize)
+
+        print(f"\n✓ {field.capitalize()} network: {len(network)} nodes, "
+              f"{network.matrix.nnz // 2} edges")
+
+        self.results[f'network_{field}'] = network
+        return network
+
+    def _cited_references(self):
+        """
+        References per document, integer-coded by canonical key
+
+        Returns:
+        --------
+        (TokenTable, labels) where labels holds the first raw reference
+        string seen for each canonical key
+        """
+        from bibliometric_references import reference_keys
+
+        references = self._tokens('references')
+        keys = reference_keys(references.vocab)
+        cited = references.map_items(lambda _: keys)
+
+        raw = pd.Series(references.vocab, dtype=object)
+        labels = raw.groupby(keys.to_numpy(), sort=False).first()
+        return cited, pd.Index(labels.reindex(cited.vocab).values)
+
+    def _document_labels(self):
+        """Unique 'FIRST AUTHOR, YEAR, SOURCE' label per document"""
+        author = self.df['Authors'].astype(object).str.split(';').str[0].str.strip()
+        year = self.df['Year'].astype('string')
+        labels = (author.fillna('Anonymous') + ', ' + year.fillna('n.d.').astype(object)
+                  + ', ' + self.df['Source'].astype(object).fillna(''))
+        labels = labels.str.rstrip(', ')
+
+        # Disambiguate repeated labels with a running number
+        dup = labels.groupby(labels).cumcount()
+        suffix = ' (' + (dup + 1).astype(str).astype(object) + ')'
+        labels = labels.where(dup == 0, labels + suffix)
+        return pd.Index(labels)
+
+    def cocitation_network(self, top_n=50, min_citations=2, min_weight=2,
+                           normalize=None):
+        """
+        Build the co-citation network of cited references
+
+        Parameters:
+        -----------
+        top_n : int, optional
+            Keep only the most cited references
+        min_citations : int
+            Minimum local citations for a reference to be included
+        min_weight : int
+            Minimum number of co-citing documents for an edge
+        normalize : str, optional
+            Similarity measure, e.g. 'salton' or 'association'
+        """
+        if 'References' not in self.df.columns:
+            print("⚠ Reference data not available")
+            return None
+
+        from bibliometric_references import cocitation_network
+
+        cited, labels = self._cited_references()
+        network = cocitation_network(cited.doc, cited.code, labels, cited.n_docs,
+                                     top_n, min_citations, min_weight, normalize)
+
+        print(f"\n✓ Co-citation network: {len(network)} references, "
+              f"{network.matrix.nnz // 2} edges")
+
+        self.results['network_cocitation'] = network
+        return network
+
+    def bibliographic_coupling(self, top_n=None, min_weight=2, normalize='salton'):
+        """
+        Build the bibliographic coupling network of documents
+
+        Parameters:
+        -----------
+        top_n : int, optional
+            Keep only the most cited documents
+        min_weight : int
+            Minimum number of shared references for an edge
+        normalize : str, optional
+            Similarity measure, e.g. 'salton' or 'association'
+        """
+        if 'References' not in self.df.columns:
+            print("⚠ Reference data not available")
+            return None
+
+        from bibliometric_references import coupling_network
+
+        cited, _ = self._cited_references()
+        keep = None
+        if top_n is not None and top_n < len(self.df):
+            citations = self.df['Citations'].to_numpy()
+            keep = np.sort(np.argsort(-citations, kind='stable')[:top_n])
+
+        network = coupling_network(cited.doc, cited.code, len(cited.vocab),
+                                   self._document_labels(), keep, min_weight,
+                                   normalize)
+
+        print(f"\n✓ Coupling network: {len(network)} documents, "
+              f"{network.matrix.nnz // 2} edges")
+
+        self.results['network_coupling'] = network
+        return network
+
+    # ------------------------------------------------------------------
+    # Local citations and historiograph
+    # ------------------------------------------------------------------
+
+    def _citation_links(self):
+        """
+        (citing, cited) row pairs of references resolved to corpus
+        records, computed once per corpus size
+        """
+        if self._local_links is None or self._local_links[0] != len(self.df):
+            from bibliometric_references import citation_links, record_keys, resolve_references
+
+            references = self._tokens('references')
+            targets = resolve_references(references.vocab, *record_keys(self.df))
+            self._local_links = (len(self.df), citation_links(
+                references.doc, references.code, targets, references.n_docs))
+        return self._local_links[1]
+
+    def _local_citation_table(self, rows, lcs, lcr):
+        """Document, DOI, Year and local/global citation counts of rows"""
+        def column(name):
+            if name not in self.df.columns:
+                return np.full(len(rows), np.nan)
+            return self.df[name].to_numpy()[rows]
+
+        return pd.DataFrame({
+            'Document': self._document_labels().take(rows),
+            'DOI': column('DOI'),
+            'Year': column('Year'),
+            'Local_Citations': lcs[rows],
+            'Global_Citations': column('Citations'),
+            'Local_References': lcr[rows]
+        })
+
+    def local_citations(self, top_n=20):
+        """
+        Most locally cited documents (localCitations in R)
+
+        Local citations count how often a document is cited by the other
+        documents of the corpus; references are matched to records by
+        DOI, then by first author, year and source.
+
+        Parameters:
+        -----------
+        top_n : int
+            Number of documents listed
+        """
+        if 'References' not in self.df.columns:
+            print("⚠ Reference data not available")
+            return None
+
+        citing, cited = self._citation_links()
+        lcs = np.bincount(cited, minlength=len(self.df))
+        lcr = np.bincount(citing, minlength=len(self.df))
+        order = np.argsort(-lcs, kind='stable')[:top_n]
+        top = self._local_citation_table(order[lcs[order] > 0], lcs, lcr)
+
+        print(f"\n{'='*60}")
+        print(f"TOP {top_n} LOCALLY CITED DOCUMENTS ({len(citing)} local citations)")
+        print(f"{'='*60}")
+        print(top[['Document', 'Local_Citations', 'Global_Citations']].to_string(index=False))
+
+        self.results['local_citations'] = top
+        return top
+
+    def historiograph(self, top_n=30):
+        """
+        Historiograph: direct citations among the most locally cited
+        documents, laid out by publication year (histNetwork in R)
+
+        Parameters:
+        -----------
+        top_n : int
+            Number of documents in the graph
+        """
+        if 'References' not in self.df.columns:
+            print("⚠ Reference data not available")
+            return None
+
+        from bibliometric_references import historiograph
+
+        citing, cited = self._citation_links()
+        lcs = np.bincount(cited, minlength=len(self.df))
+        lcr = np.bincount(citing, minlength=len(self.df))
+        years = (self.df['Year'].to_numpy(dtype=float, na_value=np.nan)
+                 if 'Year' in self.df.columns else np.full(len(self.df), np.nan))
+        nodes, edges = historiograph(citing, cited, lcs, years, top_n)
+
+        table = self._local_citation_table(nodes, lcs, lcr)
+        table.insert(0, 'Node', np.arange(1, len(nodes) + 1))
+        links = pd.DataFrame({'Citing': table['Document'].to_numpy()[edges[:, 0]],
+                              'Cited': table['Document'].to_numpy()[edges[:, 1]]})
+
+        print(f"\n✓ Historiograph: {len(table)} documents, {len(links)} citations")
+
+        self._add_figure('historiograph', 'historiograph', (16, 9),
+                         years=np.nan_to_num(years[nodes]).astype(int).tolist(),
+                         labels=(table['Document'].astype(object).str.split(',').str[0] + ' '
+                                 + table['Year'].astype('string').fillna('').astype(object)
+                                 ).tolist(),
+                         lcs=table['Local_Citations'].tolist(),
+                         edges=edges.tolist())
+
+        self.results['historiograph'] = table
+        self.results['historiograph_links'] = links
+        return table, links
+
+    # ------------------------------------------------------------------
+    # Thematic map and thematic evolution
+    # ------------------------------------------------------------------
+
+    def _yearly(self, field, min_freq):
+        """
+        Per-year co-occurrence matrices of a token field, built once and
+        shared by thematic_map and every slice of thematic_evolution
+        """
+        from bibliometric_thematic import YearlyCooccurrence
+
+        table = self._tokens(field)
+        cached = self._yearly_cooccurrence.get(field)
+        if cached is None or cached[0] > min_freq or cached[1].n_docs != len(self.df):
+            years = (self.df['Year'].to_numpy(dtype=float, na_value=np.nan)
+                     if 'Year' in self.df.columns else np.full(len(self.df), np.nan))
+            cached = (min_freq, YearlyCooccurrence(table.doc, table.code, table.vocab,
+                                                   years, min_freq))
+            self._yearly_cooccurrence[field] = cached
+        return cached[1]
+
+    def thematic_map(self, field='keywords', n=250, min_freq=5, n_labels=3,
+                     method='louvain', resolution=1.0):
+        """
+        Thematic map: keyword clusters by Callon centrality and density
+
+        Parameters:
+        -----------
+        field : str
+            Token field clustered, e.g. 'keywords'
+        n : int
+            Number of most frequent keywords mapped
+        min_freq : int
+            Minimum documents per keyword
+        n_labels : int
+            Keywords shown per theme
+        method : str
+            'louvain' or 'leiden' (needs leidenalg)
+        resolution : float
+            Clustering resolution; higher gives more, smaller themes
+        """
+        if TOKEN_FIELDS[field][0] not in self.df.columns:
+            print(f"⚠ {TOKEN_FIELDS[field][0]} data not available")
+            return None
+
+        from bibliometric_thematic import thematic_map
+
+        yearly = self._yearly(field, min_freq)
+        C, occurrences = yearly.period()
+        clusters, words = thematic_map(C, yearly.labels, occurrences, n, min_freq, n_labels,
+                                       method, resolution)
+
+        print(f"\n{'='*60}")
+        print(f"THEMATIC MAP ({len(clusters)} themes, {len(words)} keywords)")
+        print(f"{'='*60}")
+        print(clusters[['Label', 'Words', 'Frequency', 'Centrality', 'Density',
+                        'Theme']].to_string(index=False))
+
+        self._add_figure('thematic_map', 'thematic_map', (12, 9),
+                         centrality=clusters['Centrality'].tolist(),
+                         density=clusters['Density'].tolist(),
+                         frequency=clusters['Frequency'].tolist(),
+                         labels=clusters['Top_Words'].str.replace('; ', '\n').tolist())
+
+        self.results['thematic_map'] = clusters
+        self.results['thematic_words'] = words
+        return clusters
+
+    def thematic_evolution(self, years=None, slices=4, field='keywords', n=100,
+                           min_freq=2, n_labels=3, method='louvain', resolution=1.0,
+                           workers=None):
+        """
+        Thematic evolution: a thematic map per time slice, linked by
+        shared keywords
+
+        Parameters:
+        -----------
+        years : list of int, optional
+            Cutting years as in R thematicEvolution (last year of every
+            slice but the final one)
+        slices : int
+            Without years, number of slices with about equal numbers of
+            documents
+        field, n, min_freq, n_labels, method, resolution
+            Thematic map options applied to every slice
+        workers : int, optional
+            Processes clustering slices in parallel (None uses all CPUs)
+        """
+        if TOKEN_FIELDS[field][0] not in self.df.columns or 'Year' not in self.df.columns:
+            print(f"⚠ {TOKEN_FIELDS[field][0]} or Year data not available")
+            return None
+
+        from bibliometric_thematic import period_breaks, period_names, thematic_evolution
+
+        periods = period_breaks(self.df['Year'].to_numpy(dtype=float, na_value=np.nan),
+                                years, slices)
+        if not periods:
+            print("⚠ No publication years to slice")
+            return None
+        clusters, words, links = thematic_evolution(
+            self._yearly(field, min_freq), periods, n, min_freq, n_labels, method,
+            resolution, workers=workers)
+
+        print(f"\n{'='*60}")
+        print(f"THEMATIC EVOLUTION ({len(periods)} periods)")
+        print(f"{'='*60}")
+        for period, group in clusters.groupby('Period', sort=False):
+            print(f"{period}: {', '.join(group['Label'].astype(str))}")
+        if len(links):
+            print(links[['From_Period', 'From', 'To_Period', 'To', 'Inclusion']]
+                  .head(20).to_string(index=False))
+
+        self._add_figure('thematic_evolution', 'thematic_evolution', (16, 9),
+                         periods=period_names(periods),
+                         nodes=clusters[['Period', 'Cluster', 'Label',
+                                         'Frequency']].values.tolist(),
+                         links=links[['From_Period', 'From_Cluster', 'To_Period',
+                                      'To_Cluster', 'Inclusion']].values.tolist())
+
+        self.results['thematic_evolution'] = clusters
+        self.results['thematic_evolution_words'] = words
+        self.results['thematic_evolution_links'] = links
+        return clusters, links
 
     # ================================================================
-    # SECTION 10: RUN COMPLETE ANALYSIS
+    # SECTION 10: FIGURES & EXPORT RESULTS
     # ================================================================
 
-    def run_complete_analysis(self):
-        """Run all analyses"""
+    def _add_figure(self, name, kind, figsize, **data):
+        """
+        Register a figure for render_figures
+
+        Parameters:
+        -----------
+        name : str
+            File name stem (saved as output_<name>.<format>)
+        kind : str
+            Drawing function in bibliometric_render.DRAWERS
+        figsize : tuple
+            Figure size in inches
+        **data
+            Plotted values passed to the drawing function
+        """
+        self.figures[name] = (kind, data, figsize)
+
+    def render_figures(self, output_dir='.', formats=('png',), dpi=300, workers=None):
+        """
+        Draw every registered figure headlessly and close it
+
+        Parameters:
+        -----------
+        output_dir : str
+            Directory for figure files
+        formats : tuple of str
+            File formats, e.g. ('png', 'pdf')
+        dpi : int
+            Resolution for raster formats
+        workers : int, optional
+            Rendering processes (None uses all CPUs, 1 renders inline)
+
+        Returns:
+        --------
+        list of written file paths
+        """
+        from bibliometric_render import FigureRenderer
+
+        with self._stage('render_figures', rows=len(self.figures)):
+            renderer = FigureRenderer(output_dir, formats, dpi, workers)
+            return renderer.render(self.figures)
+
+    def export_results(self, output_dir='outputs', formats=('xlsx',), workers=None):
+        """
+        Export results, in full, to one or more formats concurrently
+
+        Parameters:
+        -----------
+        output_dir : str
+            Output directory
+        formats : tuple of str
+            Any of 'parquet', 'csv', 'sqlite', 'duckdb' (all tables and
+            networks), 'graphml', 'edgelist', 'vosviewer' (networks only)
+            and 'xlsx' (summary workbook of the top-N tables); see
+            bibliometric_export.EXPORTERS
+        workers : int, optional
+            Writer threads (None uses all CPUs)
+
+        Returns:
+        --------
+        list of written file paths
+        """
+        from bibliometric_export import export_results
+
+        results = dict(self.results)
+        if self.merge_report is not None:
+            results['merge_report'] = self.merge_report
+
+        written = export_results(results, output_dir, formats, workers)
+        print()
+        for path in written:
+            print(f"✓ Results exported to: {path}")
+        return written
+
+    # ================================================================
+    # SECTION 11: RUN COMPLETE ANALYSIS
+    # ================================================================
+
+    def run_sections(self, sections, workers=1, executor='thread'):
+        """
+        Run analysis sections, concurrently when workers > 1
+
+        Each section is a task that depends on the token tables it reads;
+        sections whose input columns were not loaded are skipped.
+
+        Parameters:
+        -----------
+        sections : list of str
+            Keys of SECTION_TASKS, e.g. REPORT_SECTIONS
+        workers : int, optional
+            1 runs sections in order in this process; None uses all CPUs
+        executor : str
+            'thread' or 'process' pool for workers > 1
+        """
+        runnable = []
+        for section in sections:
+            missing = [c for c in SECTION_COLUMNS[section] if c not in self._columns()]
+            if missing:
+                print(f"⚠ Skipping {section}: {', '.join(missing)} not loaded")
+            else:
+                runnable.append(section)
+
+        if workers == 1:
+            for section in runnable:
+                method, kwargs, _ = SECTION_TASKS[section]
+                with self._stage(section, rows=self._n_docs()):
+                    getattr(self, method)(**kwargs)
+            return self.results
+
+        from bibliometric_scheduler import AnalysisScheduler, Task
+
+        tasks = {}
+        for section in runnable:
+            method, kwargs, token_names = SECTION_TASKS[section]
+            deps = []
+            for name in token_names:
+                if TOKEN_FIELDS[name][0] in self._columns():
+                    deps.append(f'tokens:{name}')
+                    tasks.setdefault(deps[-1], Task(deps[-1], '_tokens', {'name': name},
+                                                    local=True))
+            tasks[section] = Task(section, method, kwargs, deps)
+
+        # Concurrent sections share the process, so they are measured as one stage
+        with self._stage('sections', rows=self._n_docs()) as stage:
+            stage['sections'] = [name for name in tasks if name in SECTION_TASKS]
+            scheduler = AnalysisScheduler(self, workers, executor)
+            return scheduler.run(list(tasks.values()))
+
+    def run_complete_analysis(self, workers=1, executor='thread', plots=True,
+                              figure_formats=('png',), dpi=300, export_formats=('xlsx',),
+                              sections=None, output_dir='outputs', figure_dir='.'):
+        """
+        Run all analyses
+
+        Parameters:
+        -----------
+        workers : int, optional
+            Number of sections/figures to process concurrently (None uses
+            all CPUs)
+        executor : str
+            'thread' or 'process' pool for sections when workers > 1
+        plots : bool
+            Render figures after the analyses (False skips them entirely)
+        figure_formats : tuple of str
+            Figure file formats
+        dpi : int
+            Figure resolution
+        export_formats : tuple of str
+            Result formats (see export_results); empty to skip exporting
+        sections : list of str, optional
+            Keys of SECTION_TASKS (default: REPORT_SECTIONS)
+        output_dir : str
+            Directory of exported results and the run report
+        figure_dir : str
+            Directory of rendered figures
+        """
         print("\n" + "="*60)
         print("RUNNING COMPLETE BIBLIOMETRIC ANALYSIS")
         print("="*60)
 
-        self.load_data()
-        self.generate_statistics()
-        self.analyze_trends()
-        self.most_cited_papers()
-        self.most_productive_authors()
-        self.most_relevant_sources()
-        self.keyword_analysis()
-        self.country_analysis()
-        self.export_results()
+        sections = list(sections or REPORT_SECTIONS)
+        self.load_data(sections=sections)
+        self.run_sections(sections, workers, executor)
+
+        written = []
+        if plots:
+            print()
+            written = self.render_figures(figure_dir, formats=figure_formats, dpi=dpi,
+                                          workers=workers)
+        if export_formats:
+            with self._stage('export_results', rows=len(self.results)):
+                written += self.export_results(output_dir, export_formats, workers)
+        self.write_run_report(os.path.join(output_dir, 'run_report.json'))
 
         print("\n" + "="*60)
         print("✓ ANALYSIS COMPLETE!")
         print("="*60)
+        print(self.profiler.summary())
         print("\nGenerated files:")
-        print("  - output_annual_production.png")
-        print("  - output_top_authors.png")
-        print("  - output_bradfords_law.png")
-        print("  - output_wordcloud.png")
-        print("  - output_keywords_bar.png")
-        print("  - output_countries.png")
-        print("  - outputs/bibliometric_results.xlsx")
+        for path in written:
+            print(f"  - {os.path.basename(path)}")
+        print("  - run_report.json")
         print("\nResults stored in self.results dictionary")
 
 
 # ==============================================================================
-# EXAMPLE USAGE
+# COMMAND LINE
 # ==============================================================================
 
-if __name__ == "__main__":
+def _input_path(inputs, data_type):
+    """--input values as data_path: one path, a list, or a merged dict"""
+    if data_type == 'merged':
+        try:
+            return dict(value.split('=', 1) for value in inputs)
+        except ValueError:
+            raise SystemExit("--type merged needs --input wos=PATH scopus=PATH")
+    return inputs[0] if len(inputs) == 1 else inputs
+
+
+def analyze(args):
+    """Run the analyze command"""
+    data_path = _input_path(args.input, args.type)
+    if args.out_of_core:
+        from bibliometric_outofcore import OutOfCoreAnalysis
+        analysis = OutOfCoreAnalysis(data_path, args.type)
+    else:
+        analysis = BibliometricAnalysis(data_path, args.type, use_cache=not args.no_cache)
+    analysis.instrument(profile=args.profile)
+
+    figure_dir = args.figure_dir or args.output_dir
+    if not args.no_plots:
+        os.makedirs(figure_dir, exist_ok=True)
+    analysis.run_complete_analysis(workers=args.workers, executor=args.executor,
+                                   plots=not args.no_plots, figure_formats=args.formats,
+                                   dpi=args.dpi, export_formats=args.export,
+                                   sections=args.sections, output_dir=args.output_dir,
+                                   figure_dir=figure_dir)
+    return analysis
+
+
+def main(argv=None):
+    """
+    bibliometric command line
+
+    Examples:
+        python bibliometric_analysis_python.py analyze --input savedrecs.txt \\
+            --type wos --sections statistics trends --no-plots --export csv
+        python bibliometric_analysis_python.py analyze --type merged \\
+            --input wos=exports/ scopus=scopus.csv
+    """
+    warnings.filterwarnings('ignore')
+
+    parser = argparse.ArgumentParser(prog='bibliometric',
+                                     description='Python bibliometric analysis')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('analyze', help='run analysis sections on WoS/Scopus exports')
+    run.add_argument('--input', nargs='+', required=True,
+                     help='file, directory or glob; wos=PATH scopus=PATH with --type merged')
+    run.add_argument('--type', choices=['wos', 'scopus', 'merged', 'parquet'], default='wos',
+                     help="input format ('parquet' needs --out-of-core)")
+    run.add_argument('--sections', nargs='+', choices=list(SECTION_TASKS),
+                     metavar='SECTION', help=f"default: {' '.join(REPORT_SECTIONS)}; "
+                                             f"available: {', '.join(SECTION_TASKS)}")
+    run.add_argument('--no-plots', action='store_true',
+                     help='skip figures (matplotlib is never imported)')
+    run.add_argument('--formats', nargs='+', default=['png'], help='figure formats')
+    run.add_argument('--dpi', type=int, default=300)
+    run.add_argument('--export', nargs='*', default=['xlsx'],
+                     help='result formats (see bibliometric_export.EXPORTERS); '
+                          'none when given without values')
+    run.add_argument('--output-dir', default='outputs', help='results and run report')
+    run.add_argument('--figure-dir', help='figures (default: --output-dir)')
+    run.add_argument('--workers', type=int, default=1,
+                     help='sections/figures processed concurrently (0 = all CPUs)')
+    run.add_argument('--executor', choices=['thread', 'process'], default='thread')
+    run.add_argument('--no-cache', action='store_true', help='do not reuse parsed corpora')
+    run.add_argument('--out-of-core', action='store_true',
+                     help='query Parquet with DuckDB instead of loading into memory')
+    run.add_argument('--profile', action='store_true', help='cProfile every stage')
+
+    args = parser.parse_args(argv)
+    if args.workers == 0:
+        args.workers = None
+    if args.type == 'parquet' and not args.out_of_core:
+        parser.error("--type parquet needs --out-of-core")
 
     print("""
     ╔══════════════════════════════════════════════════════════╗
@@ -532,24 +2223,9 @@ if __name__ == "__main__":
     ║  Author: Mahbub Hassan | Chulalongkorn University        ║
     ╚══════════════════════════════════════════════════════════╝
     """)
+    analyze(args)
+    return 0
 
-    # Example 1: Web of Science data
-    # analysis = BibliometricAnalysis(
-    #     data_path='examples/sample_data/sample_wos_transport.txt',
-    #     data_type='wos'
-    # )
 
-    # Example 2: Scopus data
-    analysis = BibliometricAnalysis(
-        data_path='examples/sample_data/sample_scopus_transport.csv',
-        data_type='scopus'
-    )
-
-    # Run complete analysis
-    analysis.run_complete_analysis()
-
-    # Access specific results
-    # print(analysis.results['statistics'])
-    # print(analysis.results['top_keywords'])
-
-    print("\n🎉 Analysis complete! Check the output files.")
+if __name__ == "__main__":
+    sys.exit(main())
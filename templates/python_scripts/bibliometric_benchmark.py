@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Benchmark Harness for Python Bibliometric Analysis
+
+Author: Mahbub Hassan
+Affiliation: Chulalongkorn University
+
+Purpose: Time and measure the peak memory of every BibliometricAnalysis
+stage on synthetic corpora of increasing size, store the results as JSON
+and compare them with a baseline run to catch regressions and scaling
+cliffs
+Requirements: numpy, pandas (plus the analysis requirements)
+
+Usage:
+    python bibliometric_benchmark.py --sizes 1000 10000 100000
+    python bibliometric_benchmark.py --sizes 10000 --compare baseline.json
+"""
+
+import io
+import os
+import gc
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+import subprocess
+import tracemalloc
+from contextlib import redirect_stdout
+
+import numpy as np
+import pandas as pd
+
+from bibliometric_analysis_python import BibliometricAnalysis
+from bibliometric_synthetic import write_corpus
+
+# (stage name, function of a loaded analysis); load stages get a fresh one
+STAGES = [
+    ('parse_wos', lambda a: a._parse_wos(a.data_path)),
+    ('load_data', lambda a: a.load_data()),
+    ('generate_statistics', lambda a: a.generate_statistics()),
+    ('analyze_trends', lambda a: a.analyze_trends()),
+    ('most_cited_papers', lambda a: a.most_cited_papers()),
+    ('most_productive_authors', lambda a: a.most_productive_authors()),
+    ('most_relevant_sources', lambda a: a.most_relevant_sources()),
+    ('keyword_analysis', lambda a: a.keyword_analysis()),
+    ('country_analysis', lambda a: a.country_analysis()),
+    ('most_relevant_affiliations', lambda a: a.most_relevant_affiliations()),
+    ('network_keywords', lambda a: a.cooccurrence_network('keywords')),
+    ('network_authors', lambda a: a.cooccurrence_network('authors')),
+    ('network_cocitation', lambda a: a.cocitation_network()),
+    ('network_coupling', lambda a: a.bibliographic_coupling(top_n=1000)),
+    ('topic_analysis', lambda a: a.topic_analysis(workers=1)),
+    ('thematic_map', lambda a: a.thematic_map()),
+    ('thematic_evolution', lambda a: a.thematic_evolution(workers=1)),
+    ('local_citations', lambda a: a.local_citations()),
+    ('historiograph', lambda a: a.historiograph()),
+    ('render_figures', lambda a: _render_figures(a))
+]
+
+# Stages that read the input files themselves
+LOAD_STAGES = {'parse_wos', 'load_data'}
+
+
+def _render_figures(analysis):
+    with tempfile.TemporaryDirectory() as output_dir:
+        analysis.render_figures(output_dir, workers=1, dpi=100)
+
+
+def measure(func, repeat=1, memory=True):
+    """
+    Best wall time of repeat calls and peak traced memory of one more call
+
+    Output printed by func is discarded. Peak memory covers Python and
+    numpy allocations (tracemalloc); it is measured in a separate call
+    because tracing slows pure Python code down.
+    """
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        with redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - start)
+
+    peak = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            with redirect_stdout(io.StringIO()):
+                func()
+            peak = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+        finally:
+            tracemalloc.stop()
+    return min(times), peak
+
+
+def _analysis(paths, data_type):
+    data_path = paths if data_type == 'merged' else paths[data_type]
+    with redirect_stdout(io.StringIO()):
+        return BibliometricAnalysis(data_path, data_type=data_type, use_cache=False)
+
+
+def benchmark_size(size, data_type='wos', data_dir='.bibliometric_benchmark',
+                   stages=None, repeat=1, memory=True, seed=42):
+    """
+    Benchmark every stage on a synthetic corpus of size records
+
+    Returns:
+    --------
+    list of dicts with size, stage, seconds, peak_mb (and error when a
+    stage failed)
+    """
+    data_format = 'both' if data_type == 'merged' else data_type
+    folder = os.path.join(data_dir, f'{data_format}_{size}_{seed}')
+    paths = {'wos': os.path.join(folder, f'synthetic_wos_{size}.txt'),
+             'scopus': os.path.join(folder, f'synthetic_scopus_{size}.csv')}
+    if not all(os.path.exists(paths[name]) for name in ('wos', 'scopus')
+               if data_format in (name, 'both')):
+        print(f"Generating {size} synthetic {data_format} records...")
+        paths.update(write_corpus(size, folder, data_format, seed=seed))
+
+    analysis = _analysis(paths, data_type)
+    with redirect_stdout(io.StringIO()):
+        analysis.load_data()
+
+    rows = []
+    for name, func in STAGES:
+        if stages and name not in stages:
+            continue
+        if name == 'parse_wos' and data_type != 'wos':
+            continue
+
+        target = _analysis(paths, data_type) if name in LOAD_STAGES else analysis
+        row = {'size': size, 'stage': name}
+        try:
+            row['seconds'], row['peak_mb'] = measure(lambda: func(target), repeat, memory)
+        except Exception as e:
+            row['error'] = f"{type(e).__name__}: {e}"
+        rows.append(row)
+
+        status = row.get('error') or f"{row['seconds']:8.3f} s" + (
+            f"  {row['peak_mb']:9.1f} MB" if row.get('peak_mb') is not None else '')
+        print(f"  {size:>8d}  {name:.<30} {status}")
+    return rows
+
+
+def scaling(results):
+    """
+    Log-log slope of time against corpus size between consecutive sizes
+
+    ~1 is linear; values well above 1 point at a scaling cliff.
+    """
+    frame = pd.DataFrame([r for r in results if 'seconds' in r])
+    slopes = []
+    for stage, group in frame.groupby('stage', sort=False):
+        group = group.sort_values('size')
+        for (_, small), (_, large) in zip(group.iloc[:-1].iterrows(), group.iloc[1:].iterrows()):
+            if small['seconds'] > 0 and large['seconds'] > 0:
+                slopes.append({
+                    'stage': stage,
+                    'sizes': f"{small['size']}->{large['size']}",
+                    'slope': round(np.log(large['seconds'] / small['seconds'])
+                                   / np.log(large['size'] / small['size']), 2)
+                })
+    return pd.DataFrame(slopes)
+
+
+def compare(results, baseline, tolerance=1.3, min_seconds=0.05):
+    """
+    Stages slower than tolerance x the baseline run (same size and stage)
+
+    Stages faster than min_seconds in both runs are ignored as noise.
+    """
+    base = {(r['size'], r['stage']): r for r in baseline if 'seconds' in r}
+    slower = []
+    for r in results:
+        old = base.get((r['size'], r['stage']))
+        if old is None or 'seconds' not in r:
+            continue
+        if max(r['seconds'], old['seconds']) < min_seconds:
+            continue
+        ratio = r['seconds'] / max(old['seconds'], 1e-9)
+        if ratio > tolerance:
+            slower.append({'size': r['size'], 'stage': r['stage'],
+                           'baseline': round(old['seconds'], 3),
+                           'seconds': round(r['seconds'], 3), 'ratio': round(ratio, 2)})
+    return pd.DataFrame(slower)
+
+
+def machine_info():
+    """Environment recorded with every run"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        commit = ''
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark BibliometricAnalysis stages')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--type', choices=['wos', 'scopus', 'merged'], default='wos')
+    parser.add_argument('--stages', nargs='+', help='only these stages')
+    parser.add_argument('--repeat', type=int, default=1, help='timed runs per stage (best kept)')
+    parser.add_argument('--no-memory', action='store_true', help='skip peak memory runs')
+    parser.add_argument('--data-dir', default='.bibliometric_benchmark',
+                        help='where synthetic corpora are generated and reused')
+    parser.add_argument('--output', help='results JSON (default: <data-dir>/results-<time>.json)')
+    parser.add_argument('--compare', help='baseline results JSON')
+    parser.add_argument('--tolerance', type=float, default=1.3,
+                        help='slowdown ratio reported as a regression')
+    args = parser.parse_args()
+
+    info = machine_info()
+    print(f"Benchmarking {args.type} corpora of {args.sizes} records (commit {info['commit'] or '?'})")
+
+    results = []
+    for size in sorted(args.sizes):
+        results.extend(benchmark_size(size, args.type, args.data_dir, args.stages,
+                                      args.repeat, not args.no_memory))
+
+    output = args.output or os.path.join(
+        args.data_dir, f"results-{info['timestamp'].replace(':', '')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({'machine': info, 'type': args.type, 'results': results}, f, indent=2)
+    print(f"\n✓ Results saved to: {output}")
+
+    slopes = scaling(results)
+    if len(slopes):
+        print(f"\n{'='*60}")
+        print("SCALING (log-log slope of time vs. records, 1 = linear)")
+        print(f"{'='*60}")
+        print(slopes.to_string(index=False))
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+        slower = compare(results, baseline, args.tolerance)
+        print(f"\n{'='*60}")
+        print(f"REGRESSIONS (> {args.tolerance}x baseline)")
+        print(f"{'='*60}")
+        if len(slower):
+            print(slower.to_string(index=False))
+            sys.exit(1)
+        print("✓ None")
+
+
+if __name__ == "__main__":
+    main()
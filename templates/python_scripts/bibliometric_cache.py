@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Parsed-Corpus Cache for Python Bibliometric Analysis
+
+Author: Mahbub Hassan
+Affiliation: Chulalongkorn University
+
+Purpose: Keep parsed and tokenized corpora on disk as Parquet so repeated
+runs against the same WoS/Scopus exports skip parsing entirely
+Requirements: pandas, pyarrow
+"""
+
+import os
+import json
+import time
+import shutil
+import hashlib
+import tempfile
+import pandas as pd
+
+
+def _hash_file(path, block_size=1 << 20):
+    """SHA-256 of a file's content"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class CorpusCache:
+    """
+    Directory of cached corpora, one sub-directory per cache key
+
+    Each entry holds a set of named DataFrames stored as Parquet files.
+    Keys combine the content hash of every input file with the parser
+    version and load options, so edited exports or parser changes never
+    hit a stale entry. Entries are evicted least-recently-used first
+    once the cache grows past max_bytes.
+    """
+
+    MANIFEST = 'file_hashes.json'
+
+    def __init__(self, cache_dir, max_bytes=2 * 1024 ** 3):
+        """
+        Parameters:
+        -----------
+        cache_dir : str
+            Directory holding cache entries (created if missing)
+        max_bytes : int
+            Size limit for all entries together
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+    # ------------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------------
+
+    def file_hashes(self, paths):
+        """
+        Content hashes of the input files
+
+        Hashes are remembered together with each file's size and mtime,
+        so unchanged multi-GB exports are not re-read on every run.
+        """
+        manifest_path = os.path.join(self.cache_dir, self.MANIFEST)
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            manifest = {}
+
+        hashes = []
+        changed = False
+        for path in paths:
+            path = os.path.abspath(path)
+            stat = os.stat(path)
+            signature = [stat.st_size, stat.st_mtime_ns]
+            entry = manifest.get(path)
+            if entry is None or entry[:2] != signature:
+                entry = signature + [_hash_file(path)]
+                manifest[path] = entry
+                changed = True
+            hashes.append(entry[2])
+
+        if changed:
+            self._write_json(manifest_path, manifest)
+        return hashes
+
+    def key(self, paths, parser_version, **options):
+        """
+        Cache key for a set of input files
+
+        Parameters:
+        -----------
+        paths : list of str
+            Input files in load order
+        parser_version : str
+            Version of the parsing/normalization code
+        **options
+            Anything else that changes the parsed result (data type,
+            column projection, ...)
+        """
+        payload = json.dumps({
+            'files': self.file_hashes(paths),
+            'parser_version': parser_version,
+            'options': options
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+
+    # ------------------------------------------------------------------
+    # Entries
+    # ------------------------------------------------------------------
+
+    def load(self, key):
+        """Return the cached {name: DataFrame} for key, or None on a miss"""
+        entry = os.path.join(self.cache_dir, key)
+        if not os.path.isdir(entry):
+            return None
+
+        try:
+            with open(os.path.join(entry, 'meta.json'), 'r', encoding='utf-8') as f:
+                names = json.load(f)['frames']
+            frames = {name: pd.read_parquet(os.path.join(entry, f'{name}.parquet'))
+                      for name in names}
+        except (OSError, ValueError, KeyError):
+            # Incomplete or corrupt entry
+            shutil.rmtree(entry, ignore_errors=True)
+            return None
+
+        os.utime(entry)
+        return frames
+
+    def save(self, key, frames):
+        """
+        Store {name: DataFrame} under key, then enforce the size limit
+
+        The entry is written to a temporary directory and renamed into
+        place, so a crash never leaves a half-written entry behind.
+        """
+        entry = os.path.join(self.cache_dir, key)
+        tmp = tempfile.mkdtemp(prefix=f'.{key}-', dir=self.cache_dir)
+        try:
+            for name, frame in frames.items():
+                frame.to_parquet(os.path.join(tmp, f'{name}.parquet'), index=False)
+            self._write_json(os.path.join(tmp, 'meta.json'), {
+                'frames': list(frames),
+                'created': time.time()
+            })
+            shutil.rmtree(entry, ignore_errors=True)
+            os.replace(tmp, entry)
+        except Exception:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+
+        self.evict(keep=key)
+
+    def evict(self, keep=None):
+        """Delete least-recently-used entries until under max_bytes"""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if os.path.isdir(path) and not name.startswith('.'):
+                entries.append((os.path.getmtime(path), self._size(path), name, path))
+
+        total = sum(size for _, size, _, _ in entries)
+        for _, size, name, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if name == keep:
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+
+    def clear(self):
+        """Remove every cache entry"""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _size(path):
+        return sum(os.path.getsize(os.path.join(root, f))
+                   for root, _, files in os.walk(path) for f in files)
+
+    @staticmethod
+    def _write_json(path, data):
+        tmp = f'{path}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+Result Exporters for Python Bibliometric Analysis
+
+Author: Mahbub Hassan
+Affiliation: Chulalongkorn University
+
+Purpose: Write every result set in full to Parquet, CSV, SQLite or DuckDB,
+networks to GraphML, edge lists or VOSviewer map/network files, and an
+optional Excel summary, with the writers running concurrently
+Requirements: pandas (pyarrow for Parquet, duckdb for DuckDB, openpyxl
+for Excel)
+"""
+
+import os
+import sqlite3
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from xml.sax.saxutils import escape
+
+import numpy as np
+import pandas as pd
+
+# Results written to the Excel summary: result name -> sheet name
+SUMMARY_SHEETS = {
+    'statistics': 'Statistics',
+    'top_cited': 'Top_Cited',
+    'top_authors': 'Top_Authors',
+    'top_sources': 'Top_Sources',
+    'source_impact': 'Source_Impact',
+    'top_keywords': 'Top_Keywords',
+    'top_countries': 'Top_Countries',
+    'top_affiliations': 'Top_Affiliations',
+    'merge_report': 'Merge_Report'
+}
+
+
+def is_network(value):
+    """Network results expose a node and an edge table"""
+    return hasattr(value, 'nodes') and hasattr(value, 'edges') and hasattr(value, 'matrix')
+
+
+def _edge_arrays(network):
+    """(row, col, weight) of the upper-triangle edges, by node position"""
+    from scipy import sparse
+
+    upper = sparse.triu(network.matrix, k=1).tocoo()
+    return upper.row, upper.col, upper.data
+
+
+def result_table(name, value):
+    """
+    A result as a DataFrame, or None when it is not tabular
+
+    Dicts (statistics) become Metric/Value rows with text values, and
+    Series keep their index as the first column.
+    """
+    if isinstance(value, pd.DataFrame):
+        return value
+    if isinstance(value, dict):
+        return pd.DataFrame({'Metric': list(value),
+                             'Value': [str(v) for v in value.values()]})
+    if isinstance(value, pd.Series):
+        frame = value.rename(value.name or 'Value').reset_index()
+        if isinstance(frame.iloc[:, 0].dtype, pd.CategoricalDtype):
+            frame.iloc[:, 0] = frame.iloc[:, 0].astype(object)
+        return frame
+    return None
+
+
+class Exporter(ABC):
+    """
+    Base class of an export target
+
+    Subclasses implement write_table (networks default to node and edge
+    tables) and return the written paths; network-only formats derive
+    from NetworkExporter instead. Exporters with concurrent = True get
+    one task per result; others (one database connection) write all
+    results in one task. Register new targets in EXPORTERS.
+    """
+
+    extension = ''
+    tables = True
+    networks = True
+    concurrent = True
+
+    def __init__(self, output_dir, prefix='bibliometric_'):
+        self.output_dir = output_dir
+        self.prefix = prefix
+
+    def path(self, name, extension=None):
+        return os.path.join(self.output_dir, f'{self.prefix}{name}{extension or self.extension}')
+
+    @abstractmethod
+    def write_table(self, name, frame):
+        """Write one table; return the written paths"""
+
+    def write_network(self, name, network):
+        """Default: node and edge tables"""
+        return (self.write_table(f'{name}_nodes', network.nodes())
+                + self.write_table(f'{name}_edges', network.edges()))
+
+    def close(self):
+        """Release resources; return paths written on close"""
+        return []
+
+
+class NetworkExporter(Exporter):
+    """Base class of a network-only export target"""
+
+    tables = False
+
+    def write_table(self, name, frame):
+        raise TypeError(f"{type(self).__name__} only writes networks")
+
+    @abstractmethod
+    def write_network(self, name, network):
+        """Write one network; return the written paths"""
+
+
+class ParquetExporter(Exporter):
+    """One Parquet file per table (requires pyarrow)"""
+
+    extension = '.parquet'
+
+    def write_table(self, name, frame):
+        path = self.path(name)
+        frame.to_parquet(path, index=False)
+        return [path]
+
+
+class CSVExporter(Exporter):
+    """One CSV file per table, written in chunks of chunk_rows"""
+
+    extension = '.csv'
+
+    def __init__(self, output_dir, prefix='bibliometric_', chunk_rows=100000):
+        super().__init__(output_dir, prefix)
+        self.chunk_rows = chunk_rows
+
+    def write_table(self, name, frame):
+        path = self.path(name)
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            frame.head(0).to_csv(f, index=False)
+            for start in range(0, len(frame), self.chunk_rows):
+                frame.iloc[start:start + self.chunk_rows].to_csv(f, index=False, header=False)
+        return [path]
+
+
+class SQLiteExporter(Exporter):
+    """All tables in one SQLite database"""
+
+    extension = '.sqlite'
+    concurrent = False
+
+    def __init__(self, output_dir, prefix='bibliometric_', chunk_rows=50000):
+        super().__init__(output_dir, prefix)
+        self.chunk_rows = chunk_rows
+        self.database = self.path('results')
+        self.connection = None
+
+    def _connect(self):
+        if self.connection is None:
+            # Written from a writer thread, committed from the caller
+            self.connection = sqlite3.connect(self.database, check_same_thread=False)
+        return self.connection
+
+    def write_table(self, name, frame):
+        frame = frame.copy()
+        for col in frame.columns:
+            if isinstance(frame[col].dtype, pd.CategoricalDtype):
+                frame[col] = frame[col].astype(object)
+        frame.to_sql(name, self._connect(), if_exists='replace', index=False,
+                     chunksize=self.chunk_rows)
+        return []
+
+    def close(self):
+        if self.connection is None:
+            return []
+        self.connection.commit()
+        self.connection.close()
+        self.connection = None
+        return [self.database]
+
+
+class DuckDBExporter(Exporter):
+    """All tables in one DuckDB database (requires duckdb)"""
+
+    extension = '.duckdb'
+    concurrent = False
+
+    def __init__(self, output_dir, prefix='bibliometric_'):
+        super().__init__(output_dir, prefix)
+        self.database = self.path('results')
+        self.connection = None
+
+    def write_table(self, name, frame):
+        if self.connection is None:
+            import duckdb
+            self.connection = duckdb.connect(self.database)
+        self.connection.register('_frame', frame)
+        self.connection.execute(f'CREATE OR REPLACE TABLE "{name}" AS SELECT * FROM _frame')
+        self.connection.unregister('_frame')
+        return []
+
+    def close(self):
+        if self.connection is None:
+            return []
+        self.connection.close()
+        self.connection = None
+        return [self.database]
+
+
+class GraphMLExporter(NetworkExporter):
+    """Networks as GraphML, streamed without building a networkx graph"""
+
+    extension = '.graphml'
+
+    def write_network(self, name, network):
+        path = self.path(name)
+        nodes = network.nodes()
+        rows, cols, weights = _edge_arrays(network)
+
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                    '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n'
+                    '<key id="label" for="node" attr.name="label" attr.type="string"/>\n'
+                    '<key id="occurrences" for="node" attr.name="occurrences" attr.type="double"/>\n'
+                    '<key id="weight" for="edge" attr.name="weight" attr.type="double"/>\n'
+                    '<graph id="G" edgedefault="undirected">\n')
+            f.writelines(
+                f'<node id="n{i}"><data key="label">{escape(str(label))}</data>'
+                f'<data key="occurrences">{occ}</data></node>\n'
+                for i, label, occ in zip(range(len(nodes)), nodes['Label'], nodes['Occurrences']))
+            f.writelines(
+                f'<edge source="n{s}" target="n{t}"><data key="weight">{w}</data></edge>\n'
+                for s, t, w in zip(rows, cols, weights))
+            f.write('</graph>\n</graphml>\n')
+        return [path]
+
+
+class EdgeListExporter(NetworkExporter):
+    """Networks as Source,Target,Weight CSV edge lists"""
+
+    extension = '_edgelist.csv'
+
+    def write_network(self, name, network):
+        path = self.path(name)
+        network.edges().to_csv(path, index=False)
+        return [path]
+
+
+class VOSviewerExporter(NetworkExporter):
+    """
+    Networks as VOSviewer map and network files
+
+    The map file lists id, label and occurrences weight; the network
+    file lists id pairs with link strength (Map > Create > Create a map
+    based on network data).
+    """
+
+    def write_network(self, name, network):
+        nodes = network.nodes()
+        rows, cols, weights = _edge_arrays(network)
+
+        map_path = self.path(f'{name}_vosviewer_map', '.txt')
+        pd.DataFrame({
+            'id': np.arange(1, len(nodes) + 1),
+            'label': nodes['Label'].astype(str).str.replace('\t', ' '),
+            'weight<Occurrences>': nodes['Occurrences']
+        }).to_csv(map_path, sep='\t', index=False)
+
+        network_path = self.path(f'{name}_vosviewer_network', '.txt')
+        pd.DataFrame({
+            'source': rows + 1,
+            'target': cols + 1,
+            'weight': weights
+        }).to_csv(network_path, sep='\t', index=False, header=False)
+        return [map_path, network_path]
+
+
+class ExcelExporter(Exporter):
+    """
+    Excel summary workbook: the SUMMARY_SHEETS results only, each cut to
+    max_rows (full tables belong in the other formats)
+    """
+
+    extension = '.xlsx'
+    networks = False
+    concurrent = False
+
+    def __init__(self, output_dir, prefix='bibliometric_', max_rows=10000):
+        super().__init__(output_dir, prefix)
+        self.max_rows = max_rows
+        self.workbook = self.path('results')
+        self.writer = None
+
+    def write_table(self, name, frame):
+        if name not in SUMMARY_SHEETS:
+            return []
+        if self.writer is None:
+            self.writer = pd.ExcelWriter(self.workbook)
+        frame.head(self.max_rows).to_excel(self.writer, sheet_name=SUMMARY_SHEETS[name],
+                                           index=False)
+        return []
+
+    def close(self):
+        if self.writer is None:
+            return []
+        self.writer.close()
+        self.writer = None
+        return [self.workbook]
+
+
+EXPORTERS = {
+    'parquet': ParquetExporter,
+    'csv': CSVExporter,
+    'sqlite': SQLiteExporter,
+    'duckdb': DuckDBExporter,
+    'graphml': GraphMLExporter,
+    'edgelist': EdgeListExporter,
+    'vosviewer': VOSviewerExporter,
+    'xlsx': ExcelExporter
+}
+
+
+def export_results(results, output_dir='outputs', formats=('xlsx',), workers=None):
+    """
+    Write results to every requested format concurrently
+
+    Parameters:
+    -----------
+    results : dict
+        Result name -> DataFrame, Series, dict or Network
+    output_dir : str
+        Output directory (created if missing)
+    formats : tuple of str
+        Keys of EXPORTERS
+    workers : int, optional
+        Writer threads (defaults to the number of CPUs)
+
+    Returns:
+    --------
+    list of written file paths
+    """
+    unknown = [fmt for fmt in formats if fmt not in EXPORTERS]
+    if unknown:
+        raise ValueError(f"Unknown export formats {unknown}; use {sorted(EXPORTERS)}")
+    os.makedirs(output_dir, exist_ok=True)
+
+    tables, networks = {}, {}
+    for name, value in results.items():
+        if is_network(value):
+            networks[name] = value
+        else:
+            table = result_table(name, value)
+            if table is not None:
+                tables[name] = table
+    # Summary sheets first, in their usual order
+    order = list(SUMMARY_SHEETS)
+    tables = dict(sorted(tables.items(), key=lambda item: order.index(item[0])
+                         if item[0] in order else len(order)))
+
+    exporters = [EXPORTERS[fmt](output_dir) for fmt in formats]
+    jobs = []
+    for exporter in exporters:
+        items = []
+        if exporter.tables:
+            items += [(exporter.write_table, name, table) for name, table in tables.items()]
+        if exporter.networks:
+            items += [(exporter.write_network, name, net) for name, net in networks.items()]
+        if exporter.concurrent:
+            jobs.extend([item] for item in items)
+        elif items:
+            jobs.append(items)
+
+    def run(items):
+        written = []
+        for write, name, value in items:
+            written.extend(write(name, value))
+        return written
+
+    written = []
+    with ThreadPoolExecutor(workers or os.cpu_count() or 1) as pool:
+        for paths in pool.map(run, jobs):
+            written.extend(paths)
+    for exporter in exporters:
+        written.extend(exporter.close())
+    return written
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Incremental Corpus Updates for Python Bibliometric Analysis
+
+Author: Mahbub Hassan
+Affiliation: Chulalongkorn University
+
+Purpose: Running aggregates and an append-only on-disk corpus store, so
+weekly WoS/Scopus deltas cost time proportional to the new records
+Requirements: numpy, pandas, scipy, pyarrow (for CorpusStore)
+"""
+
+import os
+import json
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# Identifier columns used for deduplication, in order of preference
+ID_COLUMNS = ['UT', 'EID', 'DOI']
+
+
+def record_ids(df):
+    """
+    Every identifier of every record as one prefixed string Series
+
+    Returns:
+    --------
+    pd.Series of 'ut:...', 'eid:...' and 'doi:...' strings indexed by the
+    row position of the record (a record may appear several times)
+    """
+    ids = []
+    for col in ID_COLUMNS:
+        if col not in df.columns:
+            continue
+        values = df[col].astype(object).reset_index(drop=True).dropna().astype(str).str.strip()
+        if col == 'DOI':
+            values = values.str.lower()
+        values = values[values.str.len() > 0]
+        ids.append(col.lower() + ':' + values)
+    if not ids:
+        return pd.Series([], dtype=object)
+    return pd.concat(ids)
+
+
+def new_record_mask(existing, delta):
+    """
+    Boolean mask of delta rows not already present (by UT/EID/DOI)
+
+    Records repeated inside the delta are kept once.
+    """
+    known = pd.Index(record_ids(existing).unique())
+    delta_ids = record_ids(delta)
+
+    mask = np.ones(len(delta), dtype=bool)
+    mask[delta_ids.index[delta_ids.isin(known)].unique()] = False
+
+    # Later rows sharing any identifier with an earlier delta row
+    repeated = delta_ids[delta_ids.duplicated()]
+    mask[repeated.index.unique()] = False
+    return mask
+
+
+def _pad(counts, size):
+    """Extend a count vector with zeros for newly added vocabulary items"""
+    if len(counts) >= size:
+        return counts
+    return np.concatenate([counts, np.zeros(size - len(counts), dtype=counts.dtype)])
+
+
+class CorpusAggregates:
+    """
+    Counters updated batch by batch from new records only
+
+    Item counts and co-occurrence matrices are aligned with the codes of
+    the analysis token tables, whose vocabularies only ever grow by
+    appending, so an update touches the delta and nothing else.
+
+    Attributes:
+    -----------
+    n_docs : int
+        Documents seen
+    item_counts : dict
+        token table name -> documents per item code
+    cooccurrence : dict
+        token table name -> symmetric co-occurrence CSR matrix
+    sources : pd.Series
+        Documents per source
+    yearly : pd.DataFrame
+        Documents and citation sum per year
+    """
+
+    def __init__(self, cooccurrence_fields=('keywords',)):
+        self.n_docs = 0
+        self.total_citations = 0
+        self.item_counts = {}
+        self.cooccurrence = {name: sparse.csr_matrix((0, 0), dtype=np.int64)
+                             for name in cooccurrence_fields}
+        self.sources = pd.Series(dtype=np.int64)
+        self.yearly = pd.DataFrame({'Documents': pd.Series(dtype=np.int64),
+                                    'Citations': pd.Series(dtype=np.int64)})
+
+    def update(self, delta, tables, full_tables=None):
+        """
+        Add a batch of new records
+
+        Parameters:
+        -----------
+        delta : pd.DataFrame
+            The new records only
+        tables : dict
+            name -> TokenTable of the new records, coded with the global
+            vocabulary and with doc relative to the batch
+        full_tables : dict, optional
+            name -> TokenTable of the whole corpus including the batch.
+            Tables not counted before (e.g. built after the aggregates
+            started) are counted from these in full, not from the batch.
+        """
+        self.n_docs += len(delta)
+        full_tables = full_tables or {}
+
+        for name, table in tables.items():
+            if name not in self.item_counts and name in full_tables:
+                table = full_tables[name]
+            self.item_counts[name] = (_pad(self.item_counts.get(name, np.zeros(0, np.int64)),
+                                           len(table.vocab)) + table.counts())
+
+            if name in self.cooccurrence:
+                size = len(table.vocab)
+                A = sparse.csr_matrix((np.ones(len(table.doc), dtype=np.int64),
+                                       (table.doc, table.code)), shape=(table.n_docs, size))
+                C = (A.T @ A).tocsr()
+                C.setdiag(0)
+                C.eliminate_zeros()
+                old = self.cooccurrence[name]
+                old.resize((size, size))
+                self.cooccurrence[name] = (old + C).tocsr()
+
+        if 'Source' in delta.columns:
+            counts = delta['Source'].astype(object).value_counts()
+            self.sources = self.sources.add(counts, fill_value=0).astype(np.int64)
+
+        if 'Year' in delta.columns:
+            citations = delta['Citations'] if 'Citations' in delta.columns else 0
+            yearly = pd.DataFrame({'Year': delta['Year'], 'Citations': citations,
+                                   'Documents': 1}).groupby('Year')[['Documents', 'Citations']].sum()
+            self.yearly = self.yearly.add(yearly, fill_value=0).astype(np.int64)
+
+        if 'Citations' in delta.columns:
+            self.total_citations += int(delta['Citations'].sum())
+
+    def to_frames(self):
+        """Named DataFrames for Parquet storage"""
+        frames = {
+            'agg_meta': pd.DataFrame({'n_docs': [self.n_docs],
+                                      'total_citations': [self.total_citations]}),
+            'agg_sources': self.sources.rename_axis('Source').reset_index(name='Documents'),
+            'agg_yearly': self.yearly.rename_axis('Year').reset_index()
+        }
+        for name, counts in self.item_counts.items():
+            frames[f'agg_counts_{name}'] = pd.DataFrame({'count': counts})
+        for name, C in self.cooccurrence.items():
+            upper = sparse.triu(C, k=1).tocoo()
+            frames[f'agg_cooc_{name}'] = pd.DataFrame({
+                'row': upper.row, 'col': upper.col, 'weight': upper.data})
+        return frames
+
+    @classmethod
+    def from_frames(cls, frames, vocab_sizes):
+        """
+        Rebuild aggregates stored with to_frames
+
+        Parameters:
+        -----------
+        frames : dict
+            name -> DataFrame as read back from storage
+        vocab_sizes : dict
+            token table name -> vocabulary size
+        """
+        cooc = [name[len('agg_cooc_'):] for name in frames if name.startswith('agg_cooc_')]
+        agg = cls(cooccurrence_fields=cooc)
+        meta = frames['agg_meta'].iloc[0]
+        agg.n_docs = int(meta['n_docs'])
+        agg.total_citations = int(meta['total_citations'])
+        agg.sources = frames['agg_sources'].set_index('Source')['Documents']
+        agg.yearly = frames['agg_yearly'].set_index('Year')
+
+        for name, frame in frames.items():
+            if name.startswith('agg_counts_'):
+                agg.item_counts[name[len('agg_counts_'):]] = frame['count'].to_numpy()
+        for name in cooc:
+            frame = frames[f'agg_cooc_{name}']
+            size = vocab_sizes[name]
+            upper = sparse.csr_matrix((frame['weight'], (frame['row'], frame['col'])),
+                                      shape=(size, size))
+            agg.cooccurrence[name] = (upper + upper.T).tocsr()
+        return agg
+
+
+class CorpusStore:
+    """
+    Append-only Parquet directory for an incrementally growing corpus
+
+    Corpus rows and token pairs are written as numbered part files, so a
+    save only writes rows added since the previous save. Vocabularies and
+    aggregates (sized by distinct items, not by records) are rewritten.
+
+    state.json records how many documents each token table covers; a
+    table first saved after earlier saves (e.g. countries, built on
+    demand) is written in full, and load skips tables that do not cover
+    the whole corpus.
+    """
+
+    STATE = 'state.json'
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _state(self):
+        try:
+            with open(os.path.join(self.directory, self.STATE), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {'n_docs': 0, 'parts': 0}
+
+    def save(self, df, tables, whole_frames):
+        """
+        Write new rows and replace the small frames
+
+        Parameters:
+        -----------
+        df : pd.DataFrame
+            The full corpus; rows already stored are skipped
+        tables : dict
+            name -> TokenTable over the full corpus
+        whole_frames : dict
+            name -> DataFrame rewritten on every save (vocabularies,
+            aggregates)
+        """
+        state = self._state()
+        start = state['n_docs']
+        if start > len(df):
+            raise ValueError(f"Store holds {start} records but the corpus has {len(df)}")
+
+        part = f"part-{state['parts']:05d}.parquet"
+        written = False
+        if len(df) > start:
+            os.makedirs(os.path.join(self.directory, 'corpus'), exist_ok=True)
+            df.iloc[start:].to_parquet(os.path.join(self.directory, 'corpus', part), index=False)
+            written = True
+
+        # Documents already stored per table (stores without the entry
+        # wrote every table on every save)
+        covered = state.get('tables', {})
+        for name, table in tables.items():
+            folder = os.path.join(self.directory, f'tokens_{name}')
+            done = covered.get(name, start) if os.path.isdir(folder) else 0
+            if done >= len(df):
+                continue
+            first = np.searchsorted(table.doc, done)
+            os.makedirs(folder, exist_ok=True)
+            pd.DataFrame({'doc': table.doc[first:], 'code': table.code[first:]}).to_parquet(
+                os.path.join(folder, part), index=False)
+            covered[name] = len(df)
+            written = True
+        if written:
+            state['parts'] += 1
+        state['tables'] = covered
+
+        for name, frame in whole_frames.items():
+            frame.to_parquet(os.path.join(self.directory, f'{name}.parquet'), index=False)
+
+        state['n_docs'] = len(df)
+        tmp = os.path.join(self.directory, self.STATE + '.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp, os.path.join(self.directory, self.STATE))
+
+    def load(self):
+        """
+        Read the store back
+
+        Token tables that do not cover every stored document are left
+        out of the pairs (their vocabularies are still returned), so the
+        caller can rebuild them.
+
+        Returns:
+        --------
+        (corpus DataFrame, {name: token pairs DataFrame},
+         {name: whole-frame DataFrame})
+        """
+        def read_parts(folder):
+            files = sorted(f for f in os.listdir(folder) if f.endswith('.parquet'))
+            return pd.concat([pd.read_parquet(os.path.join(folder, f)) for f in files],
+                             ignore_index=True)
+
+        corpus_folder = os.path.join(self.directory, 'corpus')
+        corpus = read_parts(corpus_folder)
+        if 'Source' in corpus.columns:
+            corpus['Source'] = corpus['Source'].astype('category')
+
+        covered = self._state().get('tables')
+        corpus_parts = set(os.listdir(corpus_folder))
+
+        pairs, frames = {}, {}
+        for entry in os.listdir(self.directory):
+            path = os.path.join(self.directory, entry)
+            if entry.startswith('tokens_') and os.path.isdir(path):
+                name = entry[len('tokens_'):]
+                if covered is not None:
+                    complete = covered.get(name) == len(corpus)
+                else:
+                    # Older stores: a complete table has a part per corpus part
+                    complete = corpus_parts <= set(os.listdir(path))
+                if complete:
+                    pairs[name] = read_parts(path)
+            elif entry.endswith('.parquet'):
+                frames[entry[:-len('.parquet')]] = pd.read_parquet(path)
+        return corpus, pairs, frames
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Corpus Indexes for Python Bibliometric Analysis
+
+Author: Mahbub Hassan
+Affiliation: Chulalongkorn University
+
+Purpose: Inverted indexes (keyword, author, source, country -> documents)
+and a sorted year index, stored as sorted int32 posting arrays, so corpus
+subsets are found with set operations instead of string scans
+Requirements: numpy, pandas
+"""
+
+from functools import reduce
+
+import numpy as np
+import pandas as pd
+
+MATCHES = ('exact', 'contains')
+
+
+def gather_ranges(starts, stops):
+    """Concatenated positions of the ranges [start, stop) (vectorized)"""
+    lengths = stops - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return np.array([], dtype=np.int64)
+    # Position within the output minus position within the range
+    shift = np.repeat(starts - np.concatenate([[0], np.cumsum(lengths)[:-1]]), lengths)
+    return shift + np.arange(total)
+
+
+def intersection(arrays):
+    """Sorted intersection of sorted, duplicate-free document arrays"""
+    arrays = sorted(arrays, key=len)
+    return reduce(lambda a, b: np.intersect1d(a, b, assume_unique=True), arrays)
+
+
+class InvertedIndex:
+    """
+    Item -> sorted document positions, stored CSR-style
+
+    Attributes:
+    -----------
+    postings : np.ndarray of int32
+        Documents of item 0, then of item 1, ... each run sorted
+    offsets : np.ndarray of int64
+        Run of item c is postings[offsets[c]:offsets[c + 1]]
+    vocab : pd.Index
+        Item labels indexed by code
+    """
+
+    def __init__(self, doc, code, vocab):
+        """
+        Parameters:
+        -----------
+        doc, code : np.ndarray
+            (document, item) pairs sorted by document, e.g. a TokenTable
+        vocab : pd.Index
+            Item labels indexed by code
+        """
+        order = np.argsort(code, kind='stable')
+        self.postings = np.asarray(doc)[order].astype(np.int32)
+        counts = np.bincount(code, minlength=len(vocab))
+        self.offsets = np.concatenate([[0], np.cumsum(counts)])
+        self.vocab = pd.Index(vocab)
+        self._folded = None
+
+    @classmethod
+    def from_column(cls, values):
+        """Index of a single-valued column (e.g. Source), NaN skipped"""
+        codes, vocab = pd.factorize(pd.Series(values, dtype=object).reset_index(drop=True))
+        doc = np.flatnonzero(codes >= 0)
+        return cls(doc, codes[doc], pd.Index(vocab))
+
+    def codes(self, items, match='exact'):
+        """
+        Codes of the vocabulary items matching any of items (case-insensitive)
+
+        Parameters:
+        -----------
+        items : str or list of str
+        match : str
+            'exact' item or 'contains' (substring of the item)
+        """
+        if match not in MATCHES:
+            raise ValueError(f"match must be one of: {', '.join(MATCHES)}")
+        if isinstance(items, str):
+            items = [items]
+        if self._folded is None:
+            self._folded = pd.Series(self.vocab, dtype=object).astype(str).str.lower()
+
+        items = [str(item).strip().lower() for item in items]
+        if match == 'exact':
+            return np.flatnonzero(self._folded.isin(items).to_numpy())
+        mask = np.zeros(len(self.vocab), dtype=bool)
+        for item in items:
+            mask |= self._folded.str.contains(item, regex=False).to_numpy()
+        return np.flatnonzero(mask)
+
+    def docs(self, items, match='exact'):
+        """Sorted documents with at least one of items"""
+        codes = self.codes(items, match)
+        return np.unique(self.postings[gather_ranges(self.offsets[codes],
+                                                     self.offsets[codes + 1])])
+
+
+class YearIndex:
+    """Documents sorted by publication year; ranges by binary search"""
+
+    def __init__(self, years):
+        years = np.asarray(years, dtype=float)
+        known = np.flatnonzero(~np.isnan(years))
+        self.order = known[np.argsort(years[known], kind='stable')].astype(np.int32)
+        self.years = years[self.order]
+
+    def docs(self, first=None, last=None):
+        """Sorted documents published from first to last (inclusive)"""
+        start = 0 if first is None else np.searchsorted(self.years, first, 'left')
+        stop = len(self.years) if last is None else np.searchsorted(self.years, last, 'right')
+        return np.sort(self.order[start:stop])
+
+
+class CorpusIndex:
+    """
+    Indexes of one corpus, each built on first use
+
+    Fields are the token tables of the analysis ('keywords', 'authors',
+    'countries', ...), 'sources' (the Source column) and the Year index.
+    """
+
+    def __init__(self, analysis):
+        self.analysis = analysis
+        self.n_docs = len(analysis.df)
+        self.indexes = {}
+        self._years = None
+
+    def field(self, name):
+        """InvertedIndex of a field"""
+        if name not in self.indexes:
+            if name == 'sources':
+                index = InvertedIndex.from_column(self.analysis.df['Source'])
+            else:
+                table = self.analysis._tokens(name)
+                index = InvertedIndex(table.doc, table.code, table.vocab)
+            self.indexes[name] = index
+        return self.indexes[name]
+
+    def years(self):
+        if self._years is None:
+            self._years = YearIndex(
+                self.analysis.df['Year'].to_numpy(dtype=float, na_value=np.nan))
+        return self._years
+
+    def select(self, years=None, match='exact', **fields):
+        """
+        Sorted documents matching every filter
+
+        Values of one field are alternatives (union); different fields
+        must all match (intersection).
+
+        Parameters:
+        -----------
+        years : int or (first, last), optional
+            Publication year or inclusive range (None for an open end)
+        match : str
+            'exact' or 'contains' for field values
+        **fields : str or list of str
+            Field name -> values, e.g. keywords=['autonomous vehicles']
+        """
+        selected = []
+        if years is not None:
+            first, last = (years, years) if np.isscalar(years) else years
+            selected.append(self.years().docs(first, last))
+        for name, values in fields.items():
+            if values is not None:
+                selected.append(self.field(name).docs(values, match))
+        if not selected:
+            return np.arange(self.n_docs, dtype=np.int32)
+        return intersection(selected)
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Record Deduplication for Python Bibliometric Analysis
+
+Author: Mahbub Hassan
+Affiliation: Chulalongkorn University
+
+Purpose: Merge WoS and Scopus corpora loaded into the canonical schema,
+removing exact duplicates (shared DOI/UT/EID) and near-duplicates
+(similar titles in the same year, found with MinHash/LSH)
+Requirements: numpy, pandas, scipy
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+
+from bibliometric_incremental import record_ids
+
+# Mersenne prime for the MinHash permutations (a * h + b) mod P
+_PRIME = np.uint64((1 << 31) - 1)
+
+
+def normalize_titles(titles):
+    """Lower-case titles with punctuation and markup removed"""
+    return (pd.Series(titles, dtype=object).fillna('').astype(str).str.lower()
+            .str.replace(r'<[^>]+>', ' ', regex=True)
+            .str.replace(r'[^a-z0-9]+', ' ', regex=True)
+            .str.strip())
+
+
+def minhash_signatures(titles, num_perm=64, seed=42):
+    """
+    MinHash signature of the word set of every title (vectorized)
+
+    Parameters:
+    -----------
+    titles : pd.Series of str
+        Normalized titles
+    num_perm : int
+        Signature length
+    seed : int
+        Seed of the random permutations
+
+    Returns:
+    --------
+    (signatures, has_words): uint64 array of shape (len(titles), num_perm)
+    and a boolean mask of titles with at least one word
+    """
+    words = titles.reset_index(drop=True).str.split().explode().dropna()
+    words = words[words.str.len() > 0]
+    doc = words.index.to_numpy()
+    hashes = pd.util.hash_array(words.to_numpy(dtype=object)) % _PRIME
+
+    # Sorted unique (doc, word) pairs for reduceat
+    pairs = pd.DataFrame({'doc': doc, 'hash': hashes}).drop_duplicates().sort_values('doc')
+    doc = pairs['doc'].to_numpy()
+    hashes = pairs['hash'].to_numpy()
+    starts = np.flatnonzero(np.r_[True, doc[1:] != doc[:-1]]) if len(doc) else np.array([], int)
+
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, int(_PRIME), num_perm, dtype=np.uint64)
+    b = rng.integers(0, int(_PRIME), num_perm, dtype=np.uint64)
+
+    signatures = np.full((len(titles), num_perm), _PRIME, dtype=np.uint64)
+    if len(doc):
+        rows = doc[starts]
+        for i in range(num_perm):
+            permuted = (a[i] * hashes + b[i]) % _PRIME
+            signatures[rows, i] = np.minimum.reduceat(permuted, starts)
+
+    has_words = np.zeros(len(titles), dtype=bool)
+    has_words[doc] = True
+    return signatures, has_words
+
+
+def lsh_candidates(signatures, blocks, bands=16, max_bucket=100):
+    """
+    Candidate pairs sharing an LSH bucket within the same block
+
+    Each band of the signature is hashed together with the block (the
+    publication year), so only records of the same year with at least one
+    identical band are ever compared.
+
+    Parameters:
+    -----------
+    signatures : np.ndarray
+        MinHash signatures, one row per record
+    blocks : np.ndarray
+        Blocking key of every record
+    bands : int
+        Number of bands; num_perm must be divisible by it
+    max_bucket : int
+        Buckets larger than this (e.g. "Editorial") are skipped
+
+    Returns:
+    --------
+    (left, right) row positions with left < right
+    """
+    n, num_perm = signatures.shape
+    if num_perm % bands:
+        raise ValueError("num_perm must be divisible by bands")
+    rows = num_perm // bands
+    ids = np.arange(n)
+
+    found = []
+    for band in range(bands):
+        keys = pd.DataFrame(signatures[:, band * rows:(band + 1) * rows])
+        keys['block'] = blocks
+        bucket = pd.util.hash_pandas_object(keys, index=False).to_numpy()
+
+        frame = pd.DataFrame({'bucket': bucket, 'row': ids})
+        size = frame.groupby('bucket')['row'].transform('size')
+        frame = frame[(size > 1) & (size <= max_bucket)]
+        if frame.empty:
+            continue
+
+        pairs = frame.merge(frame, on='bucket')
+        pairs = pairs[pairs['row_x'] < pairs['row_y']]
+        found.append(pairs[['row_x', 'row_y']].to_numpy())
+
+    if not found:
+        return np.array([], dtype=np.int64), np.array([], dtype=np.int64)
+    pairs = np.unique(np.concatenate(found), axis=0)
+    return pairs[:, 0], pairs[:, 1]
+
+
+def exact_duplicate_pairs(df):
+    """
+    Pairs of records sharing a UT, EID or DOI (hash index, no pairwise scan)
+
+    Every record is linked to the first record carrying the same
+    identifier.
+
+    Returns:
+    --------
+    DataFrame with left, right and rule ('ut', 'eid' or 'doi')
+    """
+    ids = record_ids(df)
+    codes, _ = pd.factorize(ids)
+    rows = ids.index.to_numpy()
+
+    first = pd.Series(rows).groupby(codes).transform('min').to_numpy()
+    linked = rows != first
+    return pd.DataFrame({
+        'left': first[linked],
+        'right': rows[linked],
+        'rule': ids.str.split(':', n=1).str[0].to_numpy()[linked]
+    })
+
+
+def title_duplicate_pairs(df, threshold=0.8, num_perm=64, bands=16, max_bucket=100):
+    """
+    Pairs of records with similar titles published in the same year
+
+    Returns:
+    --------
+    DataFrame with left, right, rule ('title') and similarity (estimated
+    Jaccard similarity of the title word sets)
+    """
+    titles = normalize_titles(df['Title'])
+    signatures, has_words = minhash_signatures(titles, num_perm)
+
+    if 'Year' in df.columns:
+        blocks = pd.to_numeric(df['Year'], errors='coerce').fillna(-1).astype(np.int64).to_numpy()
+    else:
+        blocks = np.zeros(len(df), dtype=np.int64)
+
+    keep = np.flatnonzero(has_words)
+    left, right = lsh_candidates(signatures[keep], blocks[keep], bands, max_bucket)
+    left, right = keep[left], keep[right]
+
+    similarity = (signatures[left] == signatures[right]).mean(axis=1)
+    accepted = similarity >= threshold
+    return pd.DataFrame({
+        'left': left[accepted],
+        'right': right[accepted],
+        'rule': 'title',
+        'similarity': similarity[accepted].round(3)
+    })
+
+
+def merge_records(frames, threshold=0.8, num_perm=64, bands=16, max_bucket=100):
+    """
+    Concatenate corpora and collapse duplicate records
+
+    Records connected by any duplicate link form one merged record. Its
+    fields come from the record of the highest priority database (the
+    first in frames), with missing fields filled from the others, and its
+    citation count is the maximum reported.
+
+    Parameters:
+    -----------
+    frames : dict
+        database name -> DataFrame in the canonical schema, in priority
+        order (e.g. {'wos': ..., 'scopus': ...})
+    threshold : float
+        Minimum estimated title similarity for a near-duplicate
+    num_perm, bands : int
+        MinHash signature length and LSH bands
+    max_bucket : int
+        Largest LSH bucket compared
+
+    Returns:
+    --------
+    (merged DataFrame with a Database column, report DataFrame with one
+    row per duplicate link)
+    """
+    names = list(frames)
+    combined = pd.concat([frame.assign(Database=name) for name, frame in frames.items()],
+                         ignore_index=True)
+    offsets = np.cumsum([0] + [len(frame) for frame in frames.values()])
+    for col in combined.columns:
+        if isinstance(combined[col].dtype, pd.CategoricalDtype):
+            combined[col] = combined[col].astype(object)
+
+    links = [exact_duplicate_pairs(combined)]
+    if 'Title' in combined.columns:
+        links.append(title_duplicate_pairs(combined, threshold, num_perm, bands, max_bucket))
+    links = pd.concat(links, ignore_index=True)
+    # One decision per pair: identifier matches take precedence over titles
+    links = links.drop_duplicates(['left', 'right'], ignore_index=True)
+
+    n = len(combined)
+    graph = sparse.csr_matrix((np.ones(len(links)), (links['left'], links['right'])),
+                              shape=(n, n))
+    _, component = connected_components(graph, directed=False)
+
+    # Rows are already in priority order; number components by first row
+    record = pd.factorize(component)[0]
+    merged = combined.groupby(record, sort=True).first()
+    if 'Citations' in combined.columns:
+        merged['Citations'] = combined['Citations'].groupby(record).max()
+
+    # Databases contributing to each record, as a bit mask -> 'wos+scopus'
+    database = np.searchsorted(offsets, np.arange(n), side='right') - 1
+    mask = np.zeros(len(merged), dtype=np.int64)
+    np.bitwise_or.at(mask, record, 1 << database)
+    labels = {m: '+'.join(name for i, name in enumerate(names) if m >> i & 1)
+              for m in np.unique(mask)}
+    merged['Database'] = pd.Series(mask, index=merged.index).map(labels)
+    merged = merged.reset_index(drop=True)
+
+    report = pd.DataFrame({
+        'record': record[links['left']],
+        'left_database': np.asarray(names)[database[links['left']]],
+        'left_row': links['left'] - offsets[database[links['left']]],
+        'right_database': np.asarray(names)[database[links['right']]],
+        'right_row': links['right'] - offsets[database[links['right']]],
+        'rule': links['rule'],
+        'similarity': links['similarity'].fillna(1.0) if 'similarity' in links else 1.0
+    })
+    return merged, report
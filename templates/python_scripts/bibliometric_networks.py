@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Sparse Network Engine for Python Bibliometric Analysis
+
+Author: Mahbub Hassan
+Affiliation: Chulalongkorn University
+
+Purpose: Co-occurrence and collaboration networks (biblioNetwork in R)
+computed on scipy.sparse matrices
+Requirements: numpy, pandas, scipy (networkx only for to_networkx)
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# Similarity measures of bibliometrix normalizeSimilarity
+NORMALIZATIONS = ('association', 'inclusion', 'jaccard', 'salton', 'equivalence')
+
+
+def incidence_matrix(doc, code, n_docs, n_items):
+    """
+    Binary document x item matrix in CSR format
+
+    Parameters:
+    -----------
+    doc, code : np.ndarray
+        Parallel arrays of (document, item) pairs, e.g. a TokenTable
+    n_docs, n_items : int
+        Matrix shape
+    """
+    data = np.ones(len(doc), dtype=np.int32)
+    A = sparse.csr_matrix((data, (doc, code)), shape=(n_docs, n_items))
+    # Duplicate pairs are summed by the constructor; keep the matrix binary
+    A.data[:] = 1
+    return A
+
+
+def normalize_similarity(C, occurrences, method):
+    """
+    Normalize co-occurrence counts by item occurrences
+
+    Parameters:
+    -----------
+    C : scipy.sparse matrix
+        Co-occurrence counts with an empty diagonal
+    occurrences : np.ndarray
+        Number of documents per item
+    method : str
+        One of NORMALIZATIONS
+    """
+    if method not in NORMALIZATIONS:
+        raise ValueError(f"normalize must be one of: {', '.join(NORMALIZATIONS)}")
+
+    C = C.tocoo()
+    w = C.data.astype(np.float64)
+    occ_i = occurrences[C.row].astype(np.float64)
+    occ_j = occurrences[C.col].astype(np.float64)
+
+    if method == 'association':
+        w = w / (occ_i * occ_j)
+    elif method == 'inclusion':
+        w = w / np.minimum(occ_i, occ_j)
+    elif method == 'jaccard':
+        w = w / (occ_i + occ_j - w)
+    elif method == 'salton':
+        w = w / np.sqrt(occ_i * occ_j)
+    else:
+        w = w ** 2 / (occ_i * occ_j)
+
+    return sparse.csr_matrix((w, (C.row, C.col)), shape=C.shape)
+
+
+class Network:
+    """
+    Weighted undirected network stored as a symmetric sparse matrix
+
+    Attributes:
+    -----------
+    matrix : scipy.sparse.csr_matrix
+        Edge weights, symmetric with an empty diagonal
+    labels : pd.Index
+        Node labels
+    occurrences : np.ndarray
+        Documents per node
+    """
+
+    def __init__(self, matrix, labels, occurrences):
+        self.matrix = matrix
+        self.labels = labels
+        self.occurrences = occurrences
+
+    def __len__(self):
+        return self.matrix.shape[0]
+
+    def edges(self):
+        """Edge list (upper triangle) sorted by descending weight"""
+        upper = sparse.triu(self.matrix, k=1).tocoo()
+        edges = pd.DataFrame({
+            'Source': self.labels.take(upper.row),
+            'Target': self.labels.take(upper.col),
+            'Weight': upper.data
+        })
+        return edges.sort_values('Weight', ascending=False, ignore_index=True)
+
+    def nodes(self):
+        """Node table with occurrences and weighted degree"""
+        return pd.DataFrame({
+            'Label': self.labels,
+            'Occurrences': self.occurrences,
+            'Degree': np.diff(self.matrix.indptr),
+            'Strength': np.asarray(self.matrix.sum(axis=1)).ravel()
+        })
+
+    def to_networkx(self):
+        """Convert to a networkx.Graph (only do this on pruned networks)"""
+        import networkx as nx
+
+        G = nx.Graph()
+        for label, occ in zip(self.labels, self.occurrences):
+            G.add_node(label, occurrences=int(occ))
+        upper = sparse.triu(self.matrix, k=1).tocoo()
+        G.add_weighted_edges_from(zip(self.labels.take(upper.row),
+                                      self.labels.take(upper.col),
+                                      upper.data.tolist()))
+        return G
+
+
+def cooccurrence_network(doc, code, labels, n_docs, top_n=None, min_weight=1,
+                         normalize=None):
+    """
+    Co-occurrence network of items sharing documents (C = A.T @ A)
+
+    Items are pruned to the top_n most frequent before the product and
+    edges below min_weight co-occurrences are dropped before
+    normalization, so only the retained part of the network is ever
+    materialized.
+
+    Parameters:
+    -----------
+    doc, code : np.ndarray
+        (document, item) pairs
+    labels : pd.Index
+        Item labels indexed by code
+    n_docs : int
+        Number of documents
+    top_n : int, optional
+        Keep only the most frequent items
+    min_weight : int
+        Minimum raw co-occurrence count for an edge
+    normalize : str, optional
+        Similarity measure from NORMALIZATIONS (raw counts when None)
+
+    Returns:
+    --------
+    Network
+    """
+    A = incidence_matrix(doc, code, n_docs, len(labels))
+    occurrences = np.asarray(A.sum(axis=0)).ravel()
+
+    if top_n is not None and top_n < len(labels):
+        keep = np.sort(np.argsort(-occurrences, kind='stable')[:top_n])
+        A = A[:, keep]
+        labels = labels.take(keep)
+        occurrences = occurrences[keep]
+
+    C = (A.T @ A).tocsr()
+    C.setdiag(0)
+    if min_weight > 1:
+        C.data[C.data < min_weight] = 0
+    C.eliminate_zeros()
+
+    if normalize is not None:
+        C = normalize_similarity(C, occurrences, normalize)
+
+    return Network(C, pd.Index(labels), occurrences)
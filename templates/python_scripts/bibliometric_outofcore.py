@@ -0,0 +1,567 @@
+#!/usr/bin/env python3
+"""
+Out-of-Core Backend for Python Bibliometric Analysis
+
+Author: Mahbub Hassan
+Affiliation: Chulalongkorn University
+
+Purpose: Run the report sections (statistics, trends, top cited, authors,
+sources, keywords, countries) as DuckDB queries over Parquet files, for
+corpora that do not fit in memory. Exports are converted to Parquet once
+in bounded-size chunks; every query streams over the files on all cores
+and spills to disk past the memory limit.
+Requirements: duckdb, pyarrow, pandas
+"""
+
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from bibliometric_analysis_python import (
+    BibliometricAnalysis, PARSER_VERSION, REPORT_SECTIONS, TOKEN_FIELDS, WOS_COLUMN_MAP,
+    SCOPUS_COLUMN_MAP, expand_paths, iter_wos_chunks, iter_scopus_chunks,
+    columns_for_sections, scopus_usecols)
+
+# Characters stripped around every item (str.strip() in TokenTable)
+WHITESPACE = ' \t\r\n'
+
+
+def _literal(text):
+    """SQL string literal"""
+    return "'" + str(text).replace("'", "''") + "'"
+
+
+def _split_sql(name):
+    """
+    Text expression split on ';' into the items of a token field
+
+    DuckDB regular expressions have no look-ahead, so AFFILIATION_SEP
+    cannot be used as is: WoS "[Author; Author]" prefixes are removed
+    before splitting instead (the country gazetteer ignores them anyway).
+    """
+    text = f'"{TOKEN_FIELDS[name][0]}"'
+    if name == 'affiliations':
+        text = rf"regexp_replace({text}, '\[[^\]]*\]', '', 'g')"
+    return text
+
+
+def _arrow_batch(df, schema):
+    """DataFrame chunk as a RecordBatch with a fixed schema"""
+    import pyarrow as pa
+
+    df = df.reindex(columns=schema.names)
+    for col in df.columns:
+        if col in ('Year', 'Citations'):
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype('Int64')
+        else:
+            df[col] = df[col].astype(object).where(df[col].notna(), None)
+    return pa.RecordBatch.from_pandas(df, schema=schema, preserve_index=False)
+
+
+def write_parquet_parts(batches, directory, rows_per_file=1000000):
+    """
+    Write Arrow record batches as numbered Parquet part files
+
+    Only one batch is held in memory at a time; a new file is started
+    after rows_per_file rows.
+
+    Returns:
+    --------
+    list of written paths
+    """
+    import pyarrow.parquet as pq
+
+    os.makedirs(directory, exist_ok=True)
+    paths, writer, rows = [], None, 0
+    try:
+        for batch in batches:
+            if writer is None or rows >= rows_per_file:
+                if writer is not None:
+                    writer.close()
+                paths.append(os.path.join(directory, f'part-{len(paths):05d}.parquet'))
+                writer = pq.ParquetWriter(paths[-1], batch.schema)
+                rows = 0
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+    return paths
+
+
+def parquet_parts(data_path):
+    """
+    Parquet files of a corpus: a file, glob, list or directory
+
+    A directory written by BibliometricAnalysis.save_corpus is read from
+    its corpus/ sub-directory.
+    """
+    if isinstance(data_path, str) and os.path.isdir(os.path.join(data_path, 'corpus')):
+        data_path = os.path.join(data_path, 'corpus')
+    return expand_paths(data_path, '*.parquet')
+
+
+class OutOfCoreAnalysis(BibliometricAnalysis):
+    """
+    BibliometricAnalysis whose corpus stays on disk
+
+    The corpus is a set of Parquet files exposed to DuckDB as the view
+    corpus (with a doc column holding the row position); token fields
+    are views of distinct (doc, item) pairs. self.df stays None and
+    every section runs as a query, so peak memory is set by
+    memory_limit and by the size of the results (one row per author,
+    source or keyword for the impact tables), not by the corpus.
+    Results in self.results have the same structure as in
+    BibliometricAnalysis, so figures and exports work unchanged.
+
+    Only the SECTIONS below are available. Merged WoS/Scopus corpora are
+    deduplicated in memory: merge them once with BibliometricAnalysis,
+    save_corpus() the result and open the directory with
+    data_type='parquet'.
+    """
+
+    SECTIONS = tuple(REPORT_SECTIONS)
+
+    def __init__(self, data_path, data_type='wos', chunk_size=50000, parquet_dir=None,
+                 database=None, memory_limit=None, threads=None, temp_directory=None,
+                 rows_per_file=1000000, parquet_max_bytes=20 * 1024 ** 3):
+        """
+        Parameters:
+        -----------
+        data_path : str or list
+            WoS/Scopus exports (file, directory, glob or list), or with
+            data_type='parquet' Parquet files or a save_corpus directory
+        data_type : str
+            'wos', 'scopus' or 'parquet'
+        chunk_size : int
+            Records parsed and written per chunk during conversion
+        parquet_dir : str, optional
+            Where converted exports are kept and reused (default:
+            .bibliometric_parquet next to the input); managed like a
+            CorpusCache directory, so use a dedicated one
+        database : str, optional
+            DuckDB database file (default: in memory)
+        memory_limit : str, optional
+            DuckDB memory limit, e.g. '4GB'; larger intermediates spill to
+            temp_directory (default: 80% of RAM)
+        threads : int, optional
+            DuckDB worker threads (default: all CPUs)
+        temp_directory : str, optional
+            Spill directory (default: .duckdb_tmp in parquet_dir)
+        rows_per_file : int
+            Rows per converted Parquet file
+        parquet_max_bytes : int
+            Size limit for all conversions in parquet_dir; the least
+            recently used ones are deleted first (never the current one)
+        """
+        super().__init__(data_path, data_type, chunk_size, use_cache=False)
+        self.parquet_dir = parquet_dir
+        self.database = database
+        self.memory_limit = memory_limit
+        self.threads = threads
+        self.temp_directory = temp_directory
+        self.rows_per_file = rows_per_file
+        self.parquet_max_bytes = parquet_max_bytes
+        self.parts = []
+        self.columns = []
+        self.n_docs = 0
+        self._setup()
+
+    def _setup(self):
+        self._connection = None
+        self._lock = threading.Lock()
+        self._countries_built = False
+
+    def __getstate__(self):
+        # Worker processes open their own connection
+        state = super().__getstate__()
+        del state['_connection'], state['_lock'], state['_countries_built']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._setup()
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def _load_data(self, sections=None, columns=None):
+        if columns is None and sections is not None:
+            columns = columns_for_sections(sections)
+
+        if self.data_type == 'parquet':
+            parts = parquet_parts(self.data_path)
+        elif self.data_type in ('wos', 'scopus'):
+            paths = expand_paths(self.data_path,
+                                 '*.csv' if self.data_type == 'scopus' else '*.txt')
+            parts = self._convert(paths, columns)
+        else:
+            raise ValueError("data_type must be 'wos', 'scopus' or 'parquet' "
+                             "(merge corpora in memory and save_corpus() them first)")
+
+        self._attach(parts)
+        print(f"✓ {self.n_docs} records in {len(parts)} Parquet file(s) "
+              f"({os.path.dirname(os.path.abspath(parts[0]))})")
+        return self
+
+    def _convert(self, paths, columns=None):
+        """
+        Stream exports into Parquet part files, once per input and columns
+
+        Conversions are entries of a CorpusCache rooted at parquet_dir and
+        share its least-recently-used eviction.
+
+        Returns:
+        --------
+        list of part paths
+        """
+        import shutil
+        import tempfile
+        from bibliometric_cache import CorpusCache
+
+        root = self.parquet_dir or os.path.join(
+            os.path.dirname(os.path.abspath(paths[0])), '.bibliometric_parquet')
+        cache = CorpusCache(root, self.parquet_max_bytes)
+        key = cache.key(paths, PARSER_VERSION, data_type=self.data_type,
+                        columns=sorted(columns) if columns is not None else None)
+        entry = os.path.join(root, key)
+        if os.path.isdir(entry):
+            os.utime(entry)
+            return parquet_parts(entry)
+
+        with self._stage('parse') as stage:
+            # Written to a temporary directory and renamed into place, so an
+            # interrupted conversion is never mistaken for a complete one
+            tmp = tempfile.mkdtemp(prefix=f'.{key}-', dir=root)
+            try:
+                written = write_parquet_parts(self._batches(paths, columns),
+                                              os.path.join(tmp, 'corpus'), self.rows_per_file)
+                if not written:
+                    raise ValueError(f"No records found in {self.data_path}")
+                os.replace(tmp, entry)
+            except BaseException:
+                shutil.rmtree(tmp, ignore_errors=True)
+                raise
+            parts = parquet_parts(entry)
+            stage['rows'] = self._count_rows(parts)
+        cache.evict(keep=key)
+        print(f"✓ Converted {len(paths)} {self.data_type} file(s) to Parquet")
+        return parts
+
+    def _batches(self, paths, columns=None):
+        """Arrow record batches of the exports in the canonical schema"""
+        import pyarrow as pa
+
+        if self.data_type == 'wos':
+            tags = None
+            if columns is not None:
+                tags = {tag for tag, col in WOS_COLUMN_MAP.items() if col in columns}
+            names = [col for tag, col in WOS_COLUMN_MAP.items() if tags is None or tag in tags]
+            for batch in iter_wos_chunks(paths, self.chunk_size, as_arrow=True, tags=tags):
+                yield batch.select(names)
+            return
+
+        names = [SCOPUS_COLUMN_MAP[c] for c in scopus_usecols(paths[0], columns)]
+        schema = pa.schema([
+            (col, pa.int64() if col in ('Year', 'Citations') else pa.string())
+            for col in names
+        ])
+        for chunk in iter_scopus_chunks(paths, self.chunk_size, columns):
+            yield _arrow_batch(chunk, schema)
+
+    @staticmethod
+    def _count_rows(parts):
+        import pyarrow.parquet as pq
+        return sum(pq.read_metadata(path).num_rows for path in parts)
+
+    def _attach(self, parts):
+        """Use parts as the corpus and (re)create the views"""
+        import pyarrow.parquet as pq
+
+        self.parts = list(parts)
+        self.columns = [col for col in pq.read_schema(self.parts[0]).names if col != 'doc']
+        self.n_docs = self._count_rows(self.parts)
+        self._countries_built = False
+        if self._connection is not None:
+            self._create_views(self._connection)
+
+    def _connect(self):
+        """DuckDB connection with the corpus views, opened on first use"""
+        with self._lock:
+            if self._connection is None:
+                import duckdb
+
+                config = {'preserve_insertion_order': False}
+                if self.memory_limit is not None:
+                    config['memory_limit'] = self.memory_limit
+                if self.threads is not None:
+                    config['threads'] = self.threads
+                temp_directory = self.temp_directory
+                if temp_directory is None and self.parts:
+                    temp_directory = os.path.join(
+                        os.path.dirname(os.path.dirname(os.path.abspath(self.parts[0]))),
+                        '.duckdb_tmp')
+                if temp_directory is not None:
+                    config['temp_directory'] = temp_directory
+
+                connection = duckdb.connect(self.database or ':memory:', config=config)
+                if self.parts:
+                    self._create_views(connection)
+                self._connection = connection
+        return self._connection
+
+    def _create_views(self, connection):
+        """corpus view over the part files plus one view per token field"""
+        offsets = np.cumsum([0] + [self._count_rows([path]) for path in self.parts[:-1]])
+        replace = []
+        if 'Citations' in self.columns:
+            replace.append('coalesce("Citations", 0) AS "Citations"')
+        replace = f" REPLACE ({', '.join(replace)})" if replace else ''
+        # Year and Citations are always present, as in _impact_table
+        extra = ''.join([', NULL::INTEGER AS "Year"' if 'Year' not in self.columns else '',
+                         ', 0 AS "Citations"' if 'Citations' not in self.columns else ''])
+        selects = [
+            f"SELECT {offset} + file_row_number AS doc, * EXCLUDE (file_row_number){replace}"
+            f"{extra} FROM read_parquet({_literal(path)}, file_row_number = true)"
+            for offset, path in zip(offsets, self.parts)
+        ]
+        connection.execute('CREATE OR REPLACE VIEW corpus AS\n'
+                           + '\nUNION ALL BY NAME\n'.join(selects))
+
+        # pos is the first position of the item within its document, so
+        # (doc, pos) orders items by first appearance like a TokenTable
+        for name, (column, _, _, lower) in TOKEN_FIELDS.items():
+            if column not in self.columns:
+                continue
+            item = f"trim(unnest(parts), {_literal(WHITESPACE)})"
+            if lower:
+                item = f'lower({item})'
+            connection.execute(f"""
+                CREATE OR REPLACE VIEW tokens_{name} AS
+                SELECT doc, item, min(pos) AS pos FROM (
+                    SELECT doc, {item} AS item, unnest(generate_series(1, len(parts))) AS pos
+                    FROM (SELECT doc, string_split({_split_sql(name)}, ';') AS parts
+                          FROM corpus WHERE "{column}" IS NOT NULL))
+                WHERE item <> ''
+                GROUP BY doc, item""")
+
+    def query(self, sql, params=None):
+        """
+        Run SQL against the corpus and token views
+
+        Parameters:
+        -----------
+        sql : str
+            Query over corpus, tokens_authors, tokens_keywords,
+            tokens_references, tokens_affiliations or tokens_countries
+        params : list, optional
+            Values for ? placeholders
+
+        Returns:
+        --------
+        pandas.DataFrame
+        """
+        # One cursor per call, so concurrent sections do not share state
+        return self._connect().cursor().execute(sql, params).df()
+
+    def _tokens(self, name):
+        """Name of the (doc, item) view of a token field"""
+        if name == 'countries':
+            self._build_countries()
+        else:
+            self._connect()
+        return f'tokens_{name}'
+
+    def _build_countries(self):
+        """
+        Map every distinct address to its country once, in chunks
+
+        The gazetteer runs in Python over batches of distinct addresses;
+        the address -> country table and the tokens_countries view stay
+        in DuckDB.
+        """
+        connection = self._connect()
+        with self._lock:
+            if self._countries_built:
+                return
+            from bibliometric_affiliations import address_countries
+
+            writer = connection.cursor()
+            writer.execute('CREATE OR REPLACE TABLE address_countries '
+                           '(address VARCHAR, country VARCHAR)')
+            reader = connection.cursor().execute(
+                'SELECT DISTINCT item FROM tokens_affiliations').fetch_record_batch(self.chunk_size)
+            for batch in reader:
+                addresses = batch.column(0).to_pandas()
+                mapped = pd.DataFrame({'address': addresses,
+                                       'country': address_countries(addresses).to_numpy()})
+                writer.register('mapped_addresses', mapped.dropna())
+                writer.execute('INSERT INTO address_countries SELECT * FROM mapped_addresses')
+                writer.unregister('mapped_addresses')
+
+            writer.execute("""
+                CREATE OR REPLACE VIEW tokens_countries AS
+                SELECT DISTINCT t.doc, m.country AS item
+                FROM tokens_affiliations t JOIN address_countries m ON t.item = m.address""")
+            self._countries_built = True
+
+    def _columns(self):
+        return self.columns
+
+    def _n_docs(self):
+        return self.n_docs
+
+    # ------------------------------------------------------------------
+    # Section queries (see the matching BibliometricAnalysis methods)
+    # ------------------------------------------------------------------
+
+    def run_sections(self, sections, workers=1, executor='thread'):
+        unsupported = [section for section in sections if section not in self.SECTIONS]
+        if unsupported:
+            raise ValueError(f"Sections {unsupported} need the in-memory BibliometricAnalysis; "
+                             f"available: {', '.join(self.SECTIONS)}")
+        return super().run_sections(sections, workers, executor)
+
+    def subset(self, *args, **kwargs):
+        raise ValueError("subset() needs the in-memory BibliometricAnalysis; "
+                         "filter out-of-core corpora with query()")
+
+    def _statistics(self):
+        self._connect()
+        select = ['count(*) AS docs', 'min("Year") AS first', 'max("Year") AS last',
+                  'avg("Year") AS mean_year']
+        if 'Source' in self.columns:
+            select.append('count(DISTINCT "Source") AS sources')
+        if 'Citations' in self.columns:
+            select += ['sum("Citations")::BIGINT AS citations', 'avg("Citations") AS mean_citations',
+                       'median("Citations") AS median_citations']
+        corpus = self.query(f"SELECT {', '.join(select)} FROM corpus").iloc[0]
+
+        stats = {}
+        stats['Total Documents'] = int(corpus['docs'])
+        stats['Time Span'] = f"{int(corpus['first'])}-{int(corpus['last'])}"
+        stats['Average Year'] = f"{corpus['mean_year']:.1f}"
+
+        # Authors
+        if 'Authors' in self.columns:
+            authors = self.query(f"SELECT count(DISTINCT item) AS n, count(*) AS pairs "
+                                 f"FROM {self._tokens('authors')}").iloc[0]
+            stats['Total Authors'] = int(authors['n'])
+            stats['Authors per Document'] = int(authors['pairs']) / self.n_docs
+
+        # Sources
+        if 'Source' in self.columns:
+            stats['Total Sources'] = int(corpus['sources'])
+
+        # Keywords
+        if 'Author_Keywords' in self.columns:
+            stats['Total Keywords'] = int(self.query(
+                f"SELECT count(DISTINCT item) AS n FROM {self._tokens('keywords')}").iloc[0, 0])
+
+        # Citations
+        if 'Citations' in self.columns:
+            stats['Total Citations'] = int(corpus['citations'])
+            stats['Average Citations'] = f"{corpus['mean_citations']:.2f}"
+            stats['Median Citations'] = int(corpus['median_citations'])
+
+        return stats
+
+    def _yearly_counts(self):
+        counts = self.query('SELECT "Year", count(*) AS count FROM corpus '
+                            'WHERE "Year" IS NOT NULL GROUP BY "Year" ORDER BY "Year"')
+        return counts.set_index('Year')['count']
+
+    def _top_cited(self, top_n):
+        top_cited = self.query('SELECT doc, "Title", "Authors", "Year", "Source", "Citations" '
+                               'FROM corpus ORDER BY "Citations" DESC, doc LIMIT ?', [top_n])
+        return top_cited.set_index('doc').rename_axis(None)
+
+    def _author_impact(self):
+        return self._impact(f"""
+            SELECT doc, pos, item AS name, 1.0 / count(*) OVER (PARTITION BY doc) AS weight
+            FROM {self._tokens('authors')}""", weighted=True, first_seen=True)
+
+    def _source_impact(self):
+        return self._impact('SELECT doc, "Source" AS name FROM corpus WHERE "Source" IS NOT NULL')
+
+    def _impact(self, pairs, weighted=False, first_seen=False, current_year=None):
+        """
+        impact_table (bibliometric_impact) as one windowed query
+
+        Parameters:
+        -----------
+        pairs : str
+            Query of (doc, name[, pos][, weight]) rows, one per document
+            and entity
+        weighted : bool
+            Add Fractionalized, the sum of weight
+        first_seen : bool
+            Break ties in first-appearance order (doc, then pos) like a
+            TokenTable vocabulary (default: by name, like the Source
+            categories)
+        """
+        # Rounded in numpy below: DuckDB rounds halves away from zero
+        fractionalized = 'sum(weight) AS Fractionalized,' if weighted else ''
+        table = self.query(f"""
+            WITH pairs AS ({pairs}),
+            ranked AS (
+                SELECT p.*, c."Citations" AS cites, c."Year" AS year,
+                       row_number() OVER (PARTITION BY p.name ORDER BY c."Citations" DESC)
+                           AS rank,
+                       sum(c."Citations") OVER (PARTITION BY p.name ORDER BY c."Citations" DESC
+                                                ROWS UNBOUNDED PRECEDING) AS cumulative
+                FROM pairs p JOIN corpus c USING (doc))
+            SELECT name AS Name, count(*) AS Documents, {fractionalized}
+                   sum(cites)::BIGINT AS Citations,
+                   count(*) FILTER (WHERE cites >= rank) AS "h-index",
+                   count(*) FILTER (WHERE cumulative >= rank * rank) AS "g-index",
+                   min(year) AS PY_start
+            FROM ranked GROUP BY name
+            ORDER BY Documents DESC, Citations DESC, {'min([doc, pos])' if first_seen else 'name'}""")
+
+        if weighted:
+            table['Fractionalized'] = table['Fractionalized'].to_numpy(dtype=float).round(2)
+
+        current_year = current_year or pd.Timestamp.now().year
+        first_year = table['PY_start'].astype(float)
+        table.insert(table.columns.get_loc('PY_start'), 'm-index',
+                     np.round(table['h-index'] / (current_year - first_year + 1), 3))
+        table['PY_start'] = pd.array(first_year, dtype='Float64').astype('Int32')
+        return table
+
+    def _keyword_counts(self):
+        counts = self.query(f"""
+            SELECT item, count(*) AS n FROM {self._tokens('keywords')}
+            GROUP BY item ORDER BY n DESC, min([doc, pos])""")
+        return pd.Series(counts['n'].to_numpy(), index=pd.Index(counts['item']))
+
+    def _country_table(self):
+        countries = self._tokens('countries')
+        first_address = (f"trim(split_part({_split_sql('affiliations')}, ';', 1), "
+                         f"{_literal(WHITESPACE)})")
+        table = self.query(f"""
+            WITH per_doc AS (
+                SELECT doc, count(*) AS n FROM {countries} GROUP BY doc),
+            first AS (
+                SELECT c.doc, m.country
+                FROM (SELECT doc, {first_address} AS address FROM corpus
+                      WHERE "Affiliations" IS NOT NULL) c
+                JOIN address_countries m USING (address)),
+            articles AS (
+                SELECT f.country, count(*) AS Articles,
+                       count(*) FILTER (WHERE d.n > 1) AS MCP
+                FROM first f JOIN per_doc d USING (doc) GROUP BY f.country),
+            documents AS (
+                SELECT item AS country, count(*) AS Documents, min(doc) AS first_doc
+                FROM {countries} GROUP BY item)
+            SELECT d.country AS Country, d.Documents,
+                   coalesce(a.Articles, 0) AS Articles,
+                   coalesce(a.Articles, 0) - coalesce(a.MCP, 0) AS SCP,
+                   coalesce(a.MCP, 0) AS MCP
+            FROM documents d LEFT JOIN articles a USING (country)
+            ORDER BY d.Documents DESC, Articles DESC, d.first_doc""")
+        table['MCP_Ratio'] = (table['MCP'] / table['Articles'].where(table['Articles'] > 0)).round(3)
+        return table
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Run Instrumentation for Python Bibliometric Analysis
+
+Author: Mahbub Hassan
+Affiliation: Chulalongkorn University
+
+Purpose: Measure wall time, CPU time, peak RSS and rows processed for each
+stage of a run, optionally with cProfile and tracemalloc, call user hooks
+around stages and write a JSON run report
+Requirements: standard library only
+"""
+
+import os
+import sys
+import json
+import time
+import pstats
+import cProfile
+import platform
+import threading
+import tracemalloc
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def _peak_rss_mb():
+    """Peak resident set size of this process so far, in MB"""
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # kB on Linux, bytes on macOS
+        return peak / 1024 ** 2 if sys.platform == 'darwin' else peak / 1024
+    return None
+
+
+def _reset_peak_rss():
+    """Reset the peak RSS counter (Linux only); False when unsupported"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def _cpu_seconds():
+    """CPU time of this process and its finished child processes"""
+    cpu = time.process_time()
+    if resource is not None:
+        children = resource.getrusage(resource.RUSAGE_CHILDREN)
+        cpu += children.ru_utime + children.ru_stime
+    return cpu
+
+
+class RunProfiler:
+    """
+    Collects one record per stage of an analysis run
+
+    Stages nest (load_data contains parse and tokenize); each record
+    names its parent. Records hold wall_seconds, cpu_seconds,
+    peak_rss_mb (peak during the stage where the OS allows resetting the
+    counter, otherwise peak so far), rows and, when enabled,
+    peak_traced_mb and the path of a cProfile dump.
+
+    Hooks are callables hook(event, record) with event 'before' or
+    'after'; the 'after' record carries the measurements.
+    """
+
+    def __init__(self, profile=False, trace_memory=False, profile_dir=None):
+        """
+        Parameters:
+        -----------
+        profile : bool
+            Run cProfile around top-level stages and dump the statistics
+        trace_memory : bool
+            Record the peak of Python/numpy allocations per stage
+            (tracemalloc; slows pure Python code down)
+        profile_dir : str, optional
+            Directory for .prof dumps (default: the report directory)
+        """
+        self.profile = profile
+        self.trace_memory = trace_memory
+        self.profile_dir = profile_dir
+        self.hooks = []
+        self.records = []
+        self.started = time.strftime('%Y-%m-%dT%H:%M:%S')
+        self._setup()
+
+    def _setup(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # Sent to worker processes with the analysis object
+        state = self.__dict__.copy()
+        del state['_local'], state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._setup()
+
+    def add_hook(self, hook):
+        """Register hook(event, record), called before and after each stage"""
+        self.hooks.append(hook)
+        return hook
+
+    def _stack(self):
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextmanager
+    def stage(self, name, rows=None):
+        """
+        Measure the enclosed block as one stage
+
+        Yields the stage record; set record['rows'] inside the block when
+        the row count is only known at the end.
+        """
+        stack = self._stack()
+        record = {'stage': name, 'parent': stack[-1]['stage'] if stack else None,
+                  'rows': rows}
+        for hook in self.hooks:
+            hook('before', record)
+
+        outermost = not stack
+        profiler = None
+        if self.profile and outermost:
+            profiler = cProfile.Profile()
+
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                record['_started_tracing'] = True
+            if stack:
+                parent = stack[-1]
+                parent['_peak'] = max(parent.get('_peak', 0), tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+
+        if stack:
+            parent = stack[-1]
+            parent['_rss'] = max(parent.get('_rss', 0), _peak_rss_mb() or 0)
+        record['_rss_reset'] = _reset_peak_rss()
+        stack.append(record)
+        with self._lock:
+            self.records.append(record)
+        wall, cpu = time.perf_counter(), _cpu_seconds()
+        if profiler is not None:
+            try:
+                profiler.enable()
+            except ValueError:  # another profiler is already active
+                profiler = None
+        try:
+            yield record
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            record['wall_seconds'] = round(time.perf_counter() - wall, 4)
+            record['cpu_seconds'] = round(_cpu_seconds() - cpu, 4)
+            stack.pop()
+
+            peak_rss = _peak_rss_mb()
+            if peak_rss is not None:
+                peak_rss = max(record.pop('_rss', 0), peak_rss)
+                if stack:
+                    stack[-1]['_rss'] = max(stack[-1].get('_rss', 0), peak_rss)
+                peak_rss = round(peak_rss, 1)
+            record['peak_rss_mb'] = peak_rss
+            if self.trace_memory:
+                peak = max(record.pop('_peak', 0), tracemalloc.get_traced_memory()[1])
+                record['peak_traced_mb'] = round(peak / 1024 ** 2, 1)
+                if stack:
+                    stack[-1]['_peak'] = max(stack[-1].get('_peak', 0), peak)
+                if record.pop('_started_tracing', False):
+                    tracemalloc.stop()
+            if profiler is not None:
+                record['_profile'] = profiler
+
+            rss_reset = record.pop('_rss_reset')
+            if not rss_reset and record['peak_rss_mb'] is not None:
+                record['peak_rss_scope'] = 'process'
+
+            for hook in self.hooks:
+                hook('after', record)
+
+    def report(self):
+        """Run report as a JSON-serializable dict"""
+        stages = [{key: value for key, value in record.items() if not key.startswith('_')}
+                  for record in self.records]
+        top_level = [record for record in stages if record['parent'] is None]
+        return {
+            'started': self.started,
+            'finished': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'argv': sys.argv,
+            'total_wall_seconds': round(sum(r.get('wall_seconds', 0) for r in top_level), 4),
+            'peak_rss_mb': max((r['peak_rss_mb'] for r in stages
+                                if r.get('peak_rss_mb') is not None), default=None),
+            'stages': stages
+        }
+
+    def write_report(self, path):
+        """
+        Write the JSON run report (and one .prof file per profiled stage)
+
+        Returns:
+        --------
+        Path of the report
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        for record in self.records:
+            profiler = record.pop('_profile', None)
+            if profiler is not None:
+                profile_dir = self.profile_dir or directory
+                os.makedirs(profile_dir, exist_ok=True)
+                prof_path = os.path.join(profile_dir, f"profile_{record['stage']}.prof")
+                stats = pstats.Stats(profiler)
+                stats.dump_stats(prof_path)
+                record['profile'] = prof_path
+                record['top_functions'] = [
+                    f"{func[0]}:{func[1]}({func[2]}) {cum:.3f}s"
+                    for func, (_, _, _, cum, _) in sorted(
+                        stats.stats.items(), key=lambda item: -item[1][3])[:10]]
+
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2, default=str)
+        return path
+
+    def summary(self):
+        """Printable table of the top-level stages"""
+        lines = [f"{'Stage':<24}{'Wall s':>10}{'CPU s':>10}{'Peak RSS MB':>14}{'Rows':>12}"]
+        for record in self.records:
+            if record['parent'] is None and 'wall_seconds' in record:
+                rows = record['rows'] if record['rows'] is not None else ''
+                rss = record['peak_rss_mb'] if record['peak_rss_mb'] is not None else ''
+                lines.append(f"{record['stage']:<24}{record['wall_seconds']:>10.3f}"
+                             f"{record['cpu_seconds']:>10.3f}{rss:>14}{rows:>12}")
+        return '\n'.join(lines)
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Cited-Reference Pipeline for Python Bibliometric Analysis
+
+Author: Mahbub Hassan
+Affiliation: Chulalongkorn University
+
+Purpose: Canonicalize cited-reference strings, compute co-citation and
+bibliographic coupling networks (biblioNetwork "co-citation"/"coupling")
+on sparse matrices, and resolve references to corpus records for local
+citations and the historiograph (localCitations/histNetwork)
+Requirements: numpy, pandas, scipy
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from bibliometric_networks import Network, incidence_matrix, normalize_similarity
+
+DOI_PATTERN = r'(10\.\d{4,9}/[^\s,;]+)'
+
+# WoS: "Abbasi M., 2019, TRANSP RES PART D, V67, P123, DOI 10..."
+WOS_REFERENCE = r'^(?P<author>[^,]*),\s*(?P<year>\d{4}),\s*(?P<source>[^,]*)'
+
+# Scopus: "Abbasi, M., Title..., (2019) Transp. Res. Part D, 67, pp. 123-130"
+SCOPUS_REFERENCE = r'\((?P<year>\d{4})\)\s*(?P<source>[^,]*)'
+
+
+def _author_keys(names):
+    """
+    Surname and first initial: "Abbasi M.A.", "Abbasi, MA" and
+    "ABBASI M" all give "abbasi m"
+    """
+    words = (pd.Series(names, dtype=object).str.lower()
+             .str.replace(r'[^a-z\s]', ' ', regex=True).str.split())
+    return (words.str[0] + ' ' + words.str[1].str[0]).fillna(words.str[0])
+
+
+def _doi_keys(dois):
+    return 'doi:' + pd.Series(dois, dtype=object).str.strip().str.lower().str.rstrip('.')
+
+
+def _fallback_keys(author, year, source):
+    """"author|year|source" key, NaN without an author or a year"""
+    source = source.str.lower().str.replace(r'[^a-z0-9]', '', regex=True).fillna('')
+    keys = author + '|' + year + '|' + source
+    return keys.where(year.notna() & (author.str.len() > 0))
+
+
+def reference_parts(references):
+    """
+    DOI key and author|year|source key of each cited-reference string
+
+    Returns:
+    --------
+    (doi, fallback) pd.Series of str aligned with references, NaN where
+    the string has no DOI or cannot be parsed
+    """
+    refs = pd.Series(references, dtype=object).astype(str).astype(object).str.strip()
+
+    doi = _doi_keys(refs.str.extract(DOI_PATTERN, expand=False))
+
+    wos = refs.str.extract(WOS_REFERENCE)
+    scopus = refs.str.extract(SCOPUS_REFERENCE)
+    year = wos['year'].fillna(scopus['year'])
+    source = wos['source'].where(wos['year'].notna(), scopus['source'])
+
+    # Scopus puts the initial after the first comma ("Abbasi, M., Title")
+    first = refs.str.split(',', n=1).str[0].str.strip()
+    initial = refs.str.extract(r'^[^,]*,\s*([A-Za-z])\.', expand=False)
+    single = ~first.str.contains(r'\s', regex=True)
+    first = first.where(~(single & initial.notna()), first + ' ' + initial)
+
+    return doi, _fallback_keys(_author_keys(first), year, source)
+
+
+def reference_keys(references):
+    """
+    Canonical key for each cited-reference string (vectorized)
+
+    References with a DOI are keyed by the lower-cased DOI. Others are
+    keyed by first-author surname and initial, publication year and the
+    source title reduced to letters and digits, so "TRANSP RES PART D"
+    (WoS) and "Transp. Res. Part D" (Scopus) give the same key.
+
+    Parameters:
+    -----------
+    references : pd.Series of str
+        Raw reference strings (usually a vocabulary of distinct strings)
+
+    Returns:
+    --------
+    pd.Series of str aligned with references (NaN when unparseable)
+    """
+    doi, fallback = reference_parts(references)
+    return doi.fillna(fallback)
+
+
+def record_keys(df):
+    """
+    DOI key and author|year|source key of every corpus record, built
+    like the keys of reference_parts
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Corpus with DOI, Authors, Year and Source columns (missing
+        columns give NaN keys)
+    """
+    def column(name):
+        if name in df.columns:
+            return df[name].astype(object).reset_index(drop=True)
+        return pd.Series(np.nan, index=range(len(df)), dtype=object)
+
+    first = column('Authors').str.split(';').str[0].str.strip()
+    year = pd.Series(pd.array(column('Year'), dtype='Int64').astype('string'),
+                     dtype=object).where(column('Year').notna())
+    return _doi_keys(column('DOI')), _fallback_keys(_author_keys(first), year,
+                                                    column('Source'))
+
+
+def _lookup(keys, queries, unique_only=False):
+    """
+    Row of keys matching every query, -1 when absent (hash index join)
+
+    Repeated keys resolve to their first row, or are dropped entirely
+    with unique_only (ambiguous matches).
+    """
+    keys = pd.Series(keys, dtype=object).reset_index(drop=True)
+    repeated = keys.duplicated(keep=False) if unique_only else keys.duplicated()
+    indexed = keys.notna() & ~repeated
+    rows = np.flatnonzero(indexed.to_numpy())
+    position = pd.Index(keys[indexed]).get_indexer(pd.Series(queries, dtype=object))
+    if len(rows) == 0:
+        return np.full(len(position), -1, dtype=np.int64)
+    return np.where(position >= 0, rows[position], -1).astype(np.int64)
+
+
+def resolve_references(references, record_doi, record_fallback):
+    """
+    Corpus row cited by each distinct reference string
+
+    DOIs are matched first; references left unresolved are matched on
+    author|year|source, skipping keys shared by several records. The
+    fallback needs the cited source written like the record's Source
+    (Scopus), so WoS references resolve mostly through their DOI.
+
+    Parameters:
+    -----------
+    references : pd.Index or pd.Series of str
+        Reference vocabulary (e.g. the 'references' TokenTable vocab)
+    record_doi, record_fallback : pd.Series
+        Keys from record_keys
+
+    Returns:
+    --------
+    np.ndarray of int64, -1 for references outside the corpus
+    """
+    doi, fallback = reference_parts(references)
+    target = _lookup(record_doi, doi)
+    unresolved = np.flatnonzero(target < 0)
+    if len(unresolved):
+        target[unresolved] = _lookup(record_fallback, fallback.iloc[unresolved],
+                                     unique_only=True)
+    return target
+
+
+def citation_links(doc, code, targets, n_docs):
+    """
+    Local citations as (citing row, cited row) pairs
+
+    Parameters:
+    -----------
+    doc, code : np.ndarray
+        (citing document, reference) pairs, e.g. the 'references'
+        TokenTable
+    targets : np.ndarray
+        Corpus row per reference code (resolve_references)
+    n_docs : int
+        Number of documents
+
+    Returns:
+    --------
+    (citing, cited) np.ndarray of int64, one pair per citing/cited
+    document, self-citations of a record excluded
+    """
+    cited = targets[code]
+    keep = (cited >= 0) & (cited != doc)
+    pairs = np.unique(doc[keep].astype(np.int64) * n_docs + cited[keep])
+    return pairs // n_docs, pairs % n_docs
+
+
+def historiograph(citing, cited, lcs, years, top_n=30):
+    """
+    Direct citation network of the most locally cited documents
+
+    Parameters:
+    -----------
+    citing, cited : np.ndarray
+        Local citation pairs (citation_links)
+    lcs : np.ndarray
+        Local citation score per document
+    years : np.ndarray
+        Publication year per document
+    top_n : int
+        Documents kept (those with at least one local citation)
+
+    Returns:
+    --------
+    (nodes, edges): node rows sorted by year, then most cited first, and
+    an (m, 2) array of (citing, cited) positions into nodes
+    """
+    candidates = np.flatnonzero(lcs > 0)
+    keep = candidates[np.argsort(-lcs[candidates], kind='stable')[:top_n]]
+    years = np.asarray(years, dtype=float)[keep]
+    nodes = keep[np.lexsort((-lcs[keep], np.nan_to_num(years, nan=np.inf)))]
+
+    position = np.full(len(lcs), -1)
+    position[nodes] = np.arange(len(nodes))
+    mask = (position[citing] >= 0) & (position[cited] >= 0)
+    edges = np.column_stack([position[citing[mask]], position[cited[mask]]])
+    return nodes, edges
+
+
+def thresholded_gram(M, min_weight=1, block_size=10000):
+    """
+    Upper triangle of M @ M.T, thresholded block by block
+
+    Rows are processed in blocks against the remaining rows only, and
+    entries below min_weight are discarded as each block is produced, so
+    the full unthresholded product never exists in memory.
+
+    Returns:
+    --------
+    Symmetric scipy.sparse.csr_matrix with an empty diagonal
+    """
+    M = M.tocsr()
+    n = M.shape[0]
+    rows, cols, data = [], [], []
+
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        block = (M[start:stop] @ M[start:].T).tocoo()
+        # Column offset is `start`; keep strictly upper-triangular entries
+        keep = (block.col > block.row) & (block.data >= min_weight)
+        rows.append(block.row[keep] + start)
+        cols.append(block.col[keep] + start)
+        data.append(block.data[keep])
+
+    rows = np.concatenate(rows) if rows else np.array([], dtype=np.int32)
+    cols = np.concatenate(cols) if cols else np.array([], dtype=np.int32)
+    data = np.concatenate(data) if data else np.array([], dtype=np.int32)
+
+    upper = sparse.csr_matrix((data, (rows, cols)), shape=(n, n))
+    return (upper + upper.T).tocsr()
+
+
+def cocitation_network(doc, code, labels, n_docs, top_n=None, min_citations=2,
+                       min_weight=2, normalize=None, block_size=10000):
+    """
+    Co-citation network: references cited together (D.T @ D)
+
+    Parameters:
+    -----------
+    doc, code : np.ndarray
+        (citing document, canonical reference) pairs
+    labels : pd.Index
+        Reference labels indexed by code
+    n_docs : int
+        Number of citing documents
+    top_n : int, optional
+        Keep only the most cited references
+    min_citations : int
+        Drop references cited fewer times before the product
+    min_weight : int
+        Minimum number of co-citing documents for an edge
+    normalize : str, optional
+        Similarity measure (see bibliometric_networks.NORMALIZATIONS)
+    """
+    D = incidence_matrix(doc, code, n_docs, len(labels))
+    citations = np.asarray(D.sum(axis=0)).ravel()
+
+    keep = np.flatnonzero(citations >= min_citations)
+    if top_n is not None and top_n < len(keep):
+        keep = np.sort(keep[np.argsort(-citations[keep], kind='stable')[:top_n]])
+
+    Dt = D[:, keep].T.tocsr()
+    C = thresholded_gram(Dt, min_weight, block_size)
+    citations = citations[keep]
+    if normalize is not None:
+        C = normalize_similarity(C, citations, normalize)
+
+    return Network(C, pd.Index(labels).take(keep), citations)
+
+
+def coupling_network(doc, code, n_refs, labels, keep=None, min_weight=2,
+                     normalize=None, block_size=10000):
+    """
+    Bibliographic coupling: documents sharing references (D @ D.T)
+
+    Parameters:
+    -----------
+    doc, code : np.ndarray
+        (citing document, canonical reference) pairs
+    n_refs : int
+        Number of distinct canonical references
+    labels : pd.Index
+        Document labels indexed by row position
+    keep : np.ndarray, optional
+        Row positions of the documents to include
+    min_weight : int
+        Minimum number of shared references for an edge
+    normalize : str, optional
+        Similarity measure (see bibliometric_networks.NORMALIZATIONS)
+    """
+    D = incidence_matrix(doc, code, len(labels), n_refs)
+    if keep is not None:
+        D = D[keep]
+        labels = pd.Index(labels).take(keep)
+
+    references = np.asarray(D.sum(axis=1)).ravel()
+    C = thresholded_gram(D, min_weight, block_size)
+    if normalize is not None:
+        C = normalize_similarity(C, references, normalize)
+
+    return Network(C, pd.Index(labels), references)
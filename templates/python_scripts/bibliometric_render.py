@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Headless Figure Rendering for Python Bibliometric Analysis
+
+Author: Mahbub Hassan
+Affiliation: Chulalongkorn University
+
+Purpose: Draw every figure registered by the analyses in one batch, with
+the non-interactive Agg backend, optionally on a process pool
+Requirements: matplotlib (seaborn for the whitegrid style, wordcloud for
+the keyword cloud)
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Defaults formerly set globally by the analysis script
+FIGURE_STYLE = {
+    'figure.figsize': (12, 8),
+    'font.size': 11
+}
+
+
+def _style():
+    """rcParams for every figure: seaborn whitegrid plus FIGURE_STYLE"""
+    try:
+        import seaborn as sns
+        rc = dict(sns.axes_style('whitegrid'))
+    except ImportError:
+        rc = {'axes.grid': True}
+    rc.update(FIGURE_STYLE)
+    return rc
+
+
+# ==============================================================================
+# DRAWING FUNCTIONS (object-oriented matplotlib API, no pyplot state)
+# ==============================================================================
+
+def draw_annual_production(fig, years, counts):
+    """Annual scientific production with linear trend"""
+    import numpy as np
+
+    ax = fig.subplots()
+    ax.plot(years, counts, marker='o', linewidth=2, markersize=8, color='#1f77b4')
+    ax.fill_between(years, counts, alpha=0.3)
+
+    ax.set_title('Annual Scientific Production', fontsize=16, fontweight='bold')
+    ax.set_xlabel('Year', fontsize=12)
+    ax.set_ylabel('Number of Publications', fontsize=12)
+    ax.grid(alpha=0.3)
+
+    # Add trend line
+    if len(years) > 1:
+        p = np.poly1d(np.polyfit(years, counts, 1))
+        ax.plot(years, p(years), "--", color='red', alpha=0.7, label='Trend')
+        ax.legend()
+
+
+def draw_barh(fig, labels, values, title, xlabel, color='steelblue', alpha=1.0):
+    """Horizontal bar chart, largest value on top"""
+    ax = fig.subplots()
+    ax.barh(range(len(values)), list(values)[::-1], color=color, alpha=alpha)
+    ax.set_yticks(range(len(labels)))
+    ax.set_yticklabels(list(labels)[::-1])
+    ax.set_xlabel(xlabel)
+    ax.set_title(title, fontweight='bold')
+    fig.tight_layout()
+
+
+def draw_bradford(fig, cumulative):
+    """Bradford's law: cumulative share of documents by source rank"""
+    ax = fig.subplots()
+    ax.plot(range(1, len(cumulative) + 1), cumulative, marker='o', linewidth=2)
+    ax.axhline(y=33.3, color='r', linestyle='--', alpha=0.7, label='Core (33%)')
+    ax.axhline(y=66.6, color='orange', linestyle='--', alpha=0.7, label='Zone 2 (67%)')
+    ax.set_xlabel('Number of Sources')
+    ax.set_ylabel('Cumulative % of Documents')
+    ax.set_title("Bradford's Law - Source Distribution", fontweight='bold')
+    ax.legend()
+    ax.grid(alpha=0.3)
+    fig.tight_layout()
+
+
+def draw_wordcloud(fig, frequencies):
+    """Keyword word cloud"""
+    from wordcloud import WordCloud
+
+    wordcloud = WordCloud(
+        width=1200, height=600,
+        background_color='white',
+        colormap='viridis',
+        relative_scaling=0.5,
+        min_font_size=10
+    ).generate_from_frequencies(frequencies)
+
+    ax = fig.subplots()
+    ax.imshow(wordcloud, interpolation='bilinear')
+    ax.axis('off')
+    ax.set_title('Keyword Word Cloud', fontsize=16, fontweight='bold', pad=20)
+    fig.tight_layout()
+
+
+def draw_thematic_map(fig, centrality, density, frequency, labels):
+    """Strategic diagram: themes by Callon centrality and density"""
+    import numpy as np
+
+    ax = fig.subplots()
+    frequency = np.asarray(frequency, dtype=float)
+    sizes = 300 + 3000 * frequency / frequency.max() if len(frequency) else []
+    ax.scatter(centrality, density, s=sizes, alpha=0.5, c=range(len(centrality)),
+               cmap='tab20', edgecolors='grey')
+    for x, y, label in zip(centrality, density, labels):
+        ax.annotate(label, (x, y), ha='center', va='center', fontsize=9)
+
+    if len(centrality):
+        ax.axvline(np.median(centrality), color='grey', linestyle='--', alpha=0.7)
+        ax.axhline(np.median(density), color='grey', linestyle='--', alpha=0.7)
+    for (x, y), name in zip([(0.98, 0.98), (0.02, 0.98), (0.02, 0.02), (0.98, 0.02)],
+                            ['Motor themes', 'Niche themes', 'Emerging or\ndeclining themes',
+                             'Basic themes']):
+        ax.text(x, y, name, transform=ax.transAxes, fontsize=12, color='dimgrey',
+                ha='right' if x > 0.5 else 'left', va='top' if y > 0.5 else 'bottom')
+
+    ax.set_xlabel('Relevance degree (Centrality)')
+    ax.set_ylabel('Development degree (Density)')
+    ax.set_title('Thematic Map', fontsize=16, fontweight='bold')
+    fig.tight_layout()
+
+
+def draw_thematic_evolution(fig, periods, nodes, links):
+    """
+    Themes per period as stacked boxes (height ~ frequency) with links
+    whose width follows the inclusion index
+    """
+    from matplotlib.patches import Rectangle
+
+    ax = fig.subplots()
+    column = {period: i for i, period in enumerate(periods)}
+    total, count = {}, {}
+    for period, _, _, frequency in nodes:
+        total[period] = total.get(period, 0) + frequency
+        count[period] = count.get(period, 0) + 1
+
+    position, offset = {}, {}
+    gap = 0.02
+    for period, cluster, label, frequency in nodes:
+        height = (1 - gap * count[period]) * frequency / total[period]
+        bottom = offset.get(period, 0)
+        x = column[period]
+        ax.add_patch(Rectangle((x - 0.08, bottom), 0.16, height, color='steelblue', alpha=0.7))
+        ax.text(x + 0.1, bottom + height / 2, label, va='center', fontsize=8)
+        position[(period, cluster)] = (x, bottom + height / 2)
+        offset[period] = bottom + height + gap
+
+    for from_period, from_cluster, to_period, to_cluster, inclusion in links:
+        (x0, y0), (x1, y1) = position[(from_period, from_cluster)], position[(to_period, to_cluster)]
+        ax.plot([x0 + 0.08, x1 - 0.08], [y0, y1], color='grey', alpha=0.5,
+                linewidth=1 + 8 * inclusion)
+
+    ax.set_xlim(-0.5, len(periods) - 0.2)
+    ax.set_ylim(0, 1)
+    ax.set_xticks(range(len(periods)))
+    ax.set_xticklabels(periods)
+    ax.set_yticks([])
+    ax.grid(False)
+    ax.set_title('Thematic Evolution', fontsize=16, fontweight='bold')
+    fig.tight_layout()
+
+
+def draw_historiograph(fig, years, labels, lcs, edges):
+    """
+    Direct citations between documents placed by year (x) and spread
+    vertically within a year; nodes are numbered like the historiograph
+    table and sized by local citations
+    """
+    ax = fig.subplots()
+    y, seen = [], {}
+    for year in years:
+        seen[year] = seen.get(year, 0) + 1
+        y.append(seen[year])
+
+    for source, target in edges:
+        ax.annotate('', xy=(years[target], y[target]), xytext=(years[source], y[source]),
+                    arrowprops=dict(arrowstyle='->', color='grey', alpha=0.5, shrinkA=6,
+                                    shrinkB=6))
+    ax.scatter(years, y, s=[120 + 20 * c for c in lcs], color='steelblue', alpha=0.8,
+               zorder=3)
+    for node, (x, height, label) in enumerate(zip(years, y, labels), start=1):
+        ax.text(x, height, str(node), ha='center', va='center', color='white',
+                fontsize=7, zorder=4)
+        ax.text(x + 0.1, height + 0.12, label, rotation=20, fontsize=7)
+
+    ax.set_yticks([])
+    ax.set_xlabel('Year')
+    ax.set_title('Historical Direct Citation Network', fontsize=16, fontweight='bold')
+    fig.tight_layout()
+
+
+def draw_topic_prevalence(fig, years, shares):
+    """Stacked share of every abstract topic per publication year"""
+    ax = fig.subplots()
+    ax.stackplot(years, *shares.values(), labels=list(shares), alpha=0.85)
+    ax.set_xlim(min(years), max(years))
+    ax.set_ylim(0, 1)
+    ax.set_xlabel('Year')
+    ax.set_ylabel('Topic Prevalence')
+    ax.set_title('Abstract Topics over Time', fontsize=16, fontweight='bold')
+    ax.legend(loc='upper left', bbox_to_anchor=(1.01, 1), fontsize=9)
+    fig.tight_layout()
+
+
+DRAWERS = {
+    'annual_production': draw_annual_production,
+    'barh': draw_barh,
+    'bradford': draw_bradford,
+    'wordcloud': draw_wordcloud,
+    'thematic_map': draw_thematic_map,
+    'thematic_evolution': draw_thematic_evolution,
+    'topic_prevalence': draw_topic_prevalence,
+    'historiograph': draw_historiograph
+}
+
+
+def render_figure(kind, data, paths, dpi=300, figsize=None):
+    """
+    Draw one figure and save it to every path
+
+    The figure is built with matplotlib.figure.Figure, so it never enters
+    pyplot's registry and is released as soon as it is saved.
+    """
+    import matplotlib
+    from matplotlib.figure import Figure
+
+    with matplotlib.rc_context(_style()):
+        fig = Figure(figsize=figsize)
+        try:
+            DRAWERS[kind](fig, **data)
+            for path in paths:
+                fig.savefig(path, dpi=dpi, bbox_inches='tight')
+        finally:
+            fig.clear()
+    return paths
+
+
+class FigureRenderer:
+    """
+    Render a batch of figure specifications to files
+
+    A specification is (kind, data, figsize) where kind is a key of
+    DRAWERS and data holds the plotted values as plain Python/pandas
+    objects, so specifications can be sent to worker processes.
+    """
+
+    def __init__(self, output_dir='.', formats=('png',), dpi=300, workers=None,
+                 prefix='output_'):
+        """
+        Parameters:
+        -----------
+        output_dir : str
+            Directory for figure files (created if missing)
+        formats : tuple of str
+            File formats, e.g. ('png', 'pdf', 'svg')
+        dpi : int
+            Resolution for raster formats
+        workers : int, optional
+            Rendering processes (None uses all CPUs, 1 renders inline)
+        prefix : str
+            File name prefix
+        """
+        self.output_dir = output_dir
+        self.formats = tuple(formats)
+        self.dpi = dpi
+        self.workers = workers or os.cpu_count() or 1
+        self.prefix = prefix
+
+    def render(self, figures):
+        """
+        Render {name: (kind, data, figsize)} and return the written paths
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        jobs = []
+        for name, (kind, data, figsize) in figures.items():
+            paths = [os.path.join(self.output_dir, f'{self.prefix}{name}.{fmt}')
+                     for fmt in self.formats]
+            jobs.append((kind, data, paths, self.dpi, figsize))
+
+        written = []
+        if self.workers == 1 or len(jobs) <= 1:
+            for job in jobs:
+                written.extend(render_figure(*job))
+        else:
+            with ProcessPoolExecutor(min(self.workers, len(jobs))) as pool:
+                for paths in pool.map(render_figure, *zip(*jobs)):
+                    written.extend(paths)
+
+        for path in written:
+            print(f"✓ Saved: {path}")
+        return written
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Parallel Analysis Scheduler for Python Bibliometric Analysis
+
+Author: Mahbub Hassan
+Affiliation: Chulalongkorn University
+
+Purpose: Run independent analysis sections concurrently on a thread or
+process pool, respecting declared dependencies between them
+Requirements: standard library only
+"""
+
+import io
+import os
+import sys
+import threading
+from contextlib import contextmanager, redirect_stdout
+from concurrent.futures import (ThreadPoolExecutor, ProcessPoolExecutor,
+                                FIRST_COMPLETED, wait)
+
+
+class Task:
+    """
+    One node of the analysis graph: a method call on the analysis object
+
+    Parameters:
+    -----------
+    name : str
+        Unique task name
+    method : str
+        Name of the BibliometricAnalysis method to call
+    kwargs : dict, optional
+        Keyword arguments for the method
+    deps : list of str
+        Names of tasks that must finish first (unknown names are ignored,
+        e.g. tasks skipped for missing data)
+    local : bool
+        The method prepares shared state on the analysis object (e.g. token
+        tables) and must run in the parent process
+    """
+
+    def __init__(self, name, method, kwargs=None, deps=(), local=False):
+        self.name = name
+        self.method = method
+        self.kwargs = kwargs or {}
+        self.deps = list(deps)
+        self.local = local
+
+    def __repr__(self):
+        return f"Task({self.name!r}, deps={self.deps})"
+
+
+def _run_graph(tasks, pool, run_one):
+    """
+    Submit tasks as soon as their dependencies have finished
+
+    Yields (task, result) in completion order; the first failing task
+    re-raises its exception.
+    """
+    names = {task.name for task in tasks}
+    pending = {task.name: task for task in tasks}
+    done = set()
+    futures = {}
+
+    while pending or futures:
+        for name, task in list(pending.items()):
+            if all(dep in done or dep not in names for dep in task.deps):
+                futures[pool.submit(run_one, task)] = task
+                del pending[name]
+
+        if not futures:
+            raise RuntimeError(f"Dependency cycle between tasks: {sorted(pending)}")
+
+        finished, _ = wait(futures, return_when=FIRST_COMPLETED)
+        for future in finished:
+            task = futures.pop(future)
+            yield task, future.result()
+            done.add(task.name)
+
+
+# ------------------------------------------------------------------------------
+# Per-task output
+# ------------------------------------------------------------------------------
+
+class ThreadOutput(io.TextIOBase):
+    """
+    sys.stdout stand-in that sends each thread's writes to the buffer of
+    the task it is running (other threads write through to the stream)
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    def _target(self):
+        buffer = getattr(self.local, 'buffer', None)
+        return self.stream if buffer is None else buffer
+
+    def write(self, text):
+        return self._target().write(text)
+
+    def flush(self):
+        self._target().flush()
+
+    @contextmanager
+    def task(self):
+        """Buffer the current thread's output; yields the buffer"""
+        previous = getattr(self.local, 'buffer', None)
+        self.local.buffer = io.StringIO()
+        try:
+            yield self.local.buffer
+        finally:
+            self.local.buffer = previous
+
+
+_INSTALL_LOCK = threading.Lock()
+
+
+@contextmanager
+def capture_output():
+    """
+    Capture what the current thread prints; yields an io.StringIO
+
+    Unlike contextlib.redirect_stdout, output of other threads is not
+    captured (for request handlers and other concurrent callers). The
+    first call replaces sys.stdout with a ThreadOutput for good.
+    """
+    with _INSTALL_LOCK:
+        if not isinstance(sys.stdout, ThreadOutput):
+            sys.stdout = ThreadOutput(sys.stdout)
+        output = sys.stdout
+    with output.task() as buffer:
+        yield buffer
+
+
+class _OrderedOutput:
+    """Print task outputs in task order as soon as all earlier ones are done"""
+
+    def __init__(self, tasks):
+        self.order = [task.name for task in tasks]
+        self.outputs = {}
+        self.next = 0
+
+    def add(self, name, text):
+        self.outputs[name] = text
+        while self.next < len(self.order) and self.order[self.next] in self.outputs:
+            print(self.outputs.pop(self.order[self.next]), end='')
+            self.next += 1
+
+
+# ------------------------------------------------------------------------------
+# Process pool workers
+# ------------------------------------------------------------------------------
+
+_WORKER_ANALYSIS = None
+
+# Dict attributes of the analysis that sections write into
+SHARED_ATTRIBUTES = ('results', 'figures')
+
+
+def _init_worker(analysis):
+    """Keep one copy of the analysis per worker process"""
+    global _WORKER_ANALYSIS
+    _WORKER_ANALYSIS = analysis
+
+
+def _run_in_worker(method, kwargs):
+    """Run one section in a worker; return its printed output and new entries"""
+    analysis = _WORKER_ANALYSIS
+    before = {attr: dict(getattr(analysis, attr)) for attr in SHARED_ATTRIBUTES}
+    output = io.StringIO()
+    with redirect_stdout(output):
+        getattr(analysis, method)(**kwargs)
+
+    updates = {}
+    for attr in SHARED_ATTRIBUTES:
+        updates[attr] = {key: value for key, value in getattr(analysis, attr).items()
+                         if before[attr].get(key) is not value}
+    return output.getvalue(), updates
+
+
+# ------------------------------------------------------------------------------
+# Scheduler
+# ------------------------------------------------------------------------------
+
+class AnalysisScheduler:
+    """
+    Run a task graph against one BibliometricAnalysis object
+
+    With executor='thread' all tasks share the analysis object and write
+    into analysis.results directly. With executor='process' local tasks
+    run first in the parent, then every worker receives a copy of the
+    prepared analysis; results and registered figures are sent back and
+    merged in completion order.
+
+    Either way the output printed by each task is buffered and printed
+    in task order, so the report reads as in a serial run.
+    """
+
+    def __init__(self, analysis, max_workers=None, executor='thread'):
+        """
+        Parameters:
+        -----------
+        analysis : BibliometricAnalysis
+            Object with data loaded
+        max_workers : int, optional
+            Pool size (defaults to the number of CPUs)
+        executor : str
+            'thread' or 'process'
+        """
+        if executor not in ('thread', 'process'):
+            raise ValueError("executor must be 'thread' or 'process'")
+
+        self.analysis = analysis
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.executor = executor
+
+    def _run_local(self, task):
+        return getattr(self.analysis, task.method)(**task.kwargs)
+
+    def run(self, tasks):
+        """
+        Execute tasks and return analysis.results
+
+        Parameters:
+        -----------
+        tasks : list of Task
+        """
+        printer = _OrderedOutput(tasks)
+
+        if self.executor == 'thread':
+            output = ThreadOutput(sys.stdout)
+
+            def run_captured(task):
+                with output.task() as buffer:
+                    self._run_local(task)
+                return buffer.getvalue()
+
+            # The scheduling thread has no buffer, so its prints pass through
+            previous, sys.stdout = sys.stdout, output
+            try:
+                with ThreadPoolExecutor(self.max_workers) as pool:
+                    for task, text in _run_graph(tasks, pool, run_captured):
+                        printer.add(task.name, text)
+            finally:
+                sys.stdout = previous
+            return self.analysis.results
+
+        local = [task for task in tasks if task.local]
+        remote = [task for task in tasks if not task.local]
+
+        with ThreadPoolExecutor(self.max_workers) as pool:
+            for task, _ in _run_graph(local, pool, self._run_local):
+                printer.add(task.name, '')
+
+        if remote:
+            workers = min(self.max_workers, len(remote))
+            with ProcessPoolExecutor(workers, initializer=_init_worker,
+                                     initargs=(self.analysis,)) as pool:
+                run_one = lambda task: pool.submit(_run_in_worker, task.method,
+                                                   task.kwargs).result()
+                # Dispatch from threads so the process pool stays saturated
+                with ThreadPoolExecutor(workers) as dispatch:
+                    for task, (output, updates) in _run_graph(remote, dispatch, run_one):
+                        printer.add(task.name, output)
+                        for attr, entries in updates.items():
+                            getattr(self.analysis, attr).update(entries)
+
+        return self.analysis.results
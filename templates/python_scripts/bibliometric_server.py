@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+Analysis Server for Python Bibliometric Analysis
+
+Author: Mahbub Hassan
+Affiliation: Chulalongkorn University
+
+Purpose: Keep named corpora loaded in one long-running process and serve
+every analysis section as a JSON endpoint, with an LRU cache of encoded
+responses keyed by corpus version and parameters
+Requirements: standard library (plus the analysis requirements)
+
+Usage:
+    python bibliometric_server.py --corpus wos=data/savedrecs.txt \\
+        --corpus scopus=data/scopus.csv:scopus --port 8050
+
+    GET  /corpora                                   loaded corpora
+    GET  /corpora/wos/top_authors?top_n=20          one section
+    GET  /corpora/wos/top_sources?year_from=2018&year_to=2024
+    POST /corpora/wos/reload                        re-read the input
+    GET  /cache                                     cache statistics
+"""
+
+import ast
+import json
+import inspect
+import argparse
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+import numpy as np
+
+from bibliometric_analysis_python import (BibliometricAnalysis, SECTION_COLUMNS,
+                                          SECTION_TASKS)
+from bibliometric_export import is_network, result_table
+from bibliometric_scheduler import capture_output
+
+# Query parameters handled by the server rather than passed to a section
+YEAR_FILTERS = ('year_from', 'year_to')
+
+
+class LRUCache:
+    """Thread-safe mapping that evicts the least recently used entry"""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            if key not in self.entries:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return self.entries[key]
+
+    def peek(self, key):
+        """Value without counting a hit or miss or refreshing recency"""
+        with self.lock:
+            return self.entries.get(key)
+
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def discard(self, predicate):
+        """Drop every entry whose key matches predicate"""
+        with self.lock:
+            for key in [key for key in self.entries if predicate(key)]:
+                del self.entries[key]
+
+    def stats(self):
+        with self.lock:
+            return {'entries': len(self.entries), 'max_entries': self.max_entries,
+                    'hits': self.hits, 'misses': self.misses}
+
+
+def _json_value(value):
+    """A result as JSON-ready records (None when it is not tabular)"""
+    if is_network(value):
+        return {'nodes': _json_value(value.nodes()), 'edges': _json_value(value.edges())}
+    table = result_table('', value)
+    if table is None:
+        return None
+    # to_json maps NaN to null and numpy scalars to plain numbers
+    return json.loads(table.to_json(orient='records', date_format='iso'))
+
+
+def _parse_value(text):
+    """Query string value as a Python literal when possible ('20' -> 20)"""
+    try:
+        return ast.literal_eval(text)
+    except (ValueError, SyntaxError):
+        return text
+
+
+class AnalysisServer:
+    """
+    Named corpora, their versions and the response cache
+
+    Sections run one at a time (analyses mutate their instance), while
+    cached responses are served concurrently without taking that lock.
+    Output printed by a load or section is captured for the calling
+    thread only, so other threads' log lines are never swallowed.
+    """
+
+    def __init__(self, cache_size=256, view_cache_size=8):
+        """
+        Parameters:
+        -----------
+        cache_size : int
+            Encoded responses kept in the LRU cache
+        view_cache_size : int
+            Year-filtered corpora kept loaded
+        """
+        self.corpora = {}
+        self.specs = {}
+        self.versions = {}
+        self.cache = LRUCache(cache_size)
+        self.views = LRUCache(view_cache_size)
+        self.compute_lock = threading.Lock()
+
+    def load(self, name, data_path, data_type='wos', **options):
+        """
+        Load (or reload) a corpus under name and bump its version
+
+        options (chunk_size, csv_engine, use_cache, ...) are passed to
+        BibliometricAnalysis and kept for reload.
+        """
+        with capture_output():
+            analysis = BibliometricAnalysis(data_path, data_type, **options).load_data()
+        with self.compute_lock:
+            self.corpora[name] = analysis
+            self.specs[name] = (data_path, data_type, dict(options))
+            self.versions[name] = self.versions.get(name, 0) + 1
+        self.cache.discard(lambda key: key[0] == name)
+        self.views.discard(lambda key: key[0] == name)
+        print(f"✓ Corpus '{name}': {len(analysis.df)} records (version {self.versions[name]})")
+        return analysis
+
+    def reload(self, name):
+        """Re-read a corpus with the options it was loaded with"""
+        data_path, data_type, options = self.specs[name]
+        return self.load(name, data_path, data_type, **options)
+
+    def describe(self):
+        return [{'name': name, 'data_type': analysis.data_type,
+                 'documents': len(analysis.df), 'version': self.versions[name],
+                 'columns': list(analysis.df.columns)}
+                for name, analysis in self.corpora.items()]
+
+    def _view(self, name, year_from, year_to):
+        """The corpus restricted to a year range (BibliometricAnalysis.subset)"""
+        analysis = self.corpora[name]
+        if year_from is None and year_to is None:
+            return analysis
+
+        key = (name, self.versions[name], year_from, year_to)
+        view = self.views.get(key)
+        if view is None:
+            with capture_output():
+                view = analysis.subset(years=(year_from, year_to))
+            self.views.put(key, view)
+        return view
+
+    def section(self, name, section, params):
+        """
+        Encoded JSON response of one section, from the cache when possible
+
+        Parameters:
+        -----------
+        name : str
+            Corpus name
+        section : str
+            Key of SECTION_TASKS
+        params : dict
+            Query parameters: year_from/year_to plus keyword arguments of
+            the section's method (e.g. top_n)
+        """
+        if name not in self.corpora:
+            raise KeyError(f"Unknown corpus '{name}'")
+        if section not in SECTION_TASKS:
+            raise KeyError(f"Unknown section '{section}'. "
+                           f"Choose from: {', '.join(SECTION_TASKS)}")
+
+        method_name, kwargs, _ = SECTION_TASKS[section]
+        signature = inspect.signature(getattr(BibliometricAnalysis, method_name))
+        arguments = {key: value for key, value in params.items() if key not in YEAR_FILTERS}
+        unknown = [key for key in arguments if key not in signature.parameters]
+        if unknown:
+            raise ValueError(f"Unknown parameters for {section}: {', '.join(unknown)}")
+        year_from, year_to = params.get('year_from'), params.get('year_to')
+        if (year_from is not None or year_to is not None) and \
+                'Year' not in self.corpora[name].df.columns:
+            raise ValueError("Year filters need a corpus with Year data")
+
+        key = (name, self.versions[name], section, year_from, year_to,
+               tuple(sorted(arguments.items(), key=lambda item: item[0])))
+        response = self.cache.get(key)
+        if response is not None:
+            return response
+
+        with self.compute_lock:
+            # Another request may have filled the cache while we waited
+            response = self.cache.peek(key)
+            if response is not None:
+                return response
+
+            analysis = self._view(name, year_from, year_to)
+            missing = [c for c in SECTION_COLUMNS[section] if c not in analysis.df.columns]
+            if missing:
+                raise ValueError(f"Section '{section}' needs columns: {', '.join(missing)}")
+
+            before = dict(analysis.results)
+            with capture_output():
+                getattr(analysis, method_name)(**{**kwargs, **arguments})
+            produced = {result: value for result, value in analysis.results.items()
+                        if before.get(result) is not value}
+
+        body = {
+            'corpus': name,
+            'version': key[1],
+            'section': section,
+            'documents': len(analysis.df),
+            'params': dict(params),
+            'results': {result: _json_value(value) for result, value in produced.items()}
+        }
+        response = json.dumps(body, default=_json_default).encode('utf-8')
+        self.cache.put(key, response)
+        return response
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+class AnalysisRequestHandler(BaseHTTPRequestHandler):
+    """JSON endpoints over an AnalysisServer (set as the class attribute app)"""
+
+    app = None
+
+    def _send(self, status, body):
+        if not isinstance(body, bytes):
+            body = json.dumps(body, default=_json_default).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _route(self):
+        url = urlsplit(self.path)
+        parts = [part for part in url.path.split('/') if part]
+        params = {key: _parse_value(value) for key, value in parse_qsl(url.query)}
+        return parts, params
+
+    def do_GET(self):
+        parts, params = self._route()
+        try:
+            if parts == ['corpora']:
+                self._send(200, self.app.describe())
+            elif parts == ['cache']:
+                self._send(200, self.app.cache.stats())
+            elif len(parts) == 3 and parts[0] == 'corpora':
+                self._send(200, self.app.section(parts[1], parts[2], params))
+            else:
+                self._send(404, {'error': f'No endpoint {self.path}'})
+        except KeyError as e:
+            self._send(404, {'error': str(e.args[0])})
+        except (ValueError, TypeError) as e:
+            self._send(400, {'error': str(e)})
+        except Exception as e:
+            self._send(500, {'error': f'{type(e).__name__}: {e}'})
+
+    def do_POST(self):
+        parts, _ = self._route()
+        if len(parts) == 3 and parts[0] == 'corpora' and parts[2] == 'reload':
+            if parts[1] not in self.app.corpora:
+                self._send(404, {'error': f"Unknown corpus '{parts[1]}'"})
+                return
+            try:
+                self.app.reload(parts[1])
+            except Exception as e:
+                self._send(500, {'error': f'{type(e).__name__}: {e}'})
+                return
+            self._send(200, {'corpus': parts[1], 'version': self.app.versions[parts[1]]})
+        else:
+            self._send(404, {'error': f'No endpoint {self.path}'})
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(corpora, host='127.0.0.1', port=8050, cache_size=256):
+    """
+    Load corpora and serve them until interrupted
+
+    Parameters:
+    -----------
+    corpora : dict
+        Corpus name -> (data_path, data_type)
+    host, port : str, int
+        Listening address
+    cache_size : int
+        Encoded responses kept in the LRU cache
+    """
+    app = AnalysisServer(cache_size)
+    for name, (data_path, data_type) in corpora.items():
+        app.load(name, data_path, data_type)
+
+    handler = type('Handler', (AnalysisRequestHandler,), {'app': app})
+    server = ThreadingHTTPServer((host, port), handler)
+    print(f"✓ Serving {len(corpora)} corpora on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def _corpus_spec(text):
+    """'name=path[:type]' -> (name, (path, type))"""
+    name, sep, spec = text.partition('=')
+    if not sep:
+        raise argparse.ArgumentTypeError("use --corpus name=path[:type]")
+    path, _, data_type = spec.rpartition(':')
+    if data_type not in ('wos', 'scopus') or not path:
+        path, data_type = spec, 'wos'
+    return name, (path, data_type)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve bibliometric analyses over HTTP')
+    parser.add_argument('--corpus', type=_corpus_spec, action='append', required=True,
+                        help='name=path[:wos|scopus], repeatable')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8050)
+    parser.add_argument('--cache-size', type=int, default=256,
+                        help='responses kept in the LRU cache')
+    args = parser.parse_args()
+    serve(dict(args.corpus), args.host, args.port, args.cache_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Synthetic Corpus Generator for Python Bibliometric Analysis
+
+Author: Mahbub Hassan
+Affiliation: Chulalongkorn University
+
+Purpose: Write WoS plain text and Scopus CSV exports of any size (1k to
+1M+ records) with Zipfian author, keyword, source and cited-reference
+distributions, for benchmarking the analysis pipeline
+Requirements: numpy, pandas
+
+Usage:
+    python bibliometric_synthetic.py 100000 --format both --output data/
+"""
+
+import os
+import argparse
+import numpy as np
+import pandas as pd
+
+from bibliometric_affiliations import COUNTRY_GAZETTEER
+
+SYLLABLES = ['ka', 'lo', 'mi', 'ran', 'su', 'to', 'vel', 'an', 'ber', 'chi',
+             'den', 'fa', 'gu', 'hol', 'ir', 'jo', 'kes', 'lin', 'mor', 'nu',
+             'ost', 'pe', 'qui', 'ros', 'sta', 'tri', 'ul', 'vin', 'wa', 'zen']
+
+WORDS = ['transport', 'urban', 'mobility', 'electric', 'vehicle', 'network',
+         'traffic', 'model', 'policy', 'emission', 'public', 'transit', 'demand',
+         'freight', 'logistics', 'safety', 'autonomous', 'sharing', 'bicycle',
+         'rail', 'energy', 'accessibility', 'equity', 'land', 'use', 'travel',
+         'behaviour', 'choice', 'data', 'learning', 'optimization', 'simulation',
+         'infrastructure', 'resilience', 'climate', 'carbon', 'charging',
+         'parking', 'pricing', 'congestion', 'walking', 'commuting', 'smart',
+         'city', 'planning', 'survey', 'evaluation', 'forecasting', 'routing',
+         'scheduling', 'micromobility', 'ride', 'hailing', 'automation',
+         'governance', 'health', 'air', 'quality', 'noise', 'maritime', 'port',
+         'aviation', 'airport', 'supply', 'chain', 'decarbonization', 'battery']
+
+SOURCE_WORDS = ['Transportation', 'Research', 'Journal', 'Urban', 'Mobility',
+                'Transport', 'Policy', 'Science', 'Engineering', 'Planning',
+                'Systems', 'Review', 'Sustainable', 'Energy', 'Cities',
+                'Logistics', 'Traffic', 'Letters', 'International', 'Applied']
+
+# Records generated from one random stream; exports overlapping the same
+# record indices get identical records
+BLOCK_SIZE = 1000
+
+COUNTRIES = [line.split('|')[0] for line in COUNTRY_GAZETTEER.strip().splitlines()]
+
+
+def zipf_sampler(size, exponent, rng):
+    """Draw function for codes 0..size-1 with P(k) ~ 1 / (k + 1) ** exponent"""
+    weights = 1.0 / np.arange(1, size + 1) ** exponent
+    cdf = np.cumsum(weights / weights.sum())
+    return lambda n: np.minimum(np.searchsorted(cdf, rng.random(n)), size - 1)
+
+
+def _names(count, rng, parts=(2, 4)):
+    """count pseudo-words built from syllables"""
+    lengths = rng.integers(parts[0], parts[1], count)
+    picks = rng.integers(0, len(SYLLABLES), (count, parts[1]))
+    return [''.join(SYLLABLES[s] for s in row[:k]).capitalize()
+            for row, k in zip(picks, lengths)]
+
+
+def _ragged(counts, draw):
+    """Draw sum(counts) codes and split them into one list per record"""
+    return np.split(draw(int(counts.sum())), np.cumsum(counts)[:-1])
+
+
+class SyntheticCorpus:
+    """
+    Deterministic synthetic corpus
+
+    Vocabularies (authors, keywords, sources, institutions, the pool of
+    citable references) are built once; record i is always generated the
+    same way from (seed, i), so a WoS and a Scopus export can share
+    records to exercise deduplication.
+    """
+
+    def __init__(self, n_records, seed=42, mean_authors=3.5, mean_keywords=5,
+                 mean_references=40, abstract_words=80):
+        """
+        Parameters:
+        -----------
+        n_records : int
+            Number of records the vocabularies are sized for
+        seed : int
+            Random seed
+        mean_authors, mean_keywords, mean_references : float
+            Mean list lengths per record
+        abstract_words : int
+            Abstract length in words
+        """
+        self.n_records = n_records
+        self.seed = seed
+        self.mean_authors = mean_authors
+        self.mean_keywords = mean_keywords
+        self.mean_references = mean_references
+        self.abstract_words = abstract_words
+
+        rng = np.random.default_rng(seed)
+        n_authors = max(500, int(n_records * 1.2))
+        surnames = _names(n_authors, rng)
+        initials = rng.integers(0, 26, n_authors)
+        self.authors = [f"{name}, {chr(65 + i)}" for name, i in zip(surnames, initials)]
+
+        n_keywords = max(300, 2000 + n_records // 20)
+        words = rng.integers(0, len(WORDS), (n_keywords, 3))
+        lengths = rng.integers(1, 4, n_keywords)
+        self.keywords = list(dict.fromkeys(
+            ' '.join(WORDS[w] for w in row[:k]) for row, k in zip(words, lengths)))
+
+        n_sources = max(50, 200 + n_records // 500)
+        words = rng.integers(0, len(SOURCE_WORDS), (n_sources, 4))
+        self.sources = [' '.join(SOURCE_WORDS[w] for w in row) + f' {i}'
+                        for i, row in enumerate(words)]
+
+        n_institutions = max(100, n_records // 50)
+        self.institutions = [f"Univ {name}" for name in _names(n_institutions, rng)]
+        # Countries ranked at random, then drawn with Zipfian productivity
+        country_rank = rng.permutation(len(COUNTRIES))
+        self.institution_country = country_rank[
+            zipf_sampler(len(COUNTRIES), 1.0, rng)(n_institutions)]
+        self.cities = _names(n_institutions, rng, parts=(2, 3))
+
+        # Citable references: corpus-independent works cited with Zipfian
+        # popularity, ~80% with a DOI
+        n_refs = max(1000, n_records * 2)
+        self.ref_author = rng.integers(0, n_authors, n_refs)
+        self.ref_year = rng.integers(1960, 2025, n_refs)
+        self.ref_source = rng.integers(0, n_sources, n_refs)
+        self.ref_volume = rng.integers(1, 200, n_refs)
+        self.ref_page = rng.integers(1, 9999, n_refs)
+        self.ref_doi = rng.random(n_refs) < 0.8
+
+        self.n_authors = n_authors
+        self.n_refs = n_refs
+
+    def chunk(self, start, stop):
+        """
+        Records start..stop-1 as a dict of column -> list
+
+        Columns are canonical (Title, Year, ...) plus raw lists
+        (author_list, keyword_list, institution and reference codes) that
+        the writers format per database.
+        """
+        first, last = start // BLOCK_SIZE, -(-stop // BLOCK_SIZE)
+        blocks = [self._block(b) for b in range(first, last)]
+        offset = start - first * BLOCK_SIZE
+        chunk = {}
+        for col in blocks[0]:
+            if isinstance(blocks[0][col], np.ndarray):
+                values = np.concatenate([block[col] for block in blocks])
+            else:
+                values = [value for block in blocks for value in block[col]]
+            chunk[col] = values[offset:offset + stop - start]
+        return chunk
+
+    def _block(self, block):
+        """Records of one fixed block, seeded by its number"""
+        rng = np.random.default_rng([self.seed, block])
+        start = block * BLOCK_SIZE
+        n = BLOCK_SIZE
+        draw_author = zipf_sampler(self.n_authors, 0.9, rng)
+        draw_keyword = zipf_sampler(len(self.keywords), 1.1, rng)
+        draw_source = zipf_sampler(len(self.sources), 1.2, rng)
+        draw_institution = zipf_sampler(len(self.institutions), 1.0, rng)
+        draw_reference = zipf_sampler(self.n_refs, 1.0, rng)
+
+        # Exponential growth of production towards recent years
+        years = np.clip(2024 - rng.exponential(8, n).astype(int), 1990, 2024)
+        age = 2025 - years
+        citations = np.floor(rng.lognormal(0.5, 1.2, n) * np.sqrt(age)).astype(int)
+
+        n_authors = np.maximum(1, rng.poisson(self.mean_authors - 1, n) + 1)
+        n_keywords = np.maximum(1, rng.poisson(self.mean_keywords, n))
+        n_references = np.maximum(0, rng.poisson(self.mean_references, n))
+
+        title_len = rng.integers(6, 15, n)
+        title_words = rng.integers(0, len(WORDS), (n, 15))
+        abstract_words = rng.integers(0, len(WORDS), (n, self.abstract_words))
+
+        return {
+            'index': np.arange(start, start + n),
+            'Year': years,
+            'Citations': citations,
+            'Source': [self.sources[s] for s in draw_source(n)],
+            'Title': [' '.join(WORDS[w] for w in row[:k]).capitalize()
+                      for row, k in zip(title_words, title_len)],
+            'Abstract': [' '.join(WORDS[w] for w in row) + '.' for row in abstract_words],
+            'author_list': [[self.authors[a] for a in dict.fromkeys(codes)]
+                            for codes in _ragged(n_authors, draw_author)],
+            'keyword_list': [[self.keywords[k] for k in dict.fromkeys(codes)]
+                             for codes in _ragged(n_keywords, draw_keyword)],
+            'plus_list': [[self.keywords[k].upper() for k in dict.fromkeys(codes)]
+                          for codes in _ragged(n_keywords, draw_keyword)],
+            'institution_list': _ragged(n_authors, draw_institution),
+            'reference_list': [list(dict.fromkeys(codes))
+                               for codes in _ragged(n_references, draw_reference)]
+        }
+
+    def _address(self, institution):
+        country = COUNTRIES[self.institution_country[institution]]
+        return f"{self.institutions[institution]}, Dept Transport, {self.cities[institution]}, {country}"
+
+    def _reference(self, ref, scopus=False):
+        author = self.authors[self.ref_author[ref]]
+        source = self.sources[self.ref_source[ref]]
+        year, volume, page = self.ref_year[ref], self.ref_volume[ref], self.ref_page[ref]
+        if scopus:
+            text = f"{author}., {source} study, ({year}) {source}, {volume}, pp. {page}-{page + 12}"
+        else:
+            surname, initial = author.split(', ')
+            text = f"{surname} {initial}., {year}, {source.upper()}, V{volume}, P{page}"
+            if self.ref_doi[ref]:
+                text += f", DOI 10.{1000 + ref % 9000}/ref.{ref}"
+        return text
+
+    def wos_records(self, chunk):
+        """WoS plain text of one chunk"""
+        lines = []
+        for i in range(len(chunk['index'])):
+            idx = chunk['index'][i]
+            authors = chunk['author_list'][i]
+            addresses = [f"[{author}] {self._address(inst)}."
+                         for author, inst in zip(authors, chunk['institution_list'][i])]
+            refs = [self._reference(r) for r in chunk['reference_list'][i]]
+
+            lines.append('PT J')
+            lines.append('AU ' + '\n   '.join(authors))
+            lines.append('TI ' + chunk['Title'][i])
+            lines.append('SO ' + chunk['Source'][i].upper())
+            lines.append('DT Article')
+            lines.append('DE ' + '; '.join(chunk['keyword_list'][i]))
+            lines.append('ID ' + '; '.join(chunk['plus_list'][i]))
+            lines.append('AB ' + chunk['Abstract'][i])
+            lines.append('C1 ' + '\n   '.join(addresses))
+            if refs:
+                lines.append('CR ' + '\n   '.join(refs))
+            lines.append(f'NR {len(refs)}')
+            lines.append(f"TC {chunk['Citations'][i]}")
+            lines.append(f"PY {chunk['Year'][i]}")
+            lines.append(f'DI 10.9999/synth.{idx}')
+            lines.append(f'UT WOS:{idx:015d}')
+            lines.append('ER\n')
+        return '\n'.join(lines) + '\n'
+
+    def scopus_frame(self, chunk):
+        """Scopus CSV columns of one chunk"""
+        authors = [', '.join(a + '.' for a in names)
+                   for names in chunk['author_list']]
+        return pd.DataFrame({
+            'Authors': authors,
+            'Title': chunk['Title'],
+            'Year': chunk['Year'],
+            'Source title': chunk['Source'],
+            'Cited by': chunk['Citations'],
+            'DOI': [f'10.9999/synth.{idx}' for idx in chunk['index']],
+            'Abstract': chunk['Abstract'],
+            'Author Keywords': ['; '.join(k) for k in chunk['keyword_list']],
+            'Index Keywords': ['; '.join(k) for k in chunk['plus_list']],
+            'References': ['; '.join(self._reference(r, scopus=True) for r in refs)
+                           for refs in chunk['reference_list']],
+            'Affiliations': ['; '.join(self._address(inst) for inst in insts)
+                             for insts in chunk['institution_list']],
+            'Document Type': 'Article',
+            'Source': 'Scopus',
+            'EID': [f'2-s2.0-{idx:011d}' for idx in chunk['index']]
+        })
+
+    def write_wos(self, path, start=0, stop=None, chunk_size=10000):
+        """Write records start..stop-1 as a WoS plain text export"""
+        stop = self.n_records if stop is None else stop
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('FN Clarivate Analytics Web of Science\nVR 1.0\n')
+            for first in range(start, stop, chunk_size):
+                f.write(self.wos_records(self.chunk(first, min(first + chunk_size, stop))))
+            f.write('EF\n')
+        return path
+
+    def write_scopus(self, path, start=0, stop=None, chunk_size=10000):
+        """Write records start..stop-1 as a Scopus CSV export"""
+        stop = self.n_records if stop is None else stop
+        for first in range(start, stop, chunk_size):
+            frame = self.scopus_frame(self.chunk(first, min(first + chunk_size, stop)))
+            frame.to_csv(path, mode='w' if first == start else 'a',
+                         header=first == start, index=False)
+        return path
+
+
+def write_corpus(n_records, output_dir, data_format='wos', overlap=0.4, seed=42):
+    """
+    Write synthetic exports and return {'wos': path, 'scopus': path}
+
+    With data_format='both' the Scopus export shares a fraction overlap
+    of its records with the WoS export (same DOI and title).
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    shared = int(n_records * overlap) if data_format == 'both' else n_records
+    corpus = SyntheticCorpus(2 * n_records - shared, seed)
+
+    paths = {}
+    if data_format in ('wos', 'both'):
+        paths['wos'] = corpus.write_wos(
+            os.path.join(output_dir, f'synthetic_wos_{n_records}.txt'), 0, n_records)
+    if data_format in ('scopus', 'both'):
+        start = n_records - shared if data_format == 'both' else 0
+        paths['scopus'] = corpus.write_scopus(
+            os.path.join(output_dir, f'synthetic_scopus_{n_records}.csv'),
+            start, start + n_records)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write synthetic WoS/Scopus exports')
+    parser.add_argument('records', type=int, help='records per export')
+    parser.add_argument('--format', choices=['wos', 'scopus', 'both'], default='wos')
+    parser.add_argument('--overlap', type=float, default=0.4,
+                        help='share of records in both exports (--format both)')
+    parser.add_argument('--output', default='synthetic_data')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    for name, path in write_corpus(args.records, args.output, args.format,
+                                   args.overlap, args.seed).items():
+        print(f"✓ Wrote {args.records} {name} records: {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+Thematic Map and Thematic Evolution for Python Bibliometric Analysis
+
+Author: Mahbub Hassan
+Affiliation: Chulalongkorn University
+
+Purpose: Cluster keyword co-occurrence networks into themes, place them
+by Callon centrality and density (thematicMap in R) and link the themes
+of consecutive time slices (thematicEvolution in R)
+Requirements: numpy, pandas, scipy, networkx (python-igraph and leidenalg
+for method='leiden')
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from bibliometric_networks import incidence_matrix, normalize_similarity
+
+# Quadrants of the thematic map: (high centrality, high density) -> name
+THEMES = {
+    (True, True): 'Motor themes',
+    (False, True): 'Niche themes',
+    (False, False): 'Emerging or declining themes',
+    (True, False): 'Basic themes'
+}
+
+
+class YearlyCooccurrence:
+    """
+    Keyword co-occurrence counts of every publication year
+
+    One sparse product A_y.T @ A_y is computed per year over the keywords
+    occurring at least min_freq times in the whole corpus; the matrix of
+    any time slice is then the sum of its years, so slices (and repeated
+    maps with other breakpoints) never go back to the documents.
+
+    Attributes:
+    -----------
+    labels : pd.Index
+        Keywords of the shared vocabulary
+    matrices : dict
+        year -> co-occurrence counts (scipy.sparse.csr_matrix); documents
+        without a year are kept under None
+    occurrences : dict
+        year -> documents per keyword
+    """
+
+    def __init__(self, doc, code, labels, years, min_freq=1):
+        """
+        Parameters:
+        -----------
+        doc, code : np.ndarray
+            (document, keyword) pairs, e.g. a TokenTable
+        labels : pd.Index
+            Keywords indexed by code
+        years : np.ndarray
+            Publication year of every document (NaN when unknown)
+        min_freq : int
+            Minimum number of documents for a keyword to be kept
+        """
+        years = np.asarray(years, dtype=float)
+        A = incidence_matrix(doc, code, len(years), len(labels))
+        keep = np.flatnonzero(np.asarray(A.sum(axis=0)).ravel() >= min_freq)
+        A = A[:, keep].tocsr()
+        self.labels = pd.Index(labels).take(keep)
+        self.n_docs = len(years)
+
+        self.matrices, self.occurrences = {}, {}
+        known = ~np.isnan(years)
+        keys = [(int(year), np.flatnonzero(years == year)) for year in np.unique(years[known])]
+        if not known.all():
+            keys.append((None, np.flatnonzero(~known)))
+        for year, rows in keys:
+            A_y = A[rows]
+            C = (A_y.T @ A_y).tocsr()
+            C.setdiag(0)
+            C.eliminate_zeros()
+            self.matrices[year] = C
+            self.occurrences[year] = np.asarray(A_y.sum(axis=0)).ravel()
+
+    def period(self, first=None, last=None):
+        """
+        Co-occurrence counts and occurrences of the years first..last
+
+        With neither bound, every document is included (also those
+        without a year).
+
+        Returns:
+        --------
+        (scipy.sparse.csr_matrix, np.ndarray)
+        """
+        selected = [year for year in self.matrices
+                    if (first is None and last is None) or (
+                        year is not None and (first is None or year >= first)
+                        and (last is None or year <= last))]
+        n = len(self.labels)
+        C = sparse.csr_matrix((n, n), dtype=np.int64)
+        occurrences = np.zeros(n, dtype=np.int64)
+        for year in selected:
+            C = C + self.matrices[year]
+            occurrences += self.occurrences[year]
+        return C.tocsr(), occurrences
+
+
+def cluster_network(matrix, method='louvain', resolution=1.0, seed=42):
+    """
+    Community of every node of a weighted undirected network
+
+    Parameters:
+    -----------
+    matrix : scipy.sparse matrix
+        Symmetric edge weights
+    method : str
+        'louvain' (networkx) or 'leiden' (leidenalg)
+    resolution : float
+        Higher values give more, smaller communities
+    seed : int
+        Random seed, for reproducible clusters
+
+    Returns:
+    --------
+    np.ndarray of community numbers, 0 for the largest community
+    """
+    n = matrix.shape[0]
+    upper = sparse.triu(matrix, k=1).tocoo()
+
+    if method == 'louvain':
+        import networkx as nx
+
+        G = nx.Graph()
+        G.add_nodes_from(range(n))
+        G.add_weighted_edges_from(zip(upper.row.tolist(), upper.col.tolist(),
+                                      upper.data.tolist()))
+        communities = nx.community.louvain_communities(G, weight='weight',
+                                                       resolution=resolution, seed=seed)
+    elif method == 'leiden':
+        try:
+            import igraph as ig
+            import leidenalg
+        except ImportError:
+            raise ImportError("method='leiden' requires python-igraph and leidenalg "
+                              "(pip install python-igraph leidenalg)")
+
+        G = ig.Graph(n=n, edges=list(zip(upper.row.tolist(), upper.col.tolist())))
+        partition = leidenalg.find_partition(
+            G, leidenalg.RBConfigurationVertexPartition, weights=upper.data.tolist(),
+            resolution_parameter=resolution, seed=seed)
+        communities = list(partition)
+    else:
+        raise ValueError("method must be 'louvain' or 'leiden'")
+
+    membership = np.empty(n, dtype=np.int64)
+    for number, nodes in enumerate(sorted(communities, key=lambda c: (-len(c), min(c)))):
+        membership[list(nodes)] = number
+    return membership
+
+
+def thematic_map(C, labels, occurrences, n=250, min_freq=5, n_labels=3,
+                 method='louvain', resolution=1.0, seed=42):
+    """
+    Themes of a keyword co-occurrence matrix with Callon centrality and
+    density
+
+    The n most frequent keywords with at least min_freq documents are
+    kept, co-occurrences are normalized with the association strength,
+    isolated keywords are dropped and the rest is clustered. With the
+    cluster membership matrix M, W = M.T @ C @ M holds the internal link
+    weight of each cluster on its diagonal (twice) and the links to other
+    clusters off the diagonal:
+
+    - Centrality = 10 x sum of external link weights
+    - Density = 100 x internal link weight / number of keywords
+
+    Parameters:
+    -----------
+    C : scipy.sparse matrix
+        Raw co-occurrence counts with an empty diagonal
+    labels : pd.Index
+        Keywords indexed like C
+    occurrences : np.ndarray
+        Documents per keyword
+    n : int
+        Number of keywords mapped
+    min_freq : int
+        Minimum documents per keyword
+    n_labels : int
+        Keywords shown in each theme label
+    method, resolution, seed
+        Clustering options, see cluster_network
+
+    Returns:
+    --------
+    (clusters, words) DataFrames: one row per theme with Label,
+    Top_Words, Words, Frequency, Centrality, Density, their ranks and the
+    Theme quadrant; one row per keyword with Occurrences, Cluster and
+    Label
+    """
+    occurrences = np.asarray(occurrences)
+    candidates = np.flatnonzero(occurrences >= min_freq)
+    keep = np.sort(candidates[np.argsort(-occurrences[candidates], kind='stable')[:n]])
+    C = sparse.csr_matrix(C)[keep][:, keep]
+    labels = pd.Index(labels).take(keep)
+    occurrences = occurrences[keep]
+
+    connected = np.flatnonzero(np.diff(C.indptr) > 0)
+    C = normalize_similarity(C[connected][:, connected], occurrences[connected], 'association')
+    labels = labels.take(connected)
+    occurrences = occurrences[connected]
+
+    words = pd.DataFrame({'Word': labels, 'Occurrences': occurrences})
+    if len(labels) == 0:
+        clusters = pd.DataFrame(columns=['Cluster', 'Label', 'Top_Words', 'Words', 'Frequency',
+                                         'Centrality', 'Density', 'Rank_Centrality',
+                                         'Rank_Density', 'Theme'])
+        words['Cluster'] = pd.Series(dtype=np.int64)
+        words['Label'] = pd.Series(dtype=object)
+        return clusters, words
+
+    membership = cluster_network(C, method, resolution, seed)
+    k = membership.max() + 1
+    M = sparse.csr_matrix((np.ones(len(membership)), (np.arange(len(membership)), membership)),
+                          shape=(len(membership), k))
+    W = (M.T @ C @ M).toarray()
+    internal = np.diag(W) / 2
+    external = W.sum(axis=1) - np.diag(W)
+    size = np.bincount(membership, minlength=k)
+
+    words['Cluster'] = membership
+    words = words.sort_values(['Cluster', 'Occurrences'], ascending=[True, False],
+                              kind='stable', ignore_index=True)
+    top_words = words.groupby('Cluster')['Word'].apply(lambda w: list(w[:n_labels]))
+
+    clusters = pd.DataFrame({
+        'Cluster': np.arange(k),
+        'Label': [w[0] for w in top_words],
+        'Top_Words': ['; '.join(w) for w in top_words],
+        'Words': size,
+        'Frequency': np.bincount(membership, weights=occurrences, minlength=k).astype(np.int64),
+        'Centrality': np.round(external * 10, 4),
+        'Density': np.round(internal / size * 100, 4)
+    })
+    clusters['Rank_Centrality'] = clusters['Centrality'].rank(method='min').astype(np.int64)
+    clusters['Rank_Density'] = clusters['Density'].rank(method='min').astype(np.int64)
+    high_centrality = clusters['Centrality'] >= clusters['Centrality'].median()
+    high_density = clusters['Density'] >= clusters['Density'].median()
+    clusters['Theme'] = [THEMES[key] for key in zip(high_centrality, high_density)]
+
+    words['Label'] = clusters['Label'].to_numpy()[words['Cluster']]
+    return clusters, words
+
+
+def period_breaks(years, breaks=None, slices=4):
+    """
+    Time slices as (first, last) year pairs
+
+    Parameters:
+    -----------
+    years : array-like
+        Publication years of the documents (NaN ignored)
+    breaks : list of int, optional
+        Last year of every slice but the final one, as in R
+        thematicEvolution (years = c(2013, 2017) gives ..-2013,
+        2014-2017 and 2018-..)
+    slices : int
+        Without breaks, cut into this many slices of about equal numbers
+        of documents
+    """
+    years = np.asarray(years, dtype=float)
+    years = years[~np.isnan(years)].astype(np.int64)
+    if len(years) == 0:
+        return []
+    first, last = int(years.min()), int(years.max())
+
+    if breaks is None:
+        quantiles = np.quantile(years, np.linspace(0, 1, slices + 1)[1:-1], method='lower')
+        breaks = np.unique(quantiles)
+    breaks = [int(b) for b in sorted(breaks) if first <= b < last]
+
+    starts = [first] + [b + 1 for b in breaks]
+    ends = breaks + [last]
+    return list(zip(starts, ends))
+
+
+def period_names(slices):
+    """'2014-2017' style names of (first, last) slices ('2020' for one year)"""
+    return [f'{first}-{last}' if first != last else str(first) for first, last in slices]
+
+
+def _map_period(C, labels, occurrences, options):
+    """Worker task: thematic_map of one slice"""
+    return thematic_map(C, labels, occurrences, **options)
+
+
+def evolution_links(periods, words):
+    """
+    Links between the themes of consecutive time slices
+
+    Two themes are linked when they share keywords:
+
+    - Inclusion = shared keywords / keywords of the smaller theme
+    - Weighted_Inclusion = sum over shared keywords of the smaller of
+      their two occurrence counts / smaller theme Frequency
+    - Stability = shared keywords / keywords of either theme (Jaccard)
+
+    Parameters:
+    -----------
+    periods : list of str
+        Slice names, in order
+    words : list of DataFrame
+        Words table of each slice (see thematic_map)
+    """
+    links = []
+    for (period_a, words_a), (period_b, words_b) in zip(zip(periods, words),
+                                                          zip(periods[1:], words[1:])):
+        shared = words_a.merge(words_b, on='Word', suffixes=('_a', '_b'))
+        if shared.empty:
+            continue
+        shared['Weight'] = np.minimum(shared['Occurrences_a'], shared['Occurrences_b'])
+        pairs = shared.groupby(['Cluster_a', 'Cluster_b'], sort=False).agg(
+            From=('Label_a', 'first'), To=('Label_b', 'first'),
+            Shared=('Word', 'size'), Weight=('Weight', 'sum'),
+            Shared_Words=('Word', '; '.join)).reset_index()
+
+        size_a = words_a.groupby('Cluster')['Word'].size()
+        size_b = words_b.groupby('Cluster')['Word'].size()
+        freq_a = words_a.groupby('Cluster')['Occurrences'].sum()
+        freq_b = words_b.groupby('Cluster')['Occurrences'].sum()
+        n_a = size_a.reindex(pairs['Cluster_a']).to_numpy()
+        n_b = size_b.reindex(pairs['Cluster_b']).to_numpy()
+        min_freq = np.minimum(freq_a.reindex(pairs['Cluster_a']).to_numpy(),
+                              freq_b.reindex(pairs['Cluster_b']).to_numpy())
+
+        pairs['Inclusion'] = np.round(pairs['Shared'] / np.minimum(n_a, n_b), 4)
+        pairs['Weighted_Inclusion'] = np.round(pairs['Weight'] / min_freq, 4)
+        pairs['Stability'] = np.round(pairs['Shared'] / (n_a + n_b - pairs['Shared']), 4)
+        pairs.insert(0, 'From_Period', period_a)
+        pairs.insert(3, 'To_Period', period_b)
+        links.append(pairs.drop(columns='Weight').rename(
+            columns={'Cluster_a': 'From_Cluster', 'Cluster_b': 'To_Cluster'}))
+
+    columns = ['From_Period', 'From_Cluster', 'From', 'To_Period', 'To_Cluster', 'To',
+               'Shared', 'Shared_Words', 'Inclusion', 'Weighted_Inclusion', 'Stability']
+    if not links:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(links, ignore_index=True)[columns].sort_values(
+        ['From_Period', 'Inclusion'], ascending=[True, False], ignore_index=True)
+
+
+def thematic_evolution(yearly, slices, n=100, min_freq=2, n_labels=3, method='louvain',
+                       resolution=1.0, seed=42, workers=None):
+    """
+    Thematic map of every time slice and the links between them
+
+    Slice matrices are summed from the shared per-year matrices and
+    pruned to n keywords before they are sent to the workers, which only
+    cluster and score them.
+
+    Parameters:
+    -----------
+    yearly : YearlyCooccurrence
+        Per-year co-occurrence counts
+    slices : list of (first, last)
+        Year range of every slice, e.g. from period_breaks
+    n, min_freq, n_labels, method, resolution, seed
+        thematic_map options, applied to every slice
+    workers : int, optional
+        Processes clustering slices in parallel (None uses all CPUs, 1
+        runs inline)
+
+    Returns:
+    --------
+    (clusters, words, links) DataFrames; clusters and words carry a
+    Period column
+    """
+    options = {'n': n, 'min_freq': min_freq, 'n_labels': n_labels, 'method': method,
+               'resolution': resolution, 'seed': seed}
+    periods = period_names(slices)
+
+    jobs = []
+    for first, last in slices:
+        C, occurrences = yearly.period(first, last)
+        candidates = np.flatnonzero(occurrences >= min_freq)
+        keep = np.sort(candidates[np.argsort(-occurrences[candidates], kind='stable')[:n]])
+        jobs.append((C[keep][:, keep], yearly.labels.take(keep), occurrences[keep], options))
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) <= 1:
+        maps = [_map_period(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(min(workers, len(jobs))) as pool:
+            maps = list(pool.map(_map_period, *zip(*jobs)))
+
+    clusters, words = [], []
+    for period, (period_clusters, period_words) in zip(periods, maps):
+        clusters.append(period_clusters.assign(Period=period))
+        words.append(period_words.assign(Period=period))
+    links = evolution_links(periods, [w for _, w in maps])
+
+    def _stack(frames):
+        frame = pd.concat(frames, ignore_index=True)
+        return frame[['Period'] + [c for c in frame.columns if c != 'Period']]
+
+    return _stack(clusters), _stack(words), links
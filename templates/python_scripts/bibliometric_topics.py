@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Abstract Topic Modeling for Python Bibliometric Analysis
+
+Author: Mahbub Hassan
+Affiliation: Chulalongkorn University
+
+Purpose: Fit online LDA or mini-batch NMF topics to abstracts streamed in
+chunks through a hashing vectorizer (no vocabulary, no dense matrix) and
+measure topic prevalence per publication year
+Requirements: numpy, pandas, scipy, scikit-learn
+"""
+
+import os
+import re
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# Publisher copyright notices appended to abstracts ("(C) 2020 Elsevier
+# Ltd. All rights reserved.", "© 2021 The Authors")
+COPYRIGHT = re.compile(r'(?:\(c\)|©|copyright)\s*\d{4}.*$', re.IGNORECASE | re.DOTALL)
+
+# Scopus writes this in place of a missing abstract
+NO_ABSTRACT = re.compile(r'^\s*\[no abstract available\]\s*$', re.IGNORECASE)
+
+METHODS = ('lda', 'nmf')
+
+
+def _vectorizer(n_features):
+    """Stateless term counter shared by the parent and worker processes"""
+    from sklearn.feature_extraction.text import HashingVectorizer
+
+    return HashingVectorizer(n_features=n_features, stop_words='english',
+                             token_pattern=r'(?u)\b[^\W\d_][^\W\d_]+\b',
+                             alternate_sign=False, norm=None, dtype=np.float32)
+
+
+def _clean(texts):
+    return [COPYRIGHT.sub('', text) for text in texts]
+
+
+def usable_abstracts(texts):
+    """
+    Abstracts as an object Series with NaN for missing, blank and
+    placeholder ("[No abstract available]") values
+    """
+    texts = pd.Series(texts, dtype=object).reset_index(drop=True)
+    text = texts.astype(str).str.strip()
+    missing = texts.isna() | (text.str.len() == 0) | text.str.match(NO_ABSTRACT)
+    return texts.mask(missing)
+
+
+def hash_chunk(texts, n_features):
+    """Term counts of a list of abstracts as a CSR matrix"""
+    return _vectorizer(n_features).transform(_clean(texts))
+
+
+def _hash_rows(chunk, n_features):
+    """Worker task: (rows, texts) -> (rows, term counts)"""
+    rows, texts = chunk
+    return rows, hash_chunk(texts, n_features)
+
+
+def _bounded_map(func, chunks, workers, *args):
+    """
+    func(chunk, *args) for every chunk, in order
+
+    At most 2 x workers chunks are in flight, so results are never
+    produced much faster than they are consumed.
+    """
+    if workers == 1:
+        for chunk in chunks:
+            yield func(chunk, *args)
+        return
+
+    with ProcessPoolExecutor(workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(func, chunk, *args))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+class TopicModel:
+    """
+    Topics of a stream of abstracts
+
+    Abstracts are hashed into n_features term columns chunk by chunk (on
+    a process pool) and the model is updated with partial_fit after
+    every chunk: online variational Bayes for LDA (E-step on n_jobs
+    cores) or MiniBatchNMF on TF-IDF weights. Memory is bounded by a few
+    sparse chunks whatever the corpus size.
+
+    Hashing keeps no vocabulary, so topic terms are recovered afterwards
+    from the tokens of the first label_docs abstracts: each top column is
+    named after its most frequent token.
+    """
+
+    def __init__(self, n_topics=10, method='lda', n_features=2 ** 18, chunk_size=10000,
+                 passes=1, workers=None, n_top_words=10, label_docs=50000, seed=42):
+        """
+        Parameters:
+        -----------
+        n_topics : int
+            Number of topics
+        method : str
+            'lda' (online Latent Dirichlet Allocation) or 'nmf'
+            (mini-batch non-negative matrix factorization)
+        n_features : int
+            Hashed term columns
+        chunk_size : int
+            Abstracts per mini-batch
+        passes : int
+            Passes over the abstracts while fitting
+        workers : int, optional
+            Processes hashing chunks and LDA jobs (None uses all CPUs)
+        n_top_words : int
+            Terms listed per topic
+        label_docs : int
+            Abstracts whose tokens name the hashed columns
+        seed : int
+            Random seed
+        """
+        if method not in METHODS:
+            raise ValueError(f"method must be one of: {', '.join(METHODS)}")
+        self.n_topics = n_topics
+        self.method = method
+        self.n_features = n_features
+        self.chunk_size = chunk_size
+        self.passes = passes
+        self.workers = workers or os.cpu_count() or 1
+        self.n_top_words = n_top_words
+        self.label_docs = label_docs
+        self.seed = seed
+        self.model = None
+        self.idf = None
+        self.terms = {}
+
+    def _chunks(self, texts):
+        """Usable abstracts in chunks of (row positions, texts)"""
+        texts = usable_abstracts(texts)
+        present = np.flatnonzero(texts.notna().to_numpy())
+        for start in range(0, len(present), self.chunk_size):
+            rows = present[start:start + self.chunk_size]
+            yield rows, texts.iloc[rows].astype(str).tolist()
+
+    def _matrices(self, texts):
+        """(rows, term matrix) per chunk, hashed on the worker pool"""
+        return _bounded_map(_hash_rows, self._chunks(texts), self.workers, self.n_features)
+
+    def _weights(self, X):
+        """Model input: counts for LDA, l2-normalized TF-IDF for NMF"""
+        if self.method == 'lda':
+            return X
+        from sklearn.preprocessing import normalize
+
+        X = X.tocsr(copy=True)
+        X.data = 1 + np.log(X.data)
+        return normalize(X.multiply(self.idf).tocsr())
+
+    def _document_frequencies(self, texts):
+        """IDF of every hashed column (one streaming pass)"""
+        df = np.zeros(self.n_features, dtype=np.int64)
+        n = 0
+        for rows, X in self._matrices(texts):
+            df += np.bincount(X.indices, minlength=self.n_features)
+            n += len(rows)
+        return (np.log((1 + n) / (1 + df)) + 1).astype(np.float32)
+
+    def fit(self, texts):
+        """
+        Fit the topics to a sequence of abstracts (missing ones skipped)
+
+        Raises ValueError when no abstract is usable.
+        """
+        n_usable = int(usable_abstracts(texts).notna().sum())
+        if n_usable == 0:
+            raise ValueError("No abstracts to fit topics to")
+
+        if self.method == 'lda':
+            from sklearn.decomposition import LatentDirichletAllocation
+
+            self.model = LatentDirichletAllocation(
+                n_components=self.n_topics, learning_method='online',
+                total_samples=n_usable,
+                batch_size=min(self.chunk_size, 4096), n_jobs=self.workers,
+                random_state=self.seed)
+        else:
+            from sklearn.decomposition import MiniBatchNMF
+
+            self.idf = self._document_frequencies(texts)
+            self.model = MiniBatchNMF(n_components=self.n_topics,
+                                      batch_size=min(self.chunk_size, 4096),
+                                      init='nndsvda', random_state=self.seed)
+
+        for _ in range(self.passes):
+            for _, X in self._matrices(texts):
+                self.model.partial_fit(self._weights(X))
+
+        self.terms = self._column_terms(texts)
+        return self
+
+    def _column_terms(self, texts):
+        """Most frequent token of every top hashed column"""
+        top = np.unique(np.argsort(-self.model.components_, axis=1)[:, :self.n_top_words])
+
+        analyzer = _vectorizer(self.n_features).build_analyzer()
+        counts = Counter()
+        sample = usable_abstracts(texts).dropna().astype(str).head(self.label_docs)
+        for text in _clean(sample):
+            counts.update(analyzer(text))
+        if not counts:
+            return {}
+
+        # One token per row, so each row holds the token's column
+        tokens = list(counts)
+        X = hash_chunk(tokens, self.n_features)
+        single = np.diff(X.indptr) == 1
+        candidates = pd.DataFrame({'column': X.indices[X.indptr[:-1][single]],
+                                   'token': np.asarray(tokens, dtype=object)[single],
+                                   'count': np.fromiter(counts.values(), np.int64)[single]})
+        candidates = candidates[candidates['column'].isin(top)]
+        best = candidates.sort_values('count', ascending=False).drop_duplicates('column')
+        return dict(zip(best['column'], best['token']))
+
+    def transform(self, texts):
+        """
+        Topic proportions of every abstract
+
+        Returns:
+        --------
+        np.ndarray (documents x topics, float32), rows summing to 1 and
+        NaN for missing abstracts
+        """
+        n = len(texts)
+        result = np.full((n, self.n_topics), np.nan, dtype=np.float32)
+        for rows, X in self._matrices(texts):
+            weights = self.model.transform(self._weights(X))
+            totals = weights.sum(axis=1, keepdims=True)
+            result[rows] = np.divide(weights, totals, out=np.zeros_like(weights),
+                                     where=totals > 0)
+        return result
+
+    def topics(self):
+        """Topic, Label (top 3 terms), Top_Words and share of term weight"""
+        components = self.model.components_
+        rows = []
+        for topic, weights in enumerate(components):
+            order = np.argsort(-weights)[:self.n_top_words]
+            words = [self.terms.get(column, f'#{column}') for column in order]
+            rows.append({'Topic': topic + 1, 'Label': ' '.join(words[:3]),
+                         'Top_Words': '; '.join(words)})
+        table = pd.DataFrame(rows)
+        table['Weight'] = np.round(components.sum(axis=1) / components.sum(), 4)
+        return table
+
+
+def topic_prevalence(doc_topics, years, labels=None):
+    """
+    Mean topic proportion of the documents of every year
+
+    Parameters:
+    -----------
+    doc_topics : np.ndarray
+        Documents x topics proportions (NaN rows are skipped)
+    years : array-like
+        Publication year of every document
+    labels : list of str, optional
+        Column name of every topic
+
+    Returns:
+    --------
+    DataFrame with Year, Documents (with an abstract) and one share
+    column per topic; multiply by Documents for expected counts
+    """
+    years = pd.Series(np.asarray(years, dtype=float))
+    present = ~np.isnan(doc_topics).any(axis=1) & years.notna().to_numpy()
+    labels = labels or [f'Topic {i + 1}' for i in range(doc_topics.shape[1])]
+
+    frame = pd.DataFrame(doc_topics[present], columns=labels)
+    frame.insert(0, 'Year', years[present].astype(int).to_numpy())
+    grouped = frame.groupby('Year')
+    prevalence = grouped.mean().round(4)
+    prevalence.insert(0, 'Documents', grouped.size())
+    return prevalence.reset_index()
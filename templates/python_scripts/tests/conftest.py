@@ -0,0 +1,53 @@
+"""
+Shared fixtures for the bibliometric_* module tests
+
+Run from templates/python_scripts:  python -m pytest -q tests
+"""
+
+import os
+import sys
+
+import pytest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS = os.path.dirname(HERE)
+SAMPLE_DATA = os.path.join(SCRIPTS, '..', '..', 'examples', 'sample_data')
+
+sys.path.insert(0, SCRIPTS)
+
+
+@pytest.fixture
+def wos_sample():
+    return os.path.join(SAMPLE_DATA, 'sample_wos_transport.txt')
+
+
+@pytest.fixture
+def scopus_sample():
+    return os.path.join(SAMPLE_DATA, 'sample_scopus_transport.csv')
+
+
+@pytest.fixture
+def wos_records(wos_sample):
+    """Records of the WoS sample as lists of lines (PT ... ER)"""
+    records, current = [], []
+    with open(wos_sample, encoding='utf-8-sig') as f:
+        for line in f:
+            if line.startswith(('FN ', 'VR ', 'EF')):
+                continue
+            if line.strip():
+                current.append(line)
+            if line.startswith('ER'):
+                records.append(current)
+                current = []
+    return records
+
+
+def write_wos(path, records):
+    """Write records as a WoS plain-text export"""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('FN Clarivate Analytics Web of Science\nVR 1.0\n')
+        for record in records:
+            f.writelines(record)
+            f.write('\n')
+        f.write('EF\n')
+    return str(path)
@@ -0,0 +1,168 @@
+"""Exporters: incomplete formats are rejected, written files round-trip"""
+
+import sqlite3
+from xml.etree import ElementTree
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import sparse
+
+from bibliometric_export import (EXPORTERS, CSVExporter, Exporter, NetworkExporter,
+                                 export_results, is_network, result_table)
+from bibliometric_networks import Network
+
+
+def test_registered_exporters_can_be_created(tmp_path):
+    for name, exporter in EXPORTERS.items():
+        exporter(str(tmp_path))
+
+
+def test_format_without_write_table_fails_on_creation(tmp_path):
+    class Incomplete(Exporter):
+        extension = '.txt'
+
+    with pytest.raises(TypeError):
+        Incomplete(str(tmp_path))
+
+
+def test_network_format_without_write_network_fails_on_creation(tmp_path):
+    class Incomplete(NetworkExporter):
+        extension = '.txt'
+
+    with pytest.raises(TypeError):
+        Incomplete(str(tmp_path))
+
+
+def test_network_formats_do_not_write_tables(tmp_path):
+    for exporter in EXPORTERS.values():
+        if issubclass(exporter, NetworkExporter):
+            assert not exporter.tables
+            with pytest.raises(TypeError):
+                exporter(str(tmp_path)).write_table('table', None)
+
+
+# ------------------------------------------------------------------------------
+# Round trips: exported files read back equal the source results
+# ------------------------------------------------------------------------------
+
+def _results():
+    network = Network(
+        sparse.csr_matrix(np.array([[0, 2, 1, 0],
+                                    [2, 0, 0, 3],
+                                    [1, 0, 0, 0],
+                                    [0, 3, 0, 0]], dtype=np.int64)),
+        pd.Index(['electric vehicles', 'r&d <policy>', 'tab\there', 'charging']),
+        np.array([5, 4, 2, 3]))
+    return {
+        'top_authors': pd.DataFrame({'Author': ['Li, X', 'Wang, Y', 'Chen, Z'],
+                                     'Documents': [3, 2, 1],
+                                     'Fractionalized': [1.5, 0.83, 0.33]}),
+        'statistics': {'Total Documents': 3, 'Time Span': '2023-2024'},
+        'trends': pd.Series([1, 2], index=pd.Index([2023, 2024], name='Year'),
+                            name='count'),
+        'network_keywords': network
+    }
+
+
+def _tables(results):
+    """Expected tables by name, as export_results derives them"""
+    tables = {}
+    for name, value in results.items():
+        if is_network(value):
+            tables[f'{name}_nodes'] = value.nodes()
+            tables[f'{name}_edges'] = value.edges()
+        else:
+            tables[name] = result_table(name, value)
+    return tables
+
+
+def _export(tmp_path, fmt):
+    results = _results()
+    written = export_results(results, str(tmp_path), formats=(fmt,), workers=2)
+    return results, written
+
+
+@pytest.mark.parametrize('fmt, read', [('csv', pd.read_csv),
+                                       ('parquet', pd.read_parquet)])
+def test_file_formats_round_trip(tmp_path, fmt, read):
+    results, written = _export(tmp_path, fmt)
+    expected = _tables(results)
+
+    assert sorted(written) == sorted(str(tmp_path / f'bibliometric_{name}.{fmt}')
+                                     for name in expected)
+    for name, table in expected.items():
+        back = read(tmp_path / f'bibliometric_{name}.{fmt}')
+        pd.testing.assert_frame_equal(back, table.reset_index(drop=True), check_dtype=False)
+
+
+def test_csv_written_in_chunks_round_trips(tmp_path):
+    frame = pd.DataFrame({'Keyword': [f'k{i}' for i in range(7)], 'Count': range(7)})
+    path, = CSVExporter(str(tmp_path), chunk_rows=3).write_table('keywords', frame)
+    pd.testing.assert_frame_equal(pd.read_csv(path), frame)
+
+
+@pytest.mark.parametrize('fmt', ['sqlite', 'duckdb'])
+def test_database_formats_round_trip(tmp_path, fmt):
+    if fmt == 'duckdb':
+        duckdb = pytest.importorskip('duckdb')
+    results, written = _export(tmp_path, fmt)
+    path, = written
+
+    for name, table in _tables(results).items():
+        if fmt == 'sqlite':
+            with sqlite3.connect(path) as connection:
+                back = pd.read_sql(f'SELECT * FROM "{name}"', connection)
+        else:
+            with duckdb.connect(path, read_only=True) as connection:
+                back = connection.execute(f'SELECT * FROM "{name}"').df()
+        pd.testing.assert_frame_equal(back, table.reset_index(drop=True), check_dtype=False)
+
+
+def _edge_set(sources, targets, weights):
+    return {(frozenset((s, t)), float(w)) for s, t, w in zip(sources, targets, weights)}
+
+
+def test_graphml_round_trip(tmp_path):
+    network = _results()['network_keywords']
+    _, written = _export(tmp_path, 'graphml')
+    path, = written
+
+    ns = {'g': 'http://graphml.graphdrawing.org/xmlns'}
+    graph = ElementTree.parse(path).getroot().find('g:graph', ns)
+    nodes = {node.get('id'): {data.get('key'): data.text for data in node.findall('g:data', ns)}
+             for node in graph.findall('g:node', ns)}
+    assert [node['label'] for node in nodes.values()] == list(network.labels)
+    assert [float(node['occurrences']) for node in nodes.values()] == list(network.occurrences)
+
+    edges = [(nodes[edge.get('source')]['label'], nodes[edge.get('target')]['label'],
+              edge.find('g:data', ns).text) for edge in graph.findall('g:edge', ns)]
+    expected = network.edges()
+    assert _edge_set(*zip(*edges)) == _edge_set(expected['Source'], expected['Target'],
+                                                expected['Weight'])
+
+
+def test_edge_list_round_trip(tmp_path):
+    network = _results()['network_keywords']
+    _, written = _export(tmp_path, 'edgelist')
+    path, = written
+
+    pd.testing.assert_frame_equal(pd.read_csv(path), network.edges())
+
+
+def test_vosviewer_round_trip(tmp_path):
+    network = _results()['network_keywords']
+    _, written = _export(tmp_path, 'vosviewer')
+    map_path, network_path = sorted(written)
+
+    items = pd.read_csv(map_path, sep='\t')
+    assert items['id'].tolist() == [1, 2, 3, 4]
+    assert items['label'].tolist() == [label.replace('\t', ' ') for label in network.labels]
+    assert items['weight<Occurrences>'].tolist() == list(network.occurrences)
+
+    links = pd.read_csv(network_path, sep='\t', header=None, names=['source', 'target', 'weight'])
+    labels = dict(zip(items['id'], network.labels))
+    expected = network.edges()
+    assert _edge_set(links['source'].map(labels), links['target'].map(labels),
+                     links['weight']) == _edge_set(expected['Source'], expected['Target'],
+                                                   expected['Weight'])
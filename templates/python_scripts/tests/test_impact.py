@@ -0,0 +1,85 @@
+"""Vectorized h-, g- and m-index against a direct computation"""
+
+import io
+from contextlib import redirect_stdout
+
+import numpy as np
+import pandas as pd
+
+from bibliometric_analysis_python import BibliometricAnalysis
+from bibliometric_impact import impact_table
+
+
+def _brute_force(citations):
+    """h-, g-index of one entity's citation counts, straight from the definitions"""
+    ranked = sorted(citations, reverse=True)
+    h = max([r for r in range(1, len(ranked) + 1) if ranked[r - 1] >= r], default=0)
+    g = max([r for r in range(1, len(ranked) + 1) if sum(ranked[:r]) >= r * r], default=0)
+    return h, g
+
+
+def _expected(entity, doc, citations, years, labels, current_year):
+    rows = {}
+    for code, name in enumerate(labels):
+        docs = [d for e, d in zip(entity, doc) if e == code]
+        if not docs:
+            continue
+        h, g = _brute_force([citations[d] for d in docs])
+        first = min(years[d] for d in docs)
+        rows[name] = (len(docs), sum(citations[d] for d in docs), h, g,
+                      round(h / (current_year - first + 1), 3), first)
+    return rows
+
+
+def _check(table, expected):
+    actual = {row['Name']: (row['Documents'], row['Citations'], row['h-index'],
+                            row['g-index'], row['m-index'], row['PY_start'])
+              for _, row in table.iterrows()}
+    assert actual == expected
+
+
+def test_random_corpus_matches_brute_force():
+    rng = np.random.default_rng(7)
+    n_docs, n_entities = 400, 40
+    citations = rng.geometric(0.05, n_docs) - 1
+    years = rng.integers(2000, 2025, n_docs).astype(float)
+    labels = pd.Index([f'entity {i}' for i in range(n_entities)])
+
+    pairs = np.unique(np.column_stack([rng.integers(0, n_docs, 1500),
+                                       rng.integers(0, n_entities - 3, 1500)]), axis=0)
+    doc, entity = pairs[:, 0], pairs[:, 1]
+
+    table = impact_table(entity, doc, citations, years, labels, current_year=2025)
+    _check(table, _expected(entity, doc, citations, years, labels, 2025))
+
+
+def test_g_index_edge_cases():
+    # One highly cited paper: g is capped by the number of documents
+    # ties and zero citations: h counts ranks with citations >= rank
+    citations = np.array([100, 3, 3, 3, 0, 0, 1])
+    entity = np.array([0, 1, 1, 1, 2, 2, 2])
+    doc = np.arange(7)
+    years = np.full(7, 2020.0)
+    labels = pd.Index(['single', 'ties', 'uncited'])
+
+    table = impact_table(entity, doc, citations, years, labels, current_year=2024)
+    _check(table, _expected(entity, doc, citations, years, labels, 2024))
+    indices = table.set_index('Name')[['h-index', 'g-index']]
+    assert indices.loc['single'].tolist() == [1, 1]
+    assert indices.loc['ties'].tolist() == [3, 3]
+    assert indices.loc['uncited'].tolist() == [1, 1]
+
+
+def test_sample_author_impact_matches_brute_force(scopus_sample):
+    analysis = BibliometricAnalysis(scopus_sample, 'scopus', use_cache=False)
+    with redirect_stdout(io.StringIO()):
+        analysis.load_data()
+
+    table = analysis._author_impact()
+    authors = analysis._tokens('authors')
+    citations = analysis.df['Citations'].to_numpy()
+    years = analysis.df['Year'].to_numpy(dtype=float)
+    expected = _expected(authors.code, authors.doc, citations, years, authors.vocab,
+                         pd.Timestamp.now().year)
+
+    _check(table, expected)
@@ -0,0 +1,102 @@
+"""Incremental updates: running aggregates and CorpusStore round trips"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bibliometric_analysis_python import BibliometricAnalysis
+from conftest import write_wos
+
+
+def _analysis(path):
+    return BibliometricAnalysis(path, 'wos', use_cache=False)
+
+
+def _pairs(table):
+    """Sorted (doc, item) pairs, independent of code numbering"""
+    return sorted(zip(table.doc.tolist(), table.vocab.take(table.code).tolist()))
+
+
+def test_countries_built_between_saves_survive_reload(tmp_path, wos_records):
+    first = write_wos(tmp_path / 'first.txt', wos_records[:2])
+    delta = write_wos(tmp_path / 'delta.txt', wos_records[2:])
+    store = str(tmp_path / 'store')
+
+    analysis = _analysis(first).load_data()
+    analysis.save_corpus(store)
+    analysis.add_records(delta)
+    analysis.country_analysis()
+    analysis.save_corpus(store)
+
+    loaded = _analysis(first).load_corpus(store)
+    full = _analysis(write_wos(tmp_path / 'all.txt', wos_records)).load_data()
+
+    assert len(loaded.df) == len(wos_records)
+    assert _pairs(loaded._tokens('countries')) == _pairs(full._tokens('countries'))
+    pd.testing.assert_frame_equal(loaded._country_table(), full._country_table(),
+                                  check_dtype=False)
+
+
+def test_store_without_countries_rebuilds_them_on_load(tmp_path, wos_records):
+    store = str(tmp_path / 'store')
+    analysis = _analysis(write_wos(tmp_path / 'all.txt', wos_records)).load_data()
+    analysis.save_corpus(store)
+
+    loaded = _analysis(store).load_corpus(store)
+    for name, table in analysis.tokens.items():
+        assert _pairs(loaded.tokens[name]) == _pairs(table)
+        assert np.array_equal(loaded.tokens[name].vocab, table.vocab)
+
+
+def _counts(table, counts):
+    """Item -> count, independent of code numbering"""
+    return {item: int(count) for item, count in zip(table.vocab, counts) if count}
+
+
+def test_aggregates_count_tables_built_after_they_started(tmp_path, wos_records):
+    first = write_wos(tmp_path / 'first.txt', wos_records[:1])
+    second = write_wos(tmp_path / 'second.txt', wos_records[1:2])
+    third = write_wos(tmp_path / 'third.txt', wos_records[2:])
+
+    analysis = _analysis(first).load_data()
+    analysis.add_records(second)
+    analysis.country_analysis()
+    analysis.add_records(third)
+
+    full = _analysis(write_wos(tmp_path / 'all.txt', wos_records)).load_data()
+    aggregates = analysis.aggregates
+    for name in ('countries', 'keywords', 'authors'):
+        table = analysis._tokens(name)
+        assert (_counts(table, aggregates.item_counts[name])
+                == _counts(table, table.counts())
+                == _counts(full._tokens(name), full._tokens(name).counts()))
+
+
+def test_incremental_sections_match_a_full_load(tmp_path, wos_records):
+    analysis = _analysis(write_wos(tmp_path / 'first.txt', wos_records[:2])).load_data()
+    analysis.add_records(write_wos(tmp_path / 'delta.txt', wos_records[2:]))
+    full = _analysis(write_wos(tmp_path / 'all.txt', wos_records)).load_data()
+
+    assert analysis._aggregates() is analysis.aggregates
+    pd.testing.assert_series_equal(analysis._yearly_counts(), full._yearly_counts())
+    pd.testing.assert_series_equal(analysis._keyword_counts(), full._keyword_counts())
+    assert analysis._statistics() == full._statistics()
+
+
+def test_add_records_to_merged_corpus_needs_the_export_type(tmp_path, wos_records,
+                                                           scopus_sample):
+    wos = write_wos(tmp_path / 'first.txt', wos_records[:2])
+    merged = BibliometricAnalysis({'wos': wos, 'scopus': scopus_sample}, 'merged',
+                                  use_cache=False).load_data()
+    delta = write_wos(tmp_path / 'delta.txt', wos_records[2:])
+
+    with pytest.raises(ValueError, match='merged corpus'):
+        merged.add_records(delta)
+    # The third WoS record is already in the Scopus sample (same DOI)
+    assert merged.add_records(delta, data_type='wos') == 0
+
+    extra = list(wos_records[2])
+    extra = [line for line in extra if not line.startswith(('DI ', 'UT '))]
+    added = merged.add_records(write_wos(tmp_path / 'extra.txt', [extra]), data_type='wos')
+    assert added == 1
+    assert merged.df['Database'].iloc[-1] == 'wos'
@@ -0,0 +1,90 @@
+"""WoS/Scopus deduplication: identifier links and MinHash/LSH title links"""
+
+import io
+from contextlib import redirect_stdout
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bibliometric_analysis_python import BibliometricAnalysis
+from bibliometric_merge import (merge_records, minhash_signatures, normalize_titles,
+                                title_duplicate_pairs)
+
+
+def _frame(path, data_type):
+    analysis = BibliometricAnalysis(path, data_type, use_cache=False)
+    with redirect_stdout(io.StringIO()):
+        analysis.load_data()
+    return analysis.df
+
+
+@pytest.fixture
+def frames(wos_sample, scopus_sample):
+    return {'wos': _frame(wos_sample, 'wos'), 'scopus': _frame(scopus_sample, 'scopus')}
+
+
+def test_shared_dois_merge_and_take_precedence_over_titles(frames):
+    merged, report = merge_records(frames)
+
+    # The three WoS records are also in the Scopus sample, same DOI and title
+    assert len(merged) == 6
+    assert (merged['Database'] == 'wos+scopus').sum() == 3
+    assert len(report) == 3
+    assert set(report['rule']) == {'doi'}
+    assert (report['similarity'] == 1.0).all()
+    assert set(report['left_database']) == {'wos'}
+
+
+def test_merged_fields_prefer_the_first_database(frames):
+    merged, _ = merge_records(frames)
+    wos = frames['wos']
+
+    shared = merged[merged['Database'] == 'wos+scopus'].set_index('DOI')
+    for _, row in wos.iterrows():
+        assert shared.loc[row['DOI'], 'UT'] == row['UT']
+        assert shared.loc[row['DOI'], 'Affiliations'] == row['Affiliations']
+
+
+def test_near_duplicate_titles_without_identifiers(scopus_sample):
+    scopus = _frame(scopus_sample, 'scopus')
+    copy = scopus.iloc[[3]].copy()
+    copy['Title'] = copy['Title'].str.upper().str.replace(':', ' -', regex=False)
+    copy['DOI'] = np.nan
+    copy['EID'] = np.nan
+
+    merged, report = merge_records({'scopus': scopus, 'other': copy})
+
+    assert len(merged) == len(scopus)
+    assert report['rule'].tolist() == ['title']
+    assert report['left_row'].tolist() == [3]
+    assert merged.loc[3, 'Database'] == 'scopus+other'
+
+
+def test_similar_titles_in_different_years_stay_apart():
+    df = pd.DataFrame({
+        'Title': ['Bicycle sharing systems and urban sustainability'] * 2,
+        'Year': [2022, 2023],
+    })
+    assert title_duplicate_pairs(df).empty
+
+    df['Year'] = 2023
+    pairs = title_duplicate_pairs(df)
+    assert pairs[['left', 'right']].values.tolist() == [[0, 1]]
+
+
+def test_minhash_estimates_jaccard_similarity():
+    titles = normalize_titles(pd.Series([
+        'Traffic flow prediction with machine learning',
+        'traffic flow prediction with deep learning',
+        'Climate change and transportation infrastructure',
+        None,
+    ]))
+    signatures, has_words = minhash_signatures(titles, num_perm=256)
+
+    assert has_words.tolist() == [True, True, True, False]
+    # Word sets share 5 of 7 words
+    similar = (signatures[0] == signatures[1]).mean()
+    unrelated = (signatures[0] == signatures[2]).mean()
+    assert abs(similar - 5 / 7) < 0.1
+    assert unrelated < 0.1
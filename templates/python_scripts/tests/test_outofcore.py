@@ -0,0 +1,96 @@
+"""Out-of-core backend: conversion cache and parity with the in-memory tables"""
+
+import io
+import os
+from contextlib import redirect_stdout
+
+import pandas as pd
+import pytest
+
+pytest.importorskip('duckdb')
+
+from bibliometric_analysis_python import BibliometricAnalysis
+from bibliometric_outofcore import OutOfCoreAnalysis
+
+
+def _convert(path, parquet_dir, columns, max_bytes):
+    analysis = OutOfCoreAnalysis(path, 'scopus', parquet_dir=parquet_dir,
+                                 parquet_max_bytes=max_bytes)
+    with redirect_stdout(io.StringIO()):
+        analysis.load_data(columns=columns)
+    return os.path.dirname(os.path.dirname(analysis.parts[0]))
+
+
+def _entries(parquet_dir):
+    return {name for name in os.listdir(parquet_dir)
+            if os.path.isdir(os.path.join(parquet_dir, name)) and not name.startswith('.')}
+
+
+def test_least_recently_used_conversion_is_evicted(tmp_path, scopus_sample):
+    parquet_dir = str(tmp_path / 'parquet')
+    first = _convert(scopus_sample, parquet_dir, ['Title', 'Year'], 1)
+    second = _convert(scopus_sample, parquet_dir, ['Title', 'Citations'], 1)
+
+    # Each conversion is larger than the limit; only the current one stays
+    assert _entries(parquet_dir) == {os.path.basename(second)}
+    assert not os.path.exists(first)
+
+
+def test_conversions_within_the_limit_are_reused(tmp_path, scopus_sample):
+    parquet_dir = str(tmp_path / 'parquet')
+    first = _convert(scopus_sample, parquet_dir, ['Title', 'Year'], 1024 ** 3)
+    _convert(scopus_sample, parquet_dir, ['Title', 'Citations'], 1024 ** 3)
+
+    assert len(_entries(parquet_dir)) == 2
+    assert _convert(scopus_sample, parquet_dir, ['Title', 'Year'], 1024 ** 3) == first
+
+
+# ------------------------------------------------------------------------------
+# Same tables as the in-memory backend
+# ------------------------------------------------------------------------------
+
+def _scopus_csv(path):
+    """Corpus with an 8-author paper (1/8 = 0.125) and ties in name order"""
+    pd.DataFrame({
+        'Authors': ['Zhang, A.; Adams, B.; Kim, C.; Lee, D.; Park, E.; Cho, F.; Yoo, G.; Han, H.',
+                    'Zhang, A.; Adams, B.',
+                    'Moore, J.; Brown, K.',
+                    'Brown, K.; Moore, J.'],
+        'Title': ['First', 'Second', 'Third', 'Fourth'],
+        'Year': [2020, 2021, 2022, 2022],
+        'Source title': ['Transport Policy', 'Cities', 'Cities', 'Transport Policy'],
+        'Cited by': [4, 4, 2, 2],
+        'Author Keywords': ['zeta; alpha', 'zeta; alpha', 'mu; beta', 'beta; mu'],
+        'EID': ['e1', 'e2', 'e3', 'e4'],
+    }).to_csv(path, index=False)
+    return str(path)
+
+
+def _both(path, tmp_path):
+    memory = BibliometricAnalysis(path, 'scopus', use_cache=False)
+    disk = OutOfCoreAnalysis(path, 'scopus', parquet_dir=str(tmp_path / 'parquet'))
+    with redirect_stdout(io.StringIO()):
+        memory.load_data()
+        disk.load_data()
+    return memory, disk
+
+
+def test_impact_tables_match_the_in_memory_backend(tmp_path):
+    memory, disk = _both(_scopus_csv(tmp_path / 'ties.csv'), tmp_path)
+
+    authors = disk._author_impact()
+    assert authors['Name'].tolist()[:2] == ['Zhang, A.', 'Adams, B.']
+    assert authors['Name'].tolist()[2:4] == ['Moore, J.', 'Brown, K.']
+    assert 0.12 in authors['Fractionalized'].tolist()
+
+    pd.testing.assert_frame_equal(authors, memory._author_impact(), check_dtype=False)
+    pd.testing.assert_frame_equal(disk._source_impact(), memory._source_impact(),
+                                  check_dtype=False)
+
+
+def test_keyword_ties_keep_first_appearance_order(tmp_path):
+    memory, disk = _both(_scopus_csv(tmp_path / 'ties.csv'), tmp_path)
+
+    assert disk._keyword_counts().index.tolist() == ['zeta', 'alpha', 'mu', 'beta']
+    assert disk._keyword_counts().tolist() == memory._keyword_counts().tolist()
+    assert disk._keyword_counts().index.tolist() == memory._keyword_counts().index.tolist()
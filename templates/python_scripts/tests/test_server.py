@@ -0,0 +1,43 @@
+"""Analysis server: reload keeps the load options, output captured per call"""
+
+import io
+import threading
+from contextlib import redirect_stdout
+
+from bibliometric_scheduler import capture_output
+from bibliometric_server import AnalysisServer
+
+
+def test_reload_keeps_the_loading_options(scopus_sample):
+    server = AnalysisServer()
+    with redirect_stdout(io.StringIO()):
+        server.load('s', scopus_sample, 'scopus', chunk_size=2, csv_engine='python',
+                    use_cache=False)
+        analysis = server.reload('s')
+
+    assert server.versions['s'] == 2
+    assert (analysis.chunk_size, analysis.csv_engine, analysis.use_cache) == (2, 'python', False)
+
+
+def test_captured_output_stays_in_its_thread(capsys):
+    entered, printed = threading.Event(), threading.Event()
+    captured = {}
+
+    def request():
+        with capture_output() as buffer:
+            entered.set()
+            printed.wait(5)
+            print('request output')
+        captured['text'] = buffer.getvalue()
+
+    thread = threading.Thread(target=request)
+    thread.start()
+    entered.wait(5)
+    print('log line from another thread')
+    printed.set()
+    thread.join(5)
+
+    assert captured['text'] == 'request output\n'
+    out = capsys.readouterr().out
+    assert 'log line from another thread' in out
+    assert 'request output' not in out
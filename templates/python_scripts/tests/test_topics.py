@@ -0,0 +1,64 @@
+"""Topic modeling of abstracts: placeholders and corpora without abstracts"""
+
+import io
+from contextlib import redirect_stdout
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('sklearn')
+
+from bibliometric_analysis_python import BibliometricAnalysis
+from bibliometric_topics import TopicModel, usable_abstracts
+
+
+def _analysis(scopus_sample):
+    analysis = BibliometricAnalysis(scopus_sample, 'scopus', use_cache=False)
+    with redirect_stdout(io.StringIO()):
+        analysis.load_data()
+    return analysis
+
+
+def test_placeholders_and_blanks_are_not_abstracts():
+    texts = pd.Series(['Electric buses in cities.', '[No abstract available]',
+                       '  ', None, ' [NO ABSTRACT AVAILABLE] '])
+    assert usable_abstracts(texts).notna().tolist() == [True, False, False, False, False]
+
+
+def test_fit_without_usable_abstracts_raises():
+    with pytest.raises(ValueError, match='No abstracts'):
+        TopicModel(2, workers=1).fit(['[No abstract available]', None, ''])
+
+
+@pytest.mark.parametrize('value', ['', '[No abstract available]', None])
+def test_topic_analysis_without_abstracts_warns(scopus_sample, value):
+    analysis = _analysis(scopus_sample)
+    analysis.df['Abstract'] = value
+
+    output = io.StringIO()
+    with redirect_stdout(output):
+        assert analysis.topic_analysis(n_topics=2, workers=1) is None
+    assert '⚠' in output.getvalue()
+    assert 'topics' not in analysis.results
+
+
+def test_subset_without_abstracts_warns(scopus_sample):
+    analysis = _analysis(scopus_sample)
+    analysis.df.loc[analysis.df['Year'] == 2023, 'Abstract'] = '[No abstract available]'
+
+    with redirect_stdout(io.StringIO()):
+        view = analysis.subset(years=2023)
+        assert len(view.df) > 0
+        assert view.topic_analysis(n_topics=2, workers=1) is None
+
+
+def test_placeholder_documents_get_no_topic(scopus_sample):
+    analysis = _analysis(scopus_sample)
+    analysis.df.loc[0, 'Abstract'] = '[No abstract available]'
+
+    with redirect_stdout(io.StringIO()):
+        analysis.topic_analysis(n_topics=2, workers=1)
+    topics = analysis.results['document_topics']['Topic'].to_numpy()
+    assert topics[0] == 0
+    assert np.all(topics[1:] > 0)
@@ -0,0 +1,79 @@
+"""Sections on empty subset views and corpora without publication years"""
+
+import io
+import json
+import tempfile
+from contextlib import redirect_stdout
+
+import matplotlib
+matplotlib.use('Agg')
+import pandas as pd
+import pytest
+
+from bibliometric_analysis_python import BibliometricAnalysis, SECTION_TASKS
+
+
+def _load(path, data_type):
+    analysis = BibliometricAnalysis(path, data_type, use_cache=False)
+    with redirect_stdout(io.StringIO()):
+        analysis.load_data()
+    return analysis
+
+
+@pytest.fixture(params=['wos', 'scopus'])
+def analysis(request, wos_sample, scopus_sample):
+    path = wos_sample if request.param == 'wos' else scopus_sample
+    return _load(path, request.param)
+
+
+def _empty(analysis):
+    with redirect_stdout(io.StringIO()):
+        return analysis.subset(years=(1900, 1901))
+
+
+def _without_years(analysis):
+    analysis.df['Year'] = pd.array([pd.NA] * len(analysis.df), dtype='Int32')
+    return analysis
+
+
+def _run_all(analysis):
+    with redirect_stdout(io.StringIO()):
+        for method, kwargs, _ in SECTION_TASKS.values():
+            getattr(analysis, method)(**kwargs)
+        with tempfile.TemporaryDirectory() as output_dir:
+            analysis.render_figures(output_dir, workers=1, dpi=50)
+
+
+def test_statistics_of_an_empty_view(analysis):
+    view = _empty(analysis)
+    assert len(view.df) == 0
+
+    with redirect_stdout(io.StringIO()):
+        stats = view.generate_statistics()
+    assert stats['Total Documents'] == 0
+    assert stats['Time Span'] == 'N/A'
+
+
+def test_statistics_without_known_years(analysis):
+    with redirect_stdout(io.StringIO()):
+        stats = _without_years(analysis).generate_statistics()
+    assert stats['Total Documents'] == len(analysis.df)
+    assert stats['Time Span'] == stats['Average Year'] == 'N/A'
+
+
+@pytest.mark.parametrize('make_view', [_empty, _without_years])
+def test_every_section_runs(analysis, make_view):
+    _run_all(make_view(analysis))
+
+
+def test_server_statistics_for_an_empty_year_range(wos_sample):
+    from bibliometric_server import AnalysisServer
+
+    server = AnalysisServer()
+    with redirect_stdout(io.StringIO()):
+        server.load('w', wos_sample, 'wos')
+    body = json.loads(server.section('w', 'statistics', {'year_from': 1900, 'year_to': 1901}))
+
+    assert body['documents'] == 0
+    values = {row['Metric']: row['Value'] for row in body['results']['statistics']}
+    assert values['Time Span'] == 'N/A'
@@ -0,0 +1,97 @@
+"""Streaming WoS parser: continuation lines, multi-line and repeated tags"""
+
+import pandas as pd
+
+from bibliometric_analysis_python import iter_wos_chunks, iter_wos_records
+from conftest import write_wos
+
+
+def _record(*lines):
+    return [line + '\n' for line in ('PT J',) + lines + ('ER',)]
+
+
+def test_sample_records_and_list_tags(wos_sample):
+    records = list(iter_wos_records([wos_sample]))
+
+    assert len(records) == 3
+    assert records[0]['AU'] == 'Li, X; Wang, Y; Chen, Z'
+    assert records[0]['CR'].count('; ') == 14
+    assert records[0]['C1'].startswith('[Li, Xiaoming] Tsinghua Univ')
+    assert all(record['PT'] == 'J' for record in records)
+    assert 'FN' not in records[0] and 'ER' not in records[0]
+
+
+def test_text_continuation_lines_are_joined_with_spaces(tmp_path):
+    path = write_wos(tmp_path / 'export.txt', [_record(
+        'TI Electric vehicle adoption',
+        '   in smart cities',
+        'AB First line of the abstract',
+        '   second line',
+        '   third line',
+        'AU Li, X',
+        '   Wang, Y',
+    )])
+
+    record, = iter_wos_records([path])
+    assert record['TI'] == 'Electric vehicle adoption in smart cities'
+    assert record['AB'] == 'First line of the abstract second line third line'
+    assert record['AU'] == 'Li, X; Wang, Y'
+
+
+def test_repeated_tags_merge_like_multi_line_tags(tmp_path):
+    path = write_wos(tmp_path / 'export.txt', [_record(
+        'AU Li, X',
+        'AU Wang, Y',
+        '   Chen, Z',
+    )])
+
+    record, = iter_wos_records([path])
+    assert record['AU'] == 'Li, X; Wang, Y; Chen, Z'
+
+
+def test_tag_filter_drops_continuations_of_skipped_tags(tmp_path):
+    path = write_wos(tmp_path / 'export.txt', [_record(
+        'TI A title',
+        'AB An abstract',
+        '   that continues',
+        'PY 2024',
+    )])
+
+    record, = iter_wos_records([path], tags={'TI', 'PY'})
+    assert record == {'TI': 'A title', 'PY': '2024'}
+
+
+def test_tag_filter_keeps_records_without_the_selected_tags(tmp_path):
+    path = write_wos(tmp_path / 'export.txt', [
+        _record('TI With year', 'PY 2024'),
+        _record('AB Only an abstract'),
+        _record('TI No year'),
+    ])
+
+    records = list(iter_wos_records([path], tags={'TI', 'PY'}))
+    assert len(records) == 3
+    assert set(records[1]) == {'TI', 'PY'}
+    assert pd.isna(records[1]['TI']) and pd.isna(records[1]['PY'])
+    assert records[2]['TI'] == 'No year' and pd.isna(records[2]['PY'])
+
+    df, = iter_wos_chunks([path], tags={'TI', 'PY'})
+    assert len(df) == 3
+    assert df['Title'].isna().tolist() == [False, True, False]
+
+
+def test_records_without_er_lines_split_on_pt(tmp_path):
+    path = tmp_path / 'export.txt'
+    path.write_text('FN Clarivate Analytics Web of Science\nVR 1.0\n'
+                    'PT J\nTI First\nPT J\nTI Second\nEF\n', encoding='utf-8')
+
+    titles = [record['TI'] for record in iter_wos_records([str(path)])]
+    assert titles == ['First', 'Second']
+
+
+def test_chunks_span_files(tmp_path, wos_records):
+    first = write_wos(tmp_path / 'first.txt', wos_records[:2])
+    second = write_wos(tmp_path / 'second.txt', wos_records[2:])
+
+    chunks = list(iter_wos_chunks([first, second], chunk_size=2))
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    assert chunks[0]['Authors'].iloc[0] == 'Li, X; Wang, Y; Chen, Z'